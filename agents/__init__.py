@@ -1,13 +1,25 @@
-"""HealthGuard AI Agents Module"""
-
-from .health_coordinator import create_health_coordinator
-from .research_agent import create_research_agent
-from .medication_safety_agent import create_medication_safety_agent
-from .symptom_tracker_agent import create_symptom_tracker_agent
-
-__all__ = [
-    'create_health_coordinator',
-    'create_research_agent',
-    'create_medication_safety_agent',
-    'create_symptom_tracker_agent'
-]
\ No newline at end of file
+"""HealthGuard AI Agents Module
+
+Exports are imported lazily on first access, so importing the package does
+not load google.adk or any agent until it is actually used.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'create_health_coordinator': 'agents.health_coordinator',
+    'create_research_agent': 'agents.research_agent',
+    'create_medication_safety_agent': 'agents.medication_safety_agent',
+    'create_symptom_tracker_agent': 'agents.symptom_tracker_agent',
+    'check_emergency': 'agents.emergency_router',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,201 @@
+"""Model Cassette - Content-addressed record/replay of model calls
+
+Every model request is reduced to what determines the answer (model name,
+system instruction, tool declarations and conversation contents) and
+hashed. The first time a request is seen, the wrapped model answers it and
+the responses are written to <cassette>/<hash[:2]>/<hash>.json; afterwards
+the same request replays from disk without a model call. A changed prompt,
+agent instruction or tool result changes the hash of every request it
+reaches, so only the affected calls go to the model again.
+
+Function call IDs generated per run and timing fields such as
+"elapsed_seconds" are left out of the hash so that a recording replays
+across runs.
+
+Enabled with HEALTHGUARD_MODEL_CASSETTE=<dir>; HEALTHGUARD_CASSETTE_MODE is
+"record" (replay hits, call the model on misses, default) or "replay"
+(misses raise CassetteMiss, for offline CI runs).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+from google.adk.models import BaseLlm, LlmCapabilities, LlmRequest, LlmResponse
+from google.genai import types
+from opentelemetry import trace
+
+
+CASSETTE_MODES = ("record", "replay")
+
+# Fields of function responses that differ between identical runs
+VOLATILE_FIELDS = frozenset({"elapsed_seconds"})
+
+# Set on the model call's trace span: True if served from the cassette
+REPLAYED_ATTRIBUTE = "healthguard.cassette_replayed"
+
+
+class CassetteMiss(LookupError):
+    """A replay-only cassette has no recording for a request."""
+
+
+def _strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip_volatile(v) for k, v in value.items() if k not in VOLATILE_FIELDS}
+    if isinstance(value, list):
+        return [_strip_volatile(v) for v in value]
+    if isinstance(value, str) and value[:1] in "{[":
+        # Tool results are often JSON strings
+        try:
+            return json.dumps(_strip_volatile(json.loads(value)), sort_keys=True)
+        except ValueError:
+            return value
+    return value
+
+
+def _canonical_part(part: types.Part) -> Dict[str, Any]:
+    if part.function_call:
+        return {"call": part.function_call.name, "args": _strip_volatile(part.function_call.args or {})}
+    if part.function_response:
+        return {"response": part.function_response.name,
+                "result": _strip_volatile(part.function_response.response or {})}
+    return {"text": part.text or ""}
+
+
+def request_key(llm_request: LlmRequest) -> str:
+    """
+    Content hash of everything in a request that determines the answer.
+
+    Args:
+        llm_request: Request about to be sent to the model
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    config = llm_request.config
+    instruction = config.system_instruction if config else None
+    if isinstance(instruction, types.Content):
+        instruction = "".join(part.text or "" for part in instruction.parts or [])
+    tools = [
+        tool.model_dump(mode="json", exclude_none=True)
+        for tool in ((config.tools or []) if config else [])
+        if isinstance(tool, types.Tool)
+    ]
+    canonical = {
+        "model": llm_request.model,
+        "instruction": instruction if isinstance(instruction, str) else None,
+        "tools": tools,
+        "contents": [
+            {"role": content.role, "parts": [_canonical_part(part) for part in content.parts or []]}
+            for content in llm_request.contents
+        ],
+    }
+    encoded = json.dumps(canonical, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    On-disk store of recorded responses, one JSON file per request hash.
+
+    Args:
+        path: Cassette directory (created if missing)
+        mode: "record" or "replay"
+    """
+
+    def __init__(self, path: str, mode: str = "record"):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode: {mode} (expected one of {', '.join(CASSETTE_MODES)})")
+        self.path = os.path.expanduser(path)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        """Build a cassette from HEALTHGUARD_MODEL_CASSETTE / HEALTHGUARD_CASSETTE_MODE, or None."""
+        path = os.getenv("HEALTHGUARD_MODEL_CASSETTE")
+        if not path:
+            return None
+        return cls(path, os.getenv("HEALTHGUARD_CASSETTE_MODE", "record"))
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], f"{key}.json")
+
+    def load(self, key: str) -> Optional[List[LlmResponse]]:
+        """Recorded responses for a request hash, or None."""
+        try:
+            with open(self._file(key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return [LlmResponse.model_validate(response) for response in data["responses"]]
+
+    def save(self, key: str, model: str, responses: List[LlmResponse]) -> None:
+        """Record the responses to a request (atomically, so readers never see partial files)."""
+        path = self._file(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "model": model,
+                "responses": [r.model_dump(mode="json", exclude_none=True) for r in responses],
+            }, f, indent=1)
+        os.replace(tmp, path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters since this cassette was opened."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": self.path,
+                "mode": self.mode,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class CassetteModel(BaseLlm):
+    """
+    Model wrapper that replays recorded responses and records new ones.
+
+    Attributes:
+        inner: Model answering requests that are not recorded yet
+        cassette: Where responses are stored
+    """
+
+    inner: BaseLlm
+    cassette: Any
+
+    @property
+    def capabilities(self) -> LlmCapabilities:
+        return self.inner.capabilities
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        key = request_key(llm_request)
+        recorded = self.cassette.load(key)
+        trace.get_current_span().set_attribute(REPLAYED_ATTRIBUTE, recorded is not None)
+        if recorded is not None:
+            for response in recorded:
+                yield response
+            return
+        if self.cassette.mode == "replay":
+            raise CassetteMiss(f"No recorded response for request {key[:12]} in {self.cassette.path}")
+
+        responses = []
+        async for response in self.inner.generate_content_async(llm_request, stream=stream):
+            # Partial chunks are repeated by the final aggregated response
+            if not response.partial:
+                responses.append(response)
+            yield response
+        self.cassette.save(key, self.model, responses)
@@ -0,0 +1,105 @@
+"""Emergency Router - Deterministic fast path for emergency queries
+
+An emergency query otherwise goes coordinator LLM -> symptom agent LLM ->
+assess_symptom_severity -> symptom agent LLM -> coordinator LLM before the
+user sees "call 911". This router runs the emergency keyword tier locally on
+the raw query (microseconds, no model call) so the warning can be shown
+immediately. Any LLM elaboration is left to the caller and follows it.
+"""
+
+import os
+import re
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from tools.symptom_assessment_tool import find_symptom_keywords
+
+
+# Words that cancel a keyword when they appear shortly before it in the same
+# clause (e.g. "no chest pain", "without difficulty breathing"). A missed
+# emergency is worse than an unneeded warning, so "never" is not a negation:
+# "I never had chest pain before, now I do" must still warn.
+NEGATION_WORDS = frozenset({"no", "not", "without", "denies", "deny", "don't", "dont"})
+NEGATION_WINDOW = 3
+
+# A negation does not reach past these ("no fever but chest pain")
+CLAUSE_BREAK = re.compile(r"[,;.!?:\n]|\b(?:but|and|now|however|although|though|yet|then|except)\b")
+
+_WORD = re.compile(r"[a-z']+")
+
+
+class EmergencyTriage(NamedTuple):
+    """Result of an emergency fast-path match."""
+    matches: List[Dict[str, str]]
+    response: str
+    detection_seconds: float
+
+
+def elaboration_enabled() -> bool:
+    """Whether the full agent answer should still follow a fast-path warning."""
+    return os.getenv("HEALTHGUARD_EMERGENCY_ELABORATION", "1") == "1"
+
+
+def _is_negated(text: str, keyword: str) -> bool:
+    """True if every occurrence of keyword in text is preceded by a negation in its clause."""
+    start = text.find(keyword)
+    while start != -1:
+        clause = CLAUSE_BREAK.split(text[max(0, start - 40):start])[-1]
+        preceding = _WORD.findall(clause)[-NEGATION_WINDOW:]
+        if not NEGATION_WORDS.intersection(preceding):
+            return False
+        start = text.find(keyword, start + 1)
+    return True
+
+
+def format_emergency_response(matches: List[Dict[str, str]]) -> str:
+    """
+    Build the templated emergency response.
+
+    Follows the coordinator's EMERGENCY format: lead with the call to action,
+    say why, and list the symptoms requiring immediate care.
+    """
+    lines = [
+        "⚠️ EMERGENCY - CALL 911 IMMEDIATELY",
+        "",
+        "Your message describes symptoms that can be a medical emergency:",
+    ]
+    for match in matches:
+        lines.append(f"  • {match['keyword']}: {match['reason']}")
+    lines += [
+        "",
+        "Do not wait. Call 911 or go to the nearest emergency room now.",
+        "If you are having thoughts of suicide, call or text 988 (Suicide & Crisis Lifeline).",
+        "",
+        "I am an AI assistant, not a doctor. This is not a diagnosis.",
+    ]
+    return "\n".join(lines)
+
+
+def check_emergency(query: str) -> Optional[EmergencyTriage]:
+    """
+    Check a raw user query against the emergency symptom keywords.
+
+    Args:
+        query: The user's message, as typed
+
+    Returns:
+        EmergencyTriage with the templated response if an emergency keyword
+        is mentioned (and not negated), otherwise None
+    """
+    start = time.perf_counter()
+    text = query.lower()
+
+    matches = [
+        {"keyword": keyword, "reason": reason}
+        for tier, keyword, reason in find_symptom_keywords(text)
+        if tier == "emergency" and not _is_negated(text, keyword)
+    ]
+    if not matches:
+        return None
+
+    return EmergencyTriage(
+        matches=matches,
+        response=format_emergency_response(matches),
+        detection_seconds=time.perf_counter() - start,
+    )
@@ -1,36 +1,109 @@
 """Health Coordinator Agent - Root Orchestrator - Fixed for Google ADK"""
 
+from typing import TYPE_CHECKING, Mapping, Optional
+
 from google.adk.agents import Agent
-from google.adk.tools import AgentTool
 from google.genai import types
-from agents.research_agent import create_research_agent
-from agents.medication_safety_agent import create_medication_safety_agent
-from agents.symptom_tracker_agent import create_symptom_tracker_agent
+from agents.lazy_agent_tool import LazyAgentTool
+from agents.models import get_model
+from agents.specialists import (
+    MEDICATION_SAFETY_AGENT,
+    RESEARCH_AGENT,
+    SYMPTOM_TRACKER_AGENT,
+)
+from agents.parallel_specialists import ParallelConfig, ParallelSpecialistTool
+from tools.search_cache import SearchCache
+
+if TYPE_CHECKING:
+    from tools.output_format import ToolOutputConfig
+
+
+# Combination-query guidance for the default (one specialist at a time) mode
+SEQUENTIAL_COMBINATION_GUIDANCE = """If user asks about multiple topics (e.g., "I have a headache and take Lisinopril"):
+1. First, assess symptoms (symptom_tracker_agent)
+2. Then, check medication considerations (medication_safety_agent)
+3. Optionally research the condition (health_research_agent)
+4. Synthesize all information into coherent response
+"""
+SEQUENTIAL_COMPLEX_QUERY_GUIDANCE = """- For complex queries → use multiple agents sequentially
+"""
+
+# Guidance when consult_specialists can fan out to several specialists at once
+PARALLEL_COMBINATION_GUIDANCE = """If user asks about multiple topics (e.g., "I have a headache and take Lisinopril"):
+1. Call consult_specialists ONCE with a request for every specialist needed
+   (symptom_tracker_agent, medication_safety_agent, optionally health_research_agent)
+2. Do not call those specialists one after another - consult_specialists runs them at the same time
+3. If a specialist timed out or failed, use the other answers and say what is missing
+4. Synthesize all information into coherent response
+"""
+PARALLEL_COMPLEX_QUERY_GUIDANCE = """- For complex queries → consult_specialists with one request per specialist
+"""
 
 
-def create_health_coordinator(retry_config: types.HttpRetryOptions) -> Agent:
+def create_health_coordinator(
+    retry_config: types.HttpRetryOptions,
+    tool_output: Optional[Mapping[str, "ToolOutputConfig"]] = None,
+    parallel: Optional[ParallelConfig] = None,
+) -> Agent:
     """
     Creates the main Health Coordinator agent that orchestrates all sub-agents.
     
     This is the root agent that users interact with. It delegates tasks to
-    specialized sub-agents based on the user's needs.
+    specialized sub-agents based on the user's needs. Sub-agents are built
+    on first use, so specialists a conversation never calls cost nothing.
     
     Args:
         retry_config: Retry configuration for API calls
+        tool_output: Optional tool response format per sub-agent name
+            (e.g. {"symptom_tracker_agent": ToolOutputConfig(mode="compact")}).
+            Agents not listed use ToolOutputConfig.from_env().
+        parallel: Concurrent fan-out settings for combination queries.
+            Defaults to ParallelConfig.from_env().
         
     Returns:
         Configured root Agent instance
     """
     
-    # Create all specialized sub-agents
-    research_agent = create_research_agent(retry_config)
-    medication_agent = create_medication_safety_agent(retry_config)
-    symptom_agent = create_symptom_tracker_agent(retry_config)
+    tool_output = tool_output or {}
+    
+    # Specialist sub-agents, each built the first time it is delegated to
+    research_tool = LazyAgentTool(
+        RESEARCH_AGENT.name,
+        RESEARCH_AGENT.description,
+        lambda: RESEARCH_AGENT.load_factory()(retry_config),
+        cache=SearchCache.from_env(),
+    )
+    medication_tool = LazyAgentTool(
+        MEDICATION_SAFETY_AGENT.name,
+        MEDICATION_SAFETY_AGENT.description,
+        lambda: MEDICATION_SAFETY_AGENT.load_factory()(
+            retry_config, tool_output.get(MEDICATION_SAFETY_AGENT.name)
+        ),
+    )
+    symptom_tool = LazyAgentTool(
+        SYMPTOM_TRACKER_AGENT.name,
+        SYMPTOM_TRACKER_AGENT.description,
+        lambda: SYMPTOM_TRACKER_AGENT.load_factory()(
+            retry_config, tool_output.get(SYMPTOM_TRACKER_AGENT.name)
+        ),
+    )
+    
+    specialist_tools = [research_tool, medication_tool, symptom_tool]
+    
+    parallel = parallel or ParallelConfig.from_env()
+    if parallel.enabled:
+        tools = specialist_tools + [ParallelSpecialistTool(specialist_tools, parallel)]
+        combination_guidance = PARALLEL_COMBINATION_GUIDANCE
+        complex_query_guidance = PARALLEL_COMPLEX_QUERY_GUIDANCE
+    else:
+        tools = specialist_tools
+        combination_guidance = SEQUENTIAL_COMBINATION_GUIDANCE
+        complex_query_guidance = SEQUENTIAL_COMPLEX_QUERY_GUIDANCE
     
     # Create the root coordinator agent
     return Agent(
         name="health_coordinator",
-        model="gemini-2.0-flash-lite", 
+        model=get_model("gemini-2.0-flash-lite", retry_config), 
         description="HealthGuard AI - Your personal health research assistant and medication safety companion.",
         instruction="""You are HealthGuard AI, a helpful and empathetic health assistant. You coordinate a team of specialist agents to help users with:
 
@@ -61,12 +134,7 @@ When a user asks about:
 - Provide actionable next steps
 
 **COMBINATION QUERIES:**
-If user asks about multiple topics (e.g., "I have a headache and take Lisinopril"):
-1. First, assess symptoms (symptom_tracker_agent)
-2. Then, check medication considerations (medication_safety_agent)
-3. Optionally research the condition (health_research_agent)
-4. Synthesize all information into coherent response
-
+""" + combination_guidance + """
 **YOUR COMMUNICATION STYLE:**
 - Friendly and empathetic, not clinical
 - Clear and concise, avoid medical jargon
@@ -106,11 +174,6 @@ For EMERGENCY symptoms:
 - For symptom questions → symptom_tracker_agent
 - For medication questions → medication_safety_agent  
 - For general health info → health_research_agent
-- For complex queries → use multiple agents sequentially
-""",
-        tools=[
-            AgentTool(agent=research_agent),
-            AgentTool(agent=medication_agent),
-            AgentTool(agent=symptom_agent)
-        ]
+""" + complex_query_guidance,
+        tools=tools
     )
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""Lazy Agent Tool - AgentTool that builds its agent on first use"""
+
+import asyncio
+import threading
+from typing import Any, Callable, Optional, TYPE_CHECKING
+
+from google.adk.agents import BaseAgent
+from google.adk.tools import AgentTool
+from google.adk.tools.base_tool import BaseTool
+from google.genai import types
+from opentelemetry import trace
+
+from tools.result_cache import CACHE_HIT_ATTRIBUTE
+
+if TYPE_CHECKING:
+    from tools.search_cache import SearchCache
+
+
+class LazyAgentTool(AgentTool):
+    """
+    AgentTool whose agent is only constructed when it is first needed.
+
+    The coordinator can list every specialist as a tool without importing
+    the specialist modules, their tools or data files. The function
+    declaration is built from the name and description alone, so the wrapped
+    agent must take a plain text request (no input_schema/output_schema),
+    which holds for all HealthGuard specialists.
+
+    Args:
+        name: Name of the agent the factory builds
+        description: Description of the agent the factory builds
+        factory: Zero-argument callable returning the agent
+        cache: Optional persistent cache of answers keyed on the request
+            text. A hit returns the stored answer without building or
+            running the agent.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        factory: Callable[[], BaseAgent],
+        skip_summarization: bool = False,
+        cache: Optional["SearchCache"] = None,
+    ):
+        self._factory = factory
+        self.cache = cache
+        self._agent = None
+        self._lock = threading.Lock()
+        self.skip_summarization = skip_summarization
+        self.include_plugins = True
+        self.propagate_grounding_metadata = False
+        BaseTool.__init__(self, name=name, description=description)
+
+    @property
+    def agent(self) -> BaseAgent:
+        """The wrapped agent, built on first access."""
+        if self._agent is None:
+            with self._lock:
+                if self._agent is None:
+                    agent = self._factory()
+                    if agent.name != self.name:
+                        raise ValueError(
+                            f"Lazy agent factory for '{self.name}' built '{agent.name}'"
+                        )
+                    self._agent = agent
+        return self._agent
+
+    @property
+    def is_built(self) -> bool:
+        """Whether the wrapped agent has been constructed yet."""
+        return self._agent is not None
+
+    def _get_declaration(self) -> types.FunctionDeclaration:
+        if self.is_built:
+            return super()._get_declaration()
+        return types.FunctionDeclaration(
+            name=self.name,
+            description=self.description,
+            parameters=types.Schema(
+                type=types.Type.OBJECT,
+                properties={"request": types.Schema(type=types.Type.STRING)},
+                required=["request"],
+            ),
+        )
+
+    async def run_async(self, *, args: dict, tool_context: Any) -> Any:
+        request = args.get("request")
+        if self.cache is None or not isinstance(request, str):
+            return await super().run_async(args=args, tool_context=tool_context)
+
+        # SQLite calls block (up to the busy timeout under write contention),
+        # so they run in a worker thread instead of stalling other sessions
+        cached = await asyncio.to_thread(self.cache.get, request)
+        trace.get_current_span().set_attribute(CACHE_HIT_ATTRIBUTE, cached is not None)
+        if cached is not None:
+            return cached
+        result = await super().run_async(args=args, tool_context=tool_context)
+        if isinstance(result, str):
+            await asyncio.to_thread(self.cache.put, request, result)
+        return result
@@ -1,11 +1,24 @@
 """Medication Safety Agent - Fixed for Google ADK"""
 
+from typing import Optional
+
 from google.adk.agents import Agent
 from google.genai import types
-from tools.drug_interaction_tool import check_drug_interactions, get_medication_info
+from agents.models import get_model
+from agents.specialists import MEDICATION_SAFETY_AGENT
+from tools.drug_interaction_tool import (
+    check_drug_interactions,
+    check_regimen_interactions,
+    get_medication_info,
+)
+from tools.medication_regimen import check_new_medication, update_medication_regimen
+from tools.output_format import ToolOutputConfig, format_tools, output_instruction
 
 
-def create_medication_safety_agent(retry_config: types.HttpRetryOptions) -> Agent:
+def create_medication_safety_agent(
+    retry_config: types.HttpRetryOptions,
+    tool_output: Optional[ToolOutputConfig] = None,
+) -> Agent:
     """
     Creates a specialized agent for medication safety and interaction checking.
     
@@ -13,15 +26,19 @@ def create_medication_safety_agent(retry_config: types.HttpRetryOptions) -> Agen
     
     Args:
         retry_config: Retry configuration for API calls
+        tool_output: Tool response format for this agent. Defaults to
+            ToolOutputConfig.from_env().
         
     Returns:
         Configured Agent instance
     """
     
+    tool_output = tool_output or ToolOutputConfig.from_env()
+    
     return Agent(
-        name="medication_safety_agent",
-        model="gemini-2.0-flash-lite",
-        description="Specialist in medication interactions, safety information, and drug information.",
+        name=MEDICATION_SAFETY_AGENT.name,
+        model=get_model("gemini-2.0-flash-lite", retry_config),
+        description=MEDICATION_SAFETY_AGENT.description,
         instruction="""You are a medication safety specialist. Your role is to:
 
 1. Check for drug interactions between medications
@@ -39,7 +56,19 @@ When analyzing medications:
 - Use check_drug_interactions() tool to check for interactions
   * Pass current medications as comma-separated string: "Lisinopril, Metformin"
   * Pass the new medication name as a separate parameter
+- Use check_regimen_interactions() tool to review a whole regimen at once
+  * Pass ALL medications as one comma-separated string: "Lisinopril, Metformin, Ibuprofen"
+  * Prefer this over many check_drug_interactions() calls when the user takes 3+ medications
+- Use update_medication_regimen() when the user says what they take, or starts/stops a medication
+  * Pass medications to add and/or remove as comma-separated strings: add="Lisinopril, Metformin", remove=""
+  * The regimen is remembered for the rest of the conversation
+- Use check_new_medication() for "can I take X?" once a regimen is recorded
+  * Pass only the new medication; no need to repeat the current medications
+  * If it returns status "no_regimen", record the regimen first or use check_drug_interactions()
 - Use get_medication_info() tool to get medication details
+- Brand names and common misspellings (e.g. "Advil", "Tylenol") are resolved
+  automatically; check "resolved_medications" / "resolved_name" in tool results
+  instead of retrying with a different spelling
 - Consider severity levels: severe, moderate, mild
 - Explain WHY interactions are concerning
 - Provide practical recommendations when safe to do so
@@ -68,6 +97,12 @@ When checking interactions, format your response clearly:
 3. Explain the significance
 4. Provide clear recommendations
 5. Remind user this is informational only
-""",
-        tools=[check_drug_interactions, get_medication_info]
+""" + output_instruction(tool_output, advice_codes=False),
+        tools=format_tools([
+            check_drug_interactions,
+            check_regimen_interactions,
+            get_medication_info,
+            update_medication_regimen,
+            check_new_medication,
+        ], tool_output)
     )
\ No newline at end of file
@@ -0,0 +1,365 @@
+"""Mock Model - Local stand-in for Gemini with scripted tool use and configurable latency
+
+Answers every request locally after an artificial delay, without network
+access or an API key, so the agents built by create_health_coordinator can
+run end to end on CI machines. Two modes:
+
+  * "scripted" (default) behaves like a cooperative model. The coordinator
+    delegates to the specialist that fits the message (or to several of
+    them through consult_specialists). The medication agent calls
+    check_drug_interactions / check_regimen_interactions /
+    get_medication_info for the medications it recognizes, and the symptom
+    agent calls assess_symptom_severity (and check_symptom_duration when a
+    duration is given). Once tool results arrive, each agent answers with
+    a short summary of them. Rules from a JSON script file
+    (HEALTHGUARD_MOCK_SCRIPT) take precedence over these built-in rules.
+  * "echo" never calls tools and replies with the received text, measuring
+    only the serving path (deployment/load_test.py).
+
+Script file format:
+
+    {"rules": [
+        {"agent": "medication_safety_agent",      # optional, default any agent
+         "match": "warfarin",                     # optional regex on the message
+         "function_calls": [{"name": "get_medication_info",
+                             "args": {"medication_name": "warfarin"}}],
+         "text": "..."}                           # used when no function_calls
+    ]}
+
+The first matching rule answers a user message; tool results are always
+summarized by the built-in rule.
+
+Agents shown the session's tool memo (agents/tool_memo.py) answer from it
+when it already holds every result they would call a tool for.
+
+Like Gemini, the mock accepts requests that reference a cached instruction
+and tools by handle (agents/prompt_cache.py) and reports the cached share in
+cached_content_token_count.
+"""
+
+import asyncio
+import json
+import os
+import random
+import re
+from typing import Any, AsyncGenerator, Dict, List, NamedTuple, Optional, Sequence
+
+from google.adk.models import BaseLlm, LlmCapabilities, LlmRequest, LlmResponse
+from google.genai import types
+from pydantic import Field
+
+from agents.prompt_cache import LocalCacheStore, estimate_prefix_tokens
+from agents.specialists import MEDICATION_SAFETY_AGENT, RESEARCH_AGENT, SYMPTOM_TRACKER_AGENT
+from agents.tool_memo import memo_key, parse_memo
+
+
+MOCK_MODES = ("scripted", "echo")
+
+# ADK tells every agent its name in the system instruction
+_AGENT_NAME_PATTERN = re.compile(r'internal name is "([^"]+)"')
+_DURATION_PATTERN = re.compile(r"(\d+)\s*(day|week|month)s?", re.IGNORECASE)
+_DURATION_DAYS = {"day": 1, "week": 7, "month": 30}
+_MEDICATION_HINTS = ("medication", "medicine", "drug", "pill", "prescri", "dose", "take ", "taking", "mg")
+_REGIMEN_HINTS = ("regimen", "all my", "together", "combination")
+_SUMMARY_LIMIT = 300
+
+
+class ScriptRule(NamedTuple):
+    """One scripted answer to a user message."""
+    agent: Optional[str]
+    match: Optional["re.Pattern[str]"]
+    function_calls: Sequence[Dict[str, Any]]
+    text: str
+
+    def matches(self, agent: str, message: str) -> bool:
+        return (self.agent is None or self.agent == agent) and (
+            self.match is None or self.match.search(message) is not None
+        )
+
+
+def load_script(path: str) -> List[ScriptRule]:
+    """
+    Load scripted rules from a JSON file.
+
+    Args:
+        path: JSON file with a "rules" list (see the module docstring)
+
+    Returns:
+        Rules in file order
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    return [
+        ScriptRule(
+            agent=rule.get("agent"),
+            match=re.compile(rule["match"], re.IGNORECASE) if rule.get("match") else None,
+            function_calls=rule.get("function_calls", []),
+            text=rule.get("text", ""),
+        )
+        for rule in data["rules"]
+    ]
+
+
+def _function_call(name: str, **args: Any) -> types.Part:
+    return types.Part(function_call=types.FunctionCall(name=name, args=args))
+
+
+def _part_chars(part: types.Part) -> int:
+    """Characters a part contributes to a prompt or response."""
+    if part.function_call:
+        return len(part.function_call.name or "") + len(json.dumps(part.function_call.args or {}, default=str))
+    if part.function_response:
+        return len(part.function_response.name or "") + len(json.dumps(part.function_response.response or {}, default=str))
+    return len(part.text or "")
+
+
+def _medication_mentions(text: str) -> List[str]:
+    # Imported on demand: the drug tools load their databases at import time
+    from tools.drug_interaction_tool import MEDICATION_RESOLVER
+    return MEDICATION_RESOLVER.find_mentions(text)
+
+
+def _symptom_mentions(text: str) -> List[str]:
+    from tools.symptom_assessment_tool import find_symptom_keywords
+    return [keyword for _, keyword, _ in find_symptom_keywords(text)]
+
+
+class MockModel(BaseLlm):
+    """
+    Model that replies locally after a fixed delay.
+
+    Attributes:
+        model: Reported model name (kept equal to the replaced Gemini model)
+        latency_seconds: Delay before each response, simulating the API
+        latency_jitter_seconds: Random extra delay of up to this many seconds
+        mode: "scripted" (tool-calling rules) or "echo" (text only)
+        script: Rules tried before the built-in ones in scripted mode
+        calls: Model calls answered so far
+        function_calls: Function calls requested so far
+        caches: Context-caching facility; requests may reference a cached
+            instruction and tools by handle (config.cached_content)
+    """
+
+    latency_seconds: float = 0.05
+    latency_jitter_seconds: float = 0.0
+    mode: str = "scripted"
+    script: List[ScriptRule] = []
+    calls: int = 0
+    function_calls: int = 0
+    caches: Any = Field(default_factory=LocalCacheStore)
+
+    @classmethod
+    def from_env(cls, name: str) -> "MockModel":
+        """
+        Build a mock from HEALTHGUARD_MOCK_* environment variables.
+
+        HEALTHGUARD_MOCK_LATENCY (seconds, default 0.05),
+        HEALTHGUARD_MOCK_JITTER (seconds, default 0), HEALTHGUARD_MOCK_MODE
+        ("scripted" or "echo", default "scripted") and HEALTHGUARD_MOCK_SCRIPT
+        (path of a JSON script file, optional).
+        """
+        mode = os.getenv("HEALTHGUARD_MOCK_MODE", "scripted")
+        if mode not in MOCK_MODES:
+            raise ValueError(f"Unknown mock mode: {mode} (expected one of {', '.join(MOCK_MODES)})")
+        script_path = os.getenv("HEALTHGUARD_MOCK_SCRIPT")
+        return cls(
+            model=name,
+            latency_seconds=float(os.getenv("HEALTHGUARD_MOCK_LATENCY", "0.05")),
+            latency_jitter_seconds=float(os.getenv("HEALTHGUARD_MOCK_JITTER", "0")),
+            mode=mode,
+            script=load_script(script_path) if script_path else [],
+        )
+
+    @property
+    def capabilities(self) -> LlmCapabilities:
+        return LlmCapabilities(output_schema_and_tools=True)
+
+    # ---- request inspection -------------------------------------------
+
+    def _resolve_cached_prefix(self, llm_request: LlmRequest) -> LlmRequest:
+        """Restore the instruction and tools of a request that references a cached prefix."""
+        config = llm_request.config
+        if config is None or not config.cached_content:
+            return llm_request
+        cached = self.caches.get(config.cached_content)
+        restored = config.model_copy(update={
+            "system_instruction": cached.system_instruction,
+            "tools": cached.tools,
+            "tool_config": cached.tool_config,
+            "cached_content": None,
+        })
+        return llm_request.model_copy(update={"config": restored})
+
+    @staticmethod
+    def _last_user_text(llm_request: LlmRequest) -> str:
+        for content in reversed(llm_request.contents):
+            if content.role == "user":
+                text = "".join(part.text or "" for part in content.parts or [])
+                if text:
+                    return text
+        return ""
+
+    @staticmethod
+    def _pending_function_responses(llm_request: LlmRequest) -> List[types.FunctionResponse]:
+        """Function results the model has not answered yet (last content only)."""
+        if not llm_request.contents:
+            return []
+        last = llm_request.contents[-1]
+        return [part.function_response for part in last.parts or [] if part.function_response]
+
+    @staticmethod
+    def _instruction(llm_request: LlmRequest) -> str:
+        instruction = llm_request.config.system_instruction if llm_request.config else None
+        if isinstance(instruction, types.Content):
+            instruction = "".join(part.text or "" for part in instruction.parts or [])
+        return instruction if isinstance(instruction, str) else ""
+
+    @classmethod
+    def _agent_name(cls, llm_request: LlmRequest) -> str:
+        match = _AGENT_NAME_PATTERN.search(cls._instruction(llm_request))
+        return match.group(1) if match else ""
+
+    @classmethod
+    def _prompt_tokens(cls, llm_request: LlmRequest) -> int:
+        """Rough prompt size as Gemini bills it: instruction, tool declarations and history."""
+        chars = len(cls._instruction(llm_request))
+        for tool in (llm_request.config.tools or []) if llm_request.config else []:
+            if isinstance(tool, types.Tool):
+                chars += len(tool.model_dump_json(exclude_none=True))
+        chars += sum(_part_chars(part) for content in llm_request.contents for part in content.parts or [])
+        return chars // 4
+
+    # ---- rules --------------------------------------------------------
+
+    def _respond(self, llm_request: LlmRequest) -> List[types.Part]:
+        """Parts of the model turn answering a request."""
+        message = self._last_user_text(llm_request)
+        if self.mode == "echo":
+            return [types.Part(text=f"[mock {self.model}] Received: {message[:200]}")]
+
+        agent = self._agent_name(llm_request)
+        responses = self._pending_function_responses(llm_request)
+        if responses:
+            return [types.Part(text=self._summarize(agent, responses))]
+
+        for rule in self.script:
+            if rule.matches(agent, message):
+                if rule.function_calls:
+                    return [_function_call(call["name"], **call.get("args", {})) for call in rule.function_calls]
+                return [types.Part(text=rule.text)]
+
+        tools = set(llm_request.tools_dict)
+        if SYMPTOM_TRACKER_AGENT.name in tools:
+            calls = self._coordinator_calls(message, tools)
+        elif "check_drug_interactions" in tools:
+            calls = self._medication_calls(message)
+        elif "assess_symptom_severity" in tools:
+            calls = self._symptom_calls(message)
+        else:
+            calls = []
+        if calls:
+            remembered = self._remembered_results(llm_request, calls)
+            if remembered:
+                return [types.Part(text=self._summarize(agent, remembered))]
+            return calls
+        return [types.Part(text=f"[mock {agent or self.model}] General information about: {message[:200]}")]
+
+    @staticmethod
+    def _remembered_results(
+        llm_request: LlmRequest, calls: Sequence[types.Part]
+    ) -> List[types.FunctionResponse]:
+        """Results of the planned calls from the session's tool memo, if it has all of them."""
+        memo = {
+            memo_key(entry["tool"], entry["args"]): entry["result"]
+            for content in llm_request.contents[:1] for part in content.parts or [] if part.text
+            for entry in parse_memo(part.text)
+        }
+        keys = [memo_key(call.function_call.name, call.function_call.args or {}) for call in calls]
+        if not memo or any(key not in memo for key in keys):
+            return []
+        return [
+            types.FunctionResponse(name=call.function_call.name, response={"result": memo[key]})
+            for call, key in zip(calls, keys)
+        ]
+
+    @staticmethod
+    def _coordinator_calls(message: str, tools: set) -> List[types.Part]:
+        lowered = message.lower()
+        requests: Dict[str, str] = {}
+        if _symptom_mentions(message):
+            requests[SYMPTOM_TRACKER_AGENT.name] = message
+        if _medication_mentions(message) or any(hint in lowered for hint in _MEDICATION_HINTS):
+            requests[MEDICATION_SAFETY_AGENT.name] = message
+        if not requests:
+            requests[RESEARCH_AGENT.name] = message
+
+        if len(requests) > 1 and "consult_specialists" in tools:
+            return [_function_call("consult_specialists", **requests)]
+        return [_function_call(name, request=request) for name, request in requests.items()]
+
+    @staticmethod
+    def _medication_calls(message: str) -> List[types.Part]:
+        medications = _medication_mentions(message)
+        if len(medications) > 2 or (
+            len(medications) == 2 and any(hint in message.lower() for hint in _REGIMEN_HINTS)
+        ):
+            return [_function_call("check_regimen_interactions", medications=", ".join(medications))]
+        if len(medications) == 2:
+            return [_function_call(
+                "check_drug_interactions",
+                current_medications=medications[0],
+                new_medication=medications[1],
+            )]
+        if medications:
+            return [_function_call("get_medication_info", medication_name=medications[0])]
+        return []
+
+    @staticmethod
+    def _symptom_calls(message: str) -> List[types.Part]:
+        symptoms = _symptom_mentions(message)
+        if not symptoms:
+            return []
+        calls = [_function_call("assess_symptom_severity", symptoms=", ".join(symptoms))]
+        duration = _DURATION_PATTERN.search(message)
+        if duration:
+            days = int(duration.group(1)) * _DURATION_DAYS[duration.group(2).lower()]
+            calls.append(_function_call("check_symptom_duration", symptom=symptoms[0], duration_days=days))
+        return calls
+
+    def _summarize(self, agent: str, responses: Sequence[types.FunctionResponse]) -> str:
+        lines = [f"[mock {agent or self.model}] Findings:"]
+        for response in responses:
+            result = response.response or {}
+            if set(result) == {"result"}:
+                result = result["result"]
+            text = result if isinstance(result, str) else json.dumps(result, default=str)
+            lines.append(f"- {response.name}: {text[:_SUMMARY_LIMIT]}")
+        lines.append("Please consult your healthcare provider. I am an AI assistant and this "
+                     "information is for educational purposes only.")
+        return "\n".join(lines)
+
+    # ---- model API ----------------------------------------------------
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        delay = self.latency_seconds
+        if self.latency_jitter_seconds > 0:
+            delay += random.uniform(0, self.latency_jitter_seconds)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        cached_prefix = bool(llm_request.config and llm_request.config.cached_content)
+        llm_request = self._resolve_cached_prefix(llm_request)
+        parts = self._respond(llm_request)
+        self.function_calls += sum(1 for part in parts if part.function_call)
+        yield LlmResponse(
+            content=types.Content(role="model", parts=parts),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=self._prompt_tokens(llm_request),
+                cached_content_token_count=estimate_prefix_tokens(llm_request.config) if cached_prefix else None,
+                candidates_token_count=sum(_part_chars(part) for part in parts) // 4,
+            ),
+        )
@@ -0,0 +1,324 @@
+"""Model Scheduler - Process-wide, rate-limit-aware scheduling of model calls
+
+Every agent hop is a separate model call. Left alone, each call retries 429
+and 503 responses on its own exponential schedule, so under load every hop
+backs off and retries independently, and the retries arrive together. The
+scheduler routes every model call in the process through one queue:
+
+  * a token bucket caps the request rate,
+  * a concurrency limit adapts to provider feedback (halved on 429/503,
+    raised by one per limit's worth of successes, unchanged by other errors),
+  * a throttled call pauses the whole queue for a shared cooldown instead of
+    every caller backing off on its own, then is retried by the scheduler,
+  * priority lanes let calls for emergency turns overtake queued
+    interactive calls, which in turn overtake research calls.
+
+The lane of a call is the more urgent of its agent's lane and the lane of
+the current turn (set with turn_priority() around a turn).
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from enum import IntEnum
+from typing import Any, AsyncGenerator, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from google.adk.models import BaseLlm, LlmCapabilities, LlmRequest, LlmResponse
+
+
+class Priority(IntEnum):
+    """Scheduling lanes, most urgent first."""
+    EMERGENCY = 0
+    INTERACTIVE = 1
+    BACKGROUND = 2
+
+
+# HTTP status codes that mean "slow down" rather than "failed"
+THROTTLE_STATUS_CODES = frozenset({429, 503})
+
+_turn_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "healthguard_turn_priority", default=Priority.BACKGROUND
+)
+
+
+@contextlib.contextmanager
+def turn_priority(priority: Priority) -> Iterator[None]:
+    """Run the model calls made inside the block in at least this lane."""
+    token = _turn_priority.set(priority)
+    try:
+        yield
+    finally:
+        _turn_priority.reset(token)
+
+
+class SchedulerConfig(NamedTuple):
+    """
+    Scheduler settings.
+
+    Attributes:
+        requests_per_second: Token bucket refill rate
+        burst: Token bucket size (requests that may start back to back)
+        max_concurrency: Upper bound of the adaptive concurrency limit
+        min_concurrency: Lower bound of the adaptive concurrency limit
+        max_retries: Scheduler retries of a throttled call before failing
+        base_backoff_seconds: First shared cooldown after a throttle
+        max_backoff_seconds: Cap on the shared cooldown
+    """
+    requests_per_second: float = 10.0
+    burst: int = 10
+    max_concurrency: int = 16
+    min_concurrency: int = 1
+    max_retries: int = 4
+    base_backoff_seconds: float = 1.0
+    max_backoff_seconds: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "SchedulerConfig":
+        """Build a config from HEALTHGUARD_MODEL_* environment variables."""
+        return cls(
+            requests_per_second=float(os.getenv("HEALTHGUARD_MODEL_RPS", "10")),
+            burst=int(os.getenv("HEALTHGUARD_MODEL_BURST", "10")),
+            max_concurrency=int(os.getenv("HEALTHGUARD_MODEL_CONCURRENCY", "16")),
+            max_retries=int(os.getenv("HEALTHGUARD_MODEL_RETRIES", "4")),
+            max_backoff_seconds=float(os.getenv("HEALTHGUARD_MODEL_MAX_BACKOFF", "30")),
+        )
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """Whether an exception is a provider 429/503 response."""
+    return getattr(error, "code", None) in THROTTLE_STATUS_CODES
+
+
+class ModelScheduler:
+    """
+    Priority queue in front of every model call in the process.
+
+    Args:
+        config: Rate, concurrency and retry settings
+    """
+
+    def __init__(self, config: Optional[SchedulerConfig] = None):
+        self.config = config or SchedulerConfig()
+        self.concurrency_limit = float(self.config.max_concurrency)
+        self._tokens = float(self.config.burst)
+        self._refilled_at = time.monotonic()
+        self._cooldown_until = 0.0
+        self._consecutive_throttles = 0
+        self._active = 0
+        self._queue: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self._lock = threading.Lock()
+
+        self.granted = {lane.name: 0 for lane in Priority}
+        self.throttled = 0
+        self.retries = 0
+        self.failures = 0
+        self.max_queue_depth = 0
+        self.total_wait_seconds = 0.0
+
+    # ---- queue --------------------------------------------------------
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._tokens = min(float(self.config.burst), self._tokens + elapsed * self.config.requests_per_second)
+
+    def _dispatch(self) -> None:
+        """Grant queued calls, most urgent first, while limits allow."""
+        with self._lock:
+            self._wakeup = None
+            now = time.monotonic()
+            self._refill(now)
+            while self._queue:
+                if now < self._cooldown_until:
+                    self._schedule_wakeup(self._cooldown_until - now)
+                    return
+                if self._active >= int(self.concurrency_limit):
+                    return  # release() dispatches again
+                if self._tokens < 1.0:
+                    self._schedule_wakeup((1.0 - self._tokens) / self.config.requests_per_second)
+                    return
+                _, _, future = heapq.heappop(self._queue)
+                if future.done():  # caller was cancelled
+                    continue
+                self._tokens -= 1.0
+                self._active += 1
+                future.set_result(None)
+
+    def _schedule_wakeup(self, delay: float) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    async def acquire(self, priority: Priority) -> None:
+        """Wait for a rate token and concurrency slot in priority order."""
+        future = asyncio.get_running_loop().create_future()
+        start = time.monotonic()
+        with self._lock:
+            heapq.heappush(self._queue, (int(priority), next(self._seq), future))
+            self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(throttled=False, succeeded=False)
+            raise
+        self.total_wait_seconds += time.monotonic() - start
+        self.granted[priority.name] += 1
+
+    def release(self, throttled: bool, succeeded: bool = True) -> None:
+        """
+        Free a slot and adapt the concurrency limit to the call's outcome.
+
+        Args:
+            throttled: The provider rejected the call with 429/503; the limit
+                is halved and the queue cools down
+            succeeded: The call completed; the limit grows. Other failures
+                are neutral and only free the slot, so repeated errors that
+                say nothing about capacity cannot raise the limit.
+        """
+        with self._lock:
+            self._active -= 1
+            config = self.config
+            if throttled:
+                self.throttled += 1
+                self._consecutive_throttles += 1
+                self.concurrency_limit = max(float(config.min_concurrency), self.concurrency_limit / 2)
+                backoff = min(
+                    config.max_backoff_seconds,
+                    config.base_backoff_seconds * 2 ** (self._consecutive_throttles - 1),
+                )
+                # Jitter spreads the restart of queued calls after the cooldown
+                self._cooldown_until = max(
+                    self._cooldown_until, time.monotonic() + backoff * random.uniform(0.8, 1.2)
+                )
+            elif succeeded:
+                self._consecutive_throttles = 0
+                self.concurrency_limit = min(
+                    float(config.max_concurrency), self.concurrency_limit + 1 / self.concurrency_limit
+                )
+        self._dispatch()
+
+    # ---- metrics ------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue and throttle metrics.
+
+        Returns:
+            Dictionary with queue depth (total and per lane), active calls,
+            current concurrency limit, cooldown remaining, granted calls per
+            lane, throttle/retry/failure counts and average queue wait
+        """
+        with self._lock:
+            depth = {lane.name: 0 for lane in Priority}
+            for lane, _, future in self._queue:
+                if not future.done():
+                    depth[Priority(lane).name] += 1
+            granted = sum(self.granted.values())
+            return {
+                "queue_depth": sum(depth.values()),
+                "queue_depth_by_lane": depth,
+                "max_queue_depth": self.max_queue_depth,
+                "active": self._active,
+                "concurrency_limit": round(self.concurrency_limit, 2),
+                "cooldown_seconds": round(max(0.0, self._cooldown_until - time.monotonic()), 2),
+                "granted": dict(self.granted),
+                "throttled": self.throttled,
+                "retries": self.retries,
+                "failures": self.failures,
+                "avg_wait_seconds": round(self.total_wait_seconds / granted, 4) if granted else 0.0,
+            }
+
+
+_scheduler: Optional[ModelScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> ModelScheduler:
+    """The process-wide scheduler, created on first use."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = ModelScheduler(SchedulerConfig.from_env())
+    return _scheduler
+
+
+class ScheduledModel(BaseLlm):
+    """
+    Model wrapper that sends every call through the process-wide scheduler.
+
+    Throttled calls are retried by the scheduler after the shared cooldown,
+    unless the response had already started streaming. The slot is held only
+    while the inner model is answering, not while the caller handles the
+    responses.
+
+    Attributes:
+        inner: Model that makes the actual call (shared between lanes)
+        lane: Default lane for this agent's calls
+    """
+
+    inner: BaseLlm
+    lane: Priority = Priority.INTERACTIVE
+
+    @property
+    def capabilities(self) -> LlmCapabilities:
+        return self.inner.capabilities
+
+    async def _pump(
+        self, llm_request: LlmRequest, stream: bool, responses: "asyncio.Queue[Any]"
+    ) -> None:
+        """Make the call under a scheduler slot, handing responses to the caller through a queue."""
+        scheduler = get_scheduler()
+        priority = Priority(min(self.lane, _turn_priority.get()))
+        attempt = 0
+        while True:
+            await scheduler.acquire(priority)
+            started = False
+            throttled = False
+            succeeded = False
+            try:
+                async for response in self.inner.generate_content_async(llm_request, stream=stream):
+                    started = True
+                    responses.put_nowait(response)
+                succeeded = True
+                return
+            except Exception as e:
+                throttled = is_throttle_error(e)
+                if not throttled or started or attempt >= scheduler.config.max_retries:
+                    scheduler.failures += 1
+                    raise
+                attempt += 1
+                scheduler.retries += 1
+            finally:
+                scheduler.release(throttled, succeeded)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        # The call runs in its own task so its slot is released as soon as the
+        # model has answered. The caller stays paused at each yield while it
+        # runs the requested tools, which include sub-agent calls; holding the
+        # slot across that pause would deadlock nested delegation once every
+        # slot belongs to a waiting parent.
+        responses: "asyncio.Queue[Any]" = asyncio.Queue()
+        call = asyncio.ensure_future(self._pump(llm_request, stream, responses))
+        call.add_done_callback(lambda _: responses.put_nowait(call))
+        try:
+            while True:
+                item = await responses.get()
+                if item is call:
+                    call.result()  # re-raise the call's error, if any
+                    return
+                yield item
+        finally:
+            if not call.done():
+                call.cancel()
@@ -0,0 +1,168 @@
+"""Model Pool - One shared model client per model name
+
+An agent given a model name string resolves it to its own Gemini instance,
+and each instance opens its own API client, so the four HealthGuard agents
+hold four clients and four connection pools. Agents get their model from
+get_model() instead, which returns one process-wide instance per model name
+so every agent, session and request shares the same pooled client.
+
+Each agent's static instruction and tool declarations are registered once
+with the provider's context cache and referenced by handle afterwards
+(agents/prompt_cache.py); HEALTHGUARD_PROMPT_CACHE=0 turns it off.
+Calls go through the process-wide ModelScheduler (agents/model_scheduler.py)
+in the agent's priority lane; HEALTHGUARD_MODEL_SCHEDULER=0 turns it off.
+With HEALTHGUARD_MODEL_CASSETTE set, recorded responses are replayed before
+any call reaches the scheduler (agents/cassette.py).
+HEALTHGUARD_MODEL_BACKEND=mock swaps in the local MockModel, which needs no
+API key or network access.
+"""
+
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from google.adk.models import BaseLlm
+from google.genai import types
+
+from agents.cassette import Cassette, CassetteModel
+from agents.model_scheduler import Priority, ScheduledModel
+from agents.prompt_cache import PromptCache, PromptCacheConfig, PromptCachedModel
+
+
+DEFAULT_MODEL = "gemini-2.0-flash-lite"
+
+_POOL: Dict[Tuple[str, str, str], BaseLlm] = {}
+_SCHEDULED: Dict[Tuple[int, Priority], BaseLlm] = {}
+_CASSETTES: Dict[Tuple[str, str], Cassette] = {}
+_RECORDED: Dict[Tuple[int, str, str], BaseLlm] = {}
+_PROMPT_CACHED: Dict[int, BaseLlm] = {}
+_lock = threading.Lock()
+
+
+def create_retry_config() -> types.HttpRetryOptions:
+    """
+    Configure retry options for API resilience.
+
+    Only transient server errors are retried by the client. 429 and 503 are
+    left to the shared scheduler, which backs off once for the whole process
+    instead of once per agent hop.
+    """
+
+    return types.HttpRetryOptions(
+        attempts=3,
+        exp_base=2,
+        initial_delay=1,
+        http_status_codes=[500, 504],
+    )
+
+
+def model_backend() -> str:
+    """Configured model backend: "gemini" (default) or "mock"."""
+    return os.getenv("HEALTHGUARD_MODEL_BACKEND", "gemini")
+
+
+def scheduler_enabled() -> bool:
+    """Whether model calls go through the shared scheduler (default on)."""
+    return os.getenv("HEALTHGUARD_MODEL_SCHEDULER", "1") == "1"
+
+
+def get_model(
+    name: str = DEFAULT_MODEL,
+    retry_config: Optional[types.HttpRetryOptions] = None,
+    lane: Priority = Priority.INTERACTIVE,
+) -> BaseLlm:
+    """
+    Get the shared model for a model name, scheduled in the agent's lane.
+
+    Args:
+        name: Gemini model name. The mock backend reports the same name, so
+            name-dependent features (e.g. google_search) behave the same.
+        retry_config: Client retry options for transient errors
+        lane: Scheduling lane of the agent's calls
+
+    Returns:
+        Model whose client is shared by every agent using this name
+    """
+    model = _get_client_model(name, retry_config)
+    if prompt_cache_enabled():
+        model = _get_prompt_cached_model(model)
+    if scheduler_enabled():
+        key = (id(model), lane)
+        scheduled = _SCHEDULED.get(key)
+        if scheduled is None:
+            with _lock:
+                scheduled = _SCHEDULED.setdefault(
+                    key, ScheduledModel(model=model.model, inner=model, lane=lane)
+                )
+        model = scheduled
+
+    cassette = get_cassette()
+    if cassette is None:
+        return model
+    key = (id(model), cassette.path, cassette.mode)
+    recorded = _RECORDED.get(key)
+    if recorded is None:
+        with _lock:
+            recorded = _RECORDED.setdefault(
+                key, CassetteModel(model=model.model, inner=model, cassette=cassette)
+            )
+    return recorded
+
+
+def prompt_cache_enabled() -> bool:
+    """Whether static prefixes are sent by cache handle (default on)."""
+    return PromptCacheConfig.from_env().enabled
+
+
+def _get_prompt_cached_model(model: BaseLlm) -> BaseLlm:
+    """The client model wrapped with one prefix registry for its provider."""
+    cached = _PROMPT_CACHED.get(id(model))
+    if cached is None:
+        with _lock:
+            cached = _PROMPT_CACHED.get(id(model))
+            if cached is None:
+                # The mock brings its own facility; Gemini uses the client's caches API
+                caches = getattr(model, "caches", None) or model.api_client.aio.caches
+                cached = PromptCachedModel(
+                    model=model.model, inner=model, cache=PromptCache(caches, PromptCacheConfig.from_env())
+                )
+                _PROMPT_CACHED[id(model)] = cached
+    return cached
+
+
+def get_prompt_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Prompt cache hits and cached token counts per model name."""
+    with _lock:
+        models = list(_PROMPT_CACHED.values())
+    return {model.model: model.cache.get_stats() for model in models}
+
+
+def get_cassette() -> Optional[Cassette]:
+    """The shared cassette configured by HEALTHGUARD_MODEL_CASSETTE, or None."""
+    configured = Cassette.from_env()
+    if configured is None:
+        return None
+    key = (configured.path, configured.mode)
+    with _lock:
+        return _CASSETTES.setdefault(key, configured)
+
+
+def _get_client_model(name: str, retry_config: Optional[types.HttpRetryOptions]) -> BaseLlm:
+    """The one unscheduled model instance per backend, name and retry config."""
+    backend = model_backend()
+    key = (backend, name, retry_config.model_dump_json() if retry_config else "")
+    model = _POOL.get(key)
+    if model is None:
+        with _lock:
+            model = _POOL.get(key)
+            if model is None:
+                if backend == "mock":
+                    from agents.mock_model import MockModel
+                    model = MockModel.from_env(name)
+                elif backend == "gemini":
+                    from google.adk.models.google_llm import Gemini
+                    model = Gemini(model=name, retry_options=retry_config)
+                else:
+                    raise ValueError(f"Unknown model backend: {backend}")
+                _POOL[key] = model
+    return model
@@ -0,0 +1,136 @@
+"""Parallel Specialists - Concurrent fan-out to specialist agents
+
+For combination queries ("I have a headache and take Lisinopril") the
+coordinator would otherwise delegate to each specialist in turn, so the
+wall-clock time is the sum of every sub-agent's LLM loop. This tool lets the
+coordinator send one request per relevant specialist in a single call. The
+branches run concurrently under a concurrency limit and per-branch timeout,
+and their answers come back merged for one synthesis step.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, NamedTuple, Sequence
+
+from google.adk.tools import AgentTool
+from google.adk.tools.base_tool import BaseTool
+from google.genai import types
+
+
+class ParallelConfig(NamedTuple):
+    """
+    Parallel orchestration settings for the coordinator.
+
+    Attributes:
+        enabled: Offer the consult_specialists fan-out tool
+        max_concurrency: Maximum specialists running at the same time
+        branch_timeout_seconds: Time limit for each specialist's answer
+    """
+    enabled: bool = False
+    max_concurrency: int = 3
+    branch_timeout_seconds: float = 60.0
+
+    @classmethod
+    def from_env(cls) -> "ParallelConfig":
+        """Build a config from HEALTHGUARD_PARALLEL_* environment variables."""
+        return cls(
+            enabled=os.getenv("HEALTHGUARD_PARALLEL_SPECIALISTS", "0") == "1",
+            max_concurrency=int(os.getenv("HEALTHGUARD_PARALLEL_CONCURRENCY", "3")),
+            branch_timeout_seconds=float(os.getenv("HEALTHGUARD_PARALLEL_TIMEOUT", "60")),
+        )
+
+
+class ParallelSpecialistTool(BaseTool):
+    """
+    Tool that consults several specialist agents concurrently.
+
+    Takes one optional request string per specialist. Every non-empty request
+    becomes a branch that runs the specialist's AgentTool; a branch that fails
+    or times out is reported in the merged result without affecting the others.
+
+    Args:
+        specialists: AgentTools for the specialists that may be consulted
+        config: Concurrency limit and per-branch timeout
+    """
+
+    def __init__(self, specialists: Sequence[AgentTool], config: ParallelConfig):
+        self.specialists = {tool.name: tool for tool in specialists}
+        self.config = config
+        super().__init__(
+            name="consult_specialists",
+            description=(
+                "Consult several specialist agents at the same time. Provide a "
+                "request for each specialist the user's question needs; leave the "
+                "others out. Returns every specialist's answer in one result."
+            ),
+        )
+
+    def _get_declaration(self) -> types.FunctionDeclaration:
+        return types.FunctionDeclaration(
+            name=self.name,
+            description=self.description,
+            parameters=types.Schema(
+                type=types.Type.OBJECT,
+                properties={
+                    name: types.Schema(
+                        type=types.Type.STRING,
+                        description=f"Request for {name}: {tool.description}",
+                    )
+                    for name, tool in self.specialists.items()
+                },
+            ),
+        )
+
+    async def _run_branch(
+        self,
+        semaphore: asyncio.Semaphore,
+        tool: AgentTool,
+        request: str,
+        tool_context: Any,
+    ) -> Dict[str, Any]:
+        """Run one specialist under the concurrency limit and timeout."""
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(
+                    tool.run_async(args={"request": request}, tool_context=tool_context),
+                    timeout=self.config.branch_timeout_seconds,
+                )
+                result = {"status": "success", "response": response}
+            except asyncio.TimeoutError:
+                result = {
+                    "status": "timeout",
+                    "message": f"{tool.name} did not answer within "
+                               f"{self.config.branch_timeout_seconds:g} seconds",
+                }
+            except Exception as e:
+                result = {"status": "error", "message": str(e)}
+            result["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+            return result
+
+    async def run_async(self, *, args: Dict[str, Any], tool_context: Any) -> Any:
+        branches = {
+            name: request.strip()
+            for name, request in args.items()
+            if name in self.specialists and isinstance(request, str) and request.strip()
+        }
+        if not branches:
+            return {
+                "status": "error",
+                "message": "Provide a request for at least one of: "
+                           + ", ".join(self.specialists),
+            }
+
+        semaphore = asyncio.Semaphore(max(1, self.config.max_concurrency))
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            self._run_branch(semaphore, self.specialists[name], request, tool_context)
+            for name, request in branches.items()
+        ))
+
+        return {
+            "status": "success",
+            "elapsed_seconds": round(time.perf_counter() - start, 3),
+            "specialists": dict(zip(branches, results)),
+        }
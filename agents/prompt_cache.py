@@ -0,0 +1,317 @@
+"""Prompt Cache - Register static agent prefixes once and reference them by handle
+
+Every model call of an agent re-sends the same system instruction and tool
+declarations, and a single turn makes four or more such calls (coordinator,
+specialists, their tool follow-ups). The prompt cache registers each
+distinct prefix (model, system instruction, tools, tool config) once with
+the provider's context-caching facility and rewrites later requests to
+reference it by handle (config.cached_content) instead of repeating it, so
+the provider skips re-processing those tokens on every hop.
+
+The facility is anything with an async create(model=..., config=...) that
+returns a types.CachedContent: the google-genai client's caches API for
+Gemini, or LocalCacheStore, the in-memory equivalent used by the mock model.
+Providers reject prefixes below their minimum cacheable size; such a prefix
+is remembered and sent inline until its TTL passes, without retrying on
+every call.
+
+Enabled by default; HEALTHGUARD_PROMPT_CACHE=0 disables it.
+HEALTHGUARD_PROMPT_CACHE_TTL sets the cache lifetime (seconds, default 1800)
+and HEALTHGUARD_PROMPT_CACHE_MIN_TOKENS skips prefixes estimated below that
+size (default 0).
+"""
+
+import asyncio
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, AsyncGenerator, Dict, NamedTuple, Optional
+
+from google.adk.models import BaseLlm, LlmCapabilities, LlmRequest, LlmResponse
+from google.genai import types
+from opentelemetry import trace
+
+
+# Set on the model call's trace span: prompt tokens served from a cached prefix
+CACHED_TOKENS_ATTRIBUTE = "healthguard.cached_prompt_tokens"
+
+# Handles are refreshed this long before they expire, so no call references
+# a cache that runs out mid-request
+_EXPIRY_MARGIN_SECONDS = 30
+
+
+class PromptCacheConfig(NamedTuple):
+    """
+    Prompt cache settings.
+
+    Attributes:
+        enabled: Whether static prefixes are cached
+        ttl_seconds: Lifetime of each registered prefix
+        min_tokens: Prefixes estimated below this many tokens are sent inline
+    """
+    enabled: bool = True
+    ttl_seconds: int = 1800
+    min_tokens: int = 0
+
+    @classmethod
+    def from_env(cls) -> "PromptCacheConfig":
+        """Build a config from HEALTHGUARD_PROMPT_CACHE* variables."""
+        return cls(
+            enabled=os.getenv("HEALTHGUARD_PROMPT_CACHE", "1") == "1",
+            ttl_seconds=int(os.getenv("HEALTHGUARD_PROMPT_CACHE_TTL", "1800")),
+            min_tokens=int(os.getenv("HEALTHGUARD_PROMPT_CACHE_MIN_TOKENS", "0")),
+        )
+
+
+def _instruction_text(instruction: Any) -> str:
+    if isinstance(instruction, types.Content):
+        return "".join(part.text or "" for part in instruction.parts or [])
+    return instruction if isinstance(instruction, str) else ""
+
+
+def estimate_prefix_tokens(config: Optional[types.GenerateContentConfig]) -> int:
+    """Rough token count of a request's instruction and tool declarations (4 chars per token)."""
+    if config is None:
+        return 0
+    chars = len(_instruction_text(config.system_instruction))
+    for tool in config.tools or []:
+        if isinstance(tool, types.Tool):
+            chars += len(tool.model_dump_json(exclude_none=True))
+    return chars // 4
+
+
+def prefix_key(model: str, config: Optional[types.GenerateContentConfig]) -> Optional[str]:
+    """
+    Content hash of a request's static prefix.
+
+    Args:
+        model: Model name the prefix is cached for
+        config: Request config holding instruction, tools and tool config
+
+    Returns:
+        Hex SHA-256 digest, or None if the request has nothing to cache
+    """
+    if config is None or not (config.system_instruction or config.tools):
+        return None
+    tools = [
+        tool.model_dump(mode="json", exclude_none=True)
+        for tool in config.tools or [] if isinstance(tool, types.Tool)
+    ]
+    canonical = {
+        "model": model,
+        "instruction": _instruction_text(config.system_instruction),
+        "tools": tools,
+        "tool_config": config.tool_config.model_dump(mode="json", exclude_none=True) if config.tool_config else None,
+    }
+    encoded = json.dumps(canonical, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class LocalCacheStore:
+    """
+    In-memory context-caching facility with the create() shape of the genai caches API.
+
+    Used by the mock model, which resolves handles in requests back to the
+    cached instruction and tools.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, types.CreateCachedContentConfig] = {}
+        self._expires: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    async def create(self, *, model: str, config: types.CreateCachedContentConfig) -> types.CachedContent:
+        ttl_seconds = float((config.ttl or "3600s").rstrip("s"))
+        generate_config = types.GenerateContentConfig(system_instruction=config.system_instruction, tools=config.tools)
+        name = f"cachedContents/local-{prefix_key(model, generate_config)[:24]}"
+        expires = time.time() + ttl_seconds
+        with self._lock:
+            self._entries[name] = config
+            self._expires[name] = expires
+        return types.CachedContent(
+            name=name,
+            model=model,
+            display_name=config.display_name,
+            expire_time=datetime.datetime.fromtimestamp(expires, tz=datetime.timezone.utc),
+            usage_metadata=types.CachedContentUsageMetadata(
+                total_token_count=estimate_prefix_tokens(generate_config)
+            ),
+        )
+
+    def get(self, name: str) -> types.CreateCachedContentConfig:
+        """The cached prefix behind a handle; raises LookupError if unknown or expired."""
+        with self._lock:
+            config = self._entries.get(name)
+            if config is None or self._expires[name] < time.time():
+                raise LookupError(f"Cached content not found or expired: {name}")
+            return config
+
+
+class _CachedPrefix(NamedTuple):
+    name: Optional[str]  # None: provider rejected the prefix, send it inline
+    tokens: int
+    expires_at: float
+
+
+class PromptCache:
+    """
+    Registry of cached prefixes for one context-caching facility.
+
+    Args:
+        caches: Facility with async create(model=..., config=...)
+        config: Prompt cache settings
+    """
+
+    def __init__(self, caches: Any, config: Optional[PromptCacheConfig] = None):
+        self.caches = caches
+        self.config = config or PromptCacheConfig.from_env()
+        self._prefixes: Dict[str, _CachedPrefix] = {}
+        self._creating: Dict[str, "asyncio.Task[_CachedPrefix]"] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.created = 0
+        self.rejected = 0
+        self.inline = 0
+        self.cached_tokens = 0
+        self.prompt_tokens = 0
+
+    async def _create(self, model: str, config: types.GenerateContentConfig, tokens: int) -> _CachedPrefix:
+        try:
+            cached = await self.caches.create(model=model, config=types.CreateCachedContentConfig(
+                system_instruction=config.system_instruction,
+                tools=config.tools,
+                tool_config=config.tool_config,
+                ttl=f"{self.config.ttl_seconds}s",
+                display_name=f"healthguard-prefix-{int(time.time())}",
+            ))
+        except Exception:
+            # Typically below the model's minimum cache size; retried after the TTL
+            with self._lock:
+                self.rejected += 1
+            return _CachedPrefix(None, tokens, time.time() + self.config.ttl_seconds)
+
+        with self._lock:
+            self.created += 1
+        expires_at = cached.expire_time.timestamp() if cached.expire_time else time.time() + self.config.ttl_seconds
+        usage = cached.usage_metadata
+        return _CachedPrefix(cached.name, (usage.total_token_count if usage else None) or tokens, expires_at)
+
+    async def lookup(self, llm_request: LlmRequest) -> Optional[str]:
+        """
+        Handle of the cached prefix for a request, registering it on first use.
+
+        Concurrent first calls with the same prefix share one registration.
+
+        Returns:
+            The cache handle, or None if the request should be sent inline
+        """
+        model = llm_request.model or ""
+        key = prefix_key(model, llm_request.config)
+        if key is None:
+            return None
+        now = time.time()
+        cached = self._prefixes.get(key)
+        if cached is not None and cached.expires_at - _EXPIRY_MARGIN_SECONDS > now:
+            with self._lock:
+                if cached.name:
+                    self.hits += 1
+                else:
+                    self.inline += 1
+            return cached.name
+
+        tokens = estimate_prefix_tokens(llm_request.config)
+        if tokens < self.config.min_tokens:
+            with self._lock:
+                self.inline += 1
+            return None
+
+        task = self._creating.get(key)
+        owner = task is None
+        if owner:
+            task = asyncio.ensure_future(self._create(model, llm_request.config, tokens))
+            self._creating[key] = task
+        try:
+            cached = await task
+        finally:
+            self._creating.pop(key, None)
+        self._prefixes[key] = cached
+        if not owner:
+            # The registering call was counted as created or rejected
+            with self._lock:
+                if cached.name:
+                    self.hits += 1
+                else:
+                    self.inline += 1
+        return cached.name
+
+    def record_usage(self, usage: Optional[types.GenerateContentResponseUsageMetadata]) -> None:
+        """Count prompt tokens and the share served from cached prefixes."""
+        if usage is None:
+            return
+        with self._lock:
+            self.prompt_tokens += usage.prompt_token_count or 0
+            self.cached_tokens += usage.cached_content_token_count or 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Prefix registrations, hits and prompt tokens served from the cache."""
+        with self._lock:
+            lookups = self.hits + self.created + self.rejected + self.inline
+            return {
+                "prefixes": sum(1 for p in self._prefixes.values() if p.name),
+                "lookups": lookups,
+                "hits": self.hits,
+                "created": self.created,
+                "rejected": self.rejected,
+                "inline": self.inline,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_prompt_tokens": self.cached_tokens,
+                "cached_token_fraction": round(self.cached_tokens / self.prompt_tokens, 4) if self.prompt_tokens else 0.0,
+            }
+
+
+def use_cached_prefix(llm_request: LlmRequest, name: str) -> LlmRequest:
+    """A copy of a request that references a cached prefix instead of repeating it."""
+    config = llm_request.config.model_copy(update={
+        "system_instruction": None,
+        "tools": None,
+        "tool_config": None,
+        "cached_content": name,
+    })
+    return llm_request.model_copy(update={"config": config})
+
+
+class PromptCachedModel(BaseLlm):
+    """
+    Model wrapper that sends static prefixes by cache handle.
+
+    Attributes:
+        inner: Model answering the rewritten requests
+        cache: Prefix registry for inner's provider
+    """
+
+    inner: BaseLlm
+    cache: Any
+
+    @property
+    def capabilities(self) -> LlmCapabilities:
+        return self.inner.capabilities
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        name = await self.cache.lookup(llm_request)
+        if name is not None:
+            llm_request = use_cached_prefix(llm_request, name)
+
+        usage = None
+        async for response in self.inner.generate_content_async(llm_request, stream=stream):
+            if response.usage_metadata is not None:
+                usage = response.usage_metadata
+            yield response
+        self.cache.record_usage(usage)
+        if usage is not None and usage.cached_content_token_count:
+            trace.get_current_span().set_attribute(CACHED_TOKENS_ATTRIBUTE, usage.cached_content_token_count)
@@ -3,6 +3,9 @@
 from google.adk.agents import Agent
 from google.adk.tools import google_search
 from google.genai import types
+from agents.model_scheduler import Priority
+from agents.models import get_model
+from agents.specialists import RESEARCH_AGENT
 
 
 def create_research_agent(retry_config: types.HttpRetryOptions) -> Agent:
@@ -20,9 +23,9 @@ def create_research_agent(retry_config: types.HttpRetryOptions) -> Agent:
     """
     
     return Agent(
-        name="health_research_agent",
-        model="gemini-2.0-flash-lite",
-        description="Specialized agent for researching health conditions, symptoms, and treatments from trusted medical sources.",
+        name=RESEARCH_AGENT.name,
+        model=get_model("gemini-2.0-flash-lite", retry_config, Priority.BACKGROUND),
+        description=RESEARCH_AGENT.description,
         instruction="""You are a health research specialist. Your role is to:
 
 1. Search for reliable, evidence-based health information using Google Search
@@ -0,0 +1,497 @@
+"""Session Store - Persistent, bounded session service with history compaction
+
+Sessions are written to a local SQLite file as events arrive, so they
+survive restarts, while only recently used sessions are kept in memory: the
+least recently used are evicted past a size limit or after an idle TTL and
+reloaded from disk on their next turn.
+
+Each turn re-sends the session history to the model, so long chronic-care
+conversations grow prompt size and latency without bound. Once a session's
+history passes a token threshold, turns older than the most recent few are
+compacted: the medications and symptoms mentioned in them are kept as
+structured state (session.state["patient_context"]) plus one short summary
+event, and the verbatim text is dropped. The summary is authored by
+"conversation_summary", not the user, so models see it as quoted context
+rather than something the patient said.
+
+Like InMemorySessionService, get_session and create_session return copies;
+changes reach the stored session only through append_event. SQLite reads,
+writes and commits run in worker threads so they never block the event loop.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session, State
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.genai import types
+
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "healthguard", "sessions.sqlite")
+
+# Rough characters-per-token ratio, as in tools/output_format.py
+CHARS_PER_TOKEN = 4
+
+COMPACTION_AUTHOR = "conversation_summary"
+PATIENT_CONTEXT_KEY = "patient_context"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    last_update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id, seq)
+);
+"""
+
+SessionKey = Tuple[str, str, str]
+
+
+class SessionStoreConfig(NamedTuple):
+    """
+    Session store settings.
+
+    Attributes:
+        path: SQLite file the sessions are persisted to
+        max_cached_sessions: Sessions kept in memory; least recently used
+            sessions beyond this are evicted (they stay on disk)
+        idle_ttl_seconds: Sessions idle this long are evicted from memory
+        compact_token_threshold: Estimated history tokens that trigger
+            compaction. 0 disables compaction.
+        keep_recent_turns: Most recent turns always kept verbatim
+    """
+    path: str = DEFAULT_PATH
+    max_cached_sessions: int = 1000
+    idle_ttl_seconds: float = 30 * 60
+    compact_token_threshold: int = 4000
+    keep_recent_turns: int = 3
+
+    @classmethod
+    def from_env(cls) -> "SessionStoreConfig":
+        """Build a config from HEALTHGUARD_SESSION_* environment variables."""
+        return cls(
+            path=os.path.expanduser(os.getenv("HEALTHGUARD_SESSION_DB", DEFAULT_PATH)),
+            max_cached_sessions=int(os.getenv("HEALTHGUARD_SESSION_CACHE_SIZE", "1000")),
+            idle_ttl_seconds=float(os.getenv("HEALTHGUARD_SESSION_IDLE_TTL", "1800")),
+            compact_token_threshold=int(os.getenv("HEALTHGUARD_SESSION_COMPACT_TOKENS", "4000")),
+            keep_recent_turns=int(os.getenv("HEALTHGUARD_SESSION_KEEP_TURNS", "3")),
+        )
+
+
+def estimate_event_tokens(event: Event) -> int:
+    """Estimate the prompt tokens an event adds to the conversation history."""
+    if event.content is None or not event.content.parts:
+        return 0
+    chars = 0
+    for part in event.content.parts:
+        if part.text:
+            chars += len(part.text)
+        elif part.function_call:
+            chars += len(json.dumps(part.function_call.args or {}, default=str))
+        elif part.function_response:
+            chars += len(json.dumps(part.function_response.response or {}, default=str))
+    return (chars + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _event_text(event: Event) -> str:
+    if event.content is None or not event.content.parts:
+        return ""
+    texts = []
+    for part in event.content.parts:
+        if part.text:
+            texts.append(part.text)
+        elif part.function_call:
+            texts.append(json.dumps(part.function_call.args or {}, default=str))
+        elif part.function_response:
+            texts.append(json.dumps(part.function_response.response or {}, default=str))
+    return "\n".join(texts)
+
+
+def extract_patient_context(events: List[Event], context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Merge the medications and symptoms mentioned in events into a context.
+
+    Args:
+        events: Events being compacted
+        context: Existing patient context to extend
+
+    Returns:
+        Patient context with "medications" (generic names), "symptoms"
+        (keyword and severity tier) and "compacted_turns"
+    """
+    from tools.drug_interaction_tool import MEDICATION_RESOLVER
+    from tools.symptom_assessment_tool import find_symptom_keywords
+
+    context = dict(context or {})
+    medications = dict.fromkeys(context.get("medications", []))
+    symptoms = {s["symptom"]: s for s in context.get("symptoms", [])}
+
+    for event in events:
+        text = _event_text(event)
+        if not text:
+            continue
+        medications.update(dict.fromkeys(MEDICATION_RESOLVER.find_mentions(text)))
+        # Only what the user said describes the patient; specialist answers
+        # list symptoms as examples
+        if event.author == "user":
+            for tier, keyword, _ in find_symptom_keywords(text.lower()):
+                symptoms.setdefault(keyword, {"symptom": keyword, "severity": tier})
+
+    context["medications"] = list(medications)
+    context["symptoms"] = list(symptoms.values())
+    context["compacted_turns"] = context.get("compacted_turns", 0) + len(
+        {event.invocation_id for event in events if event.author == "user"}
+    )
+    return context
+
+
+def format_patient_context(context: Dict[str, Any]) -> str:
+    """Summary text that replaces compacted turns in the history."""
+    medications = ", ".join(context["medications"]) or "none mentioned"
+    symptoms = ", ".join(
+        f"{s['symptom']} ({s['severity']})" for s in context["symptoms"]
+    ) or "none mentioned"
+    return (
+        f"[Summary of {context['compacted_turns']} earlier turns in this conversation]\n"
+        f"Medications mentioned: {medications}\n"
+        f"Symptoms mentioned: {symptoms}"
+    )
+
+
+class PersistentSessionService(BaseSessionService):
+    """
+    SQLite-backed session service with an LRU/TTL memory cache and compaction.
+
+    app: and user: prefixed state is stored with the session it was set in
+    rather than shared across sessions.
+
+    Args:
+        config: Storage, eviction and compaction settings
+    """
+
+    def __init__(self, config: Optional[SessionStoreConfig] = None):
+        self.config = config or SessionStoreConfig()
+        directory = os.path.dirname(os.path.abspath(self.config.path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(self.config.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+        self._cache: "OrderedDict[SessionKey, Tuple[Session, float]]" = OrderedDict()
+        self._next_seq: Dict[SessionKey, int] = {}
+        self.stats = {"loads": 0, "evictions": 0, "compactions": 0, "compacted_tokens": 0}
+
+    @classmethod
+    def from_env(cls) -> "PersistentSessionService":
+        """Build a service from HEALTHGUARD_SESSION_* environment variables."""
+        return cls(SessionStoreConfig.from_env())
+
+    # ---- memory cache -------------------------------------------------
+
+    def _remember(self, key: SessionKey, session: Session) -> None:
+        now = time.monotonic()
+        self._cache[key] = (session, now)
+        self._cache.move_to_end(key)
+        while self._cache:
+            oldest_key, (_, last_used) = next(iter(self._cache.items()))
+            if len(self._cache) <= self.config.max_cached_sessions \
+                    and now - last_used < self.config.idle_ttl_seconds:
+                break
+            self._cache.popitem(last=False)
+            self._next_seq.pop(oldest_key, None)
+            self.stats["evictions"] += 1
+
+    def _forget(self, key: SessionKey) -> None:
+        self._cache.pop(key, None)
+        self._next_seq.pop(key, None)
+
+    # ---- storage (blocking, run through asyncio.to_thread) -------------
+
+    def _read_session(self, key: SessionKey) -> Optional[Tuple[Session, int]]:
+        """A stored session and the number of its next event, or None."""
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT state, last_update_time FROM sessions "
+                "WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            rows = self._db.execute(
+                "SELECT seq, event FROM events WHERE app_name = ? AND user_id = ? "
+                "AND session_id = ? ORDER BY seq",
+                key,
+            ).fetchall()
+        session = Session(
+            app_name=key[0],
+            user_id=key[1],
+            id=key[2],
+            state=json.loads(row[0]),
+            events=[Event.model_validate_json(event) for _, event in rows],
+            last_update_time=row[1],
+        )
+        return session, rows[-1][0] + 1 if rows else 0
+
+    def _read_next_seq(self, key: SessionKey) -> int:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT MAX(seq) FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                key,
+            ).fetchone()
+        return (row[0] + 1) if row[0] is not None else 0
+
+    def _write(
+        self,
+        session_row: Tuple[Any, ...],
+        events: Sequence[Tuple[int, str]],
+        replace_events: bool = False,
+    ) -> None:
+        """
+        Save a session row and events in one transaction.
+
+        Args:
+            session_row: Values of the sessions row (see _session_row)
+            events: (seq, event JSON) pairs to insert
+            replace_events: Delete the session's stored events first
+        """
+        key = session_row[:3]
+        with self._db_lock:
+            self._db.execute("BEGIN")
+            try:
+                if replace_events:
+                    self._db.execute(
+                        "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?", key
+                    )
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO events (app_name, user_id, session_id, seq, event) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(*key, seq, event) for seq, event in events],
+                )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sessions "
+                    "(app_name, user_id, session_id, state, last_update_time) VALUES (?, ?, ?, ?, ?)",
+                    session_row,
+                )
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def _delete(self, key: SessionKey) -> None:
+        with self._db_lock:
+            self._db.execute(
+                "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?", key
+            )
+            self._db.execute(
+                "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?", key
+            )
+
+    def _list(self, query: str, params: Tuple[str, ...]) -> List[Tuple[Any, ...]]:
+        with self._db_lock:
+            return self._db.execute(query, params).fetchall()
+
+    # ---- storage (event loop) ------------------------------------------
+
+    def _session_row(self, session: Session) -> Tuple[Any, ...]:
+        """Sessions row values, serialized before handing them to a worker thread."""
+        state = json.dumps(
+            {k: v for k, v in session.state.items() if not k.startswith(State.TEMP_PREFIX)},
+            default=str,
+        )
+        return (session.app_name, session.user_id, session.id, state, session.last_update_time)
+
+    async def _load(self, key: SessionKey) -> Optional[Session]:
+        loaded = await asyncio.to_thread(self._read_session, key)
+        if loaded is None:
+            return None
+        session, next_seq = loaded
+        self.stats["loads"] += 1
+        # An append that ran during the load already knows the current number
+        self._next_seq.setdefault(key, next_seq)
+        return session
+
+    # ---- BaseSessionService -------------------------------------------
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id.strip() if session_id and session_id.strip() else uuid.uuid4().hex,
+            state=dict(state or {}),
+            last_update_time=time.time(),
+        )
+        key = (app_name, user_id, session.id)
+        await asyncio.to_thread(self._write, self._session_row(session), [], True)
+        self._next_seq[key] = 0
+        self._remember(key, session)
+        return session.model_copy(deep=True)
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        key = (app_name, user_id, session_id)
+        cached = self._cache.get(key)
+        if cached is None:
+            session = await self._load(key)
+            if session is None:
+                return None
+            # Another caller may have loaded and changed it meanwhile
+            cached = self._cache.get(key)
+        if cached is not None:
+            session = cached[0]
+        self._remember(key, session)
+
+        if config is None:
+            return session.model_copy(deep=True)
+        events = session.events
+        if config.num_recent_events is not None:
+            events = events[-config.num_recent_events:] if config.num_recent_events else []
+        if config.after_timestamp is not None:
+            events = [e for e in events if e.timestamp >= config.after_timestamp]
+        return session.model_copy(update={"events": events}).model_copy(deep=True)
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        query = "SELECT user_id, session_id, state, last_update_time FROM sessions WHERE app_name = ?"
+        params: Tuple[str, ...] = (app_name,)
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params += (user_id,)
+        rows = await asyncio.to_thread(self._list, query + " ORDER BY last_update_time", params)
+        return ListSessionsResponse(sessions=[
+            Session(app_name=app_name, user_id=uid, id=sid, state=json.loads(state),
+                    last_update_time=updated)
+            for uid, sid, state, updated in rows
+        ])
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id)
+        self._forget(key)
+        await asyncio.to_thread(self._delete, key)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        key = (session.app_name, session.user_id, session.id)
+
+        # A new user turn starts: earlier turns are complete and safe to compact
+        if event.author == "user" and self.config.compact_token_threshold > 0:
+            await self._maybe_compact(key, session, event)
+
+        event = await super().append_event(session, event)
+        session.last_update_time = event.timestamp
+
+        # The caller holds a copy; apply the event to the stored session too
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] is not session:
+            stored = cached[0]
+            await super().append_event(stored, event)
+            stored.last_update_time = event.timestamp
+
+        if key not in self._next_seq:
+            # Evicted or created elsewhere; number new events after the stored ones
+            next_seq = await asyncio.to_thread(self._read_next_seq, key)
+            self._next_seq.setdefault(key, next_seq)
+        seq = self._next_seq[key]
+        self._next_seq[key] = seq + 1
+
+        await asyncio.to_thread(
+            self._write, self._session_row(session), [(seq, event.model_dump_json(exclude_none=True))]
+        )
+        return event
+
+    # ---- compaction ---------------------------------------------------
+
+    async def _maybe_compact(self, key: SessionKey, session: Session, new_event: Event) -> None:
+        """Compact all but the most recent turns once the history is too long."""
+        tokens = sum(estimate_event_tokens(e) for e in session.events)
+        if tokens <= self.config.compact_token_threshold:
+            return
+
+        turn_ids: List[str] = []
+        for event in session.events:
+            if event.author == "user" and event.invocation_id not in turn_ids \
+                    and event.invocation_id != new_event.invocation_id:
+                turn_ids.append(event.invocation_id)
+        old_turns = set(turn_ids[:-self.config.keep_recent_turns] if self.config.keep_recent_turns else turn_ids)
+        if not old_turns:
+            return
+
+        # Earlier summaries are folded into the new one via patient_context
+        compacted, kept = [], []
+        for event in session.events:
+            if event.invocation_id in old_turns or event.id.startswith("compaction-"):
+                compacted.append(event)
+            else:
+                kept.append(event)
+
+        context = extract_patient_context(
+            [e for e in compacted if not e.id.startswith("compaction-")],
+            session.state.get(PATIENT_CONTEXT_KEY),
+        )
+        summary = Event(
+            id=f"compaction-{uuid.uuid4().hex}",
+            invocation_id=f"compaction-{uuid.uuid4().hex}",
+            author=COMPACTION_AUTHOR,
+            timestamp=compacted[-1].timestamp,
+            content=types.Content(role="model", parts=[types.Part(text=format_patient_context(context))]),
+        )
+
+        session.state[PATIENT_CONTEXT_KEY] = context
+        session.events[:] = [summary] + kept
+        self._next_seq[key] = len(session.events)
+        await asyncio.to_thread(
+            self._write,
+            self._session_row(session),
+            [(seq, event.model_dump_json(exclude_none=True)) for seq, event in enumerate(session.events)],
+            True,
+        )
+        if key in self._cache:
+            self._remember(key, session.model_copy(deep=True))
+
+        self.stats["compactions"] += 1
+        self.stats["compacted_tokens"] += tokens - sum(estimate_event_tokens(e) for e in session.events)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache and compaction counters.
+
+        Returns:
+            Dictionary with cached session count, disk loads, evictions,
+            compactions and estimated tokens removed by compaction
+        """
+        return {"cached_sessions": len(self._cache), **self.stats}
@@ -0,0 +1,44 @@
+"""Specialist Agent Registry - Names and descriptions known without building agents
+
+Kept free of heavy imports so the coordinator can declare its specialist
+tools before the specialist modules (and their tools and data) are loaded.
+"""
+
+import importlib
+from typing import Callable, NamedTuple
+
+
+class SpecialistSpec(NamedTuple):
+    """Static identity of a specialist agent and where its factory lives."""
+    name: str
+    description: str
+    module: str
+    factory: str
+
+    def load_factory(self) -> Callable:
+        """Import the specialist's module and return its create_* factory."""
+        return getattr(importlib.import_module(self.module), self.factory)
+
+
+RESEARCH_AGENT = SpecialistSpec(
+    name="health_research_agent",
+    description="Specialized agent for researching health conditions, symptoms, and treatments from trusted medical sources.",
+    module="agents.research_agent",
+    factory="create_research_agent",
+)
+
+MEDICATION_SAFETY_AGENT = SpecialistSpec(
+    name="medication_safety_agent",
+    description="Specialist in medication interactions, safety information, and drug information.",
+    module="agents.medication_safety_agent",
+    factory="create_medication_safety_agent",
+)
+
+SYMPTOM_TRACKER_AGENT = SpecialistSpec(
+    name="symptom_tracker_agent",
+    description="Specialist in symptom assessment and determining when medical care is needed.",
+    module="agents.symptom_tracker_agent",
+    factory="create_symptom_tracker_agent",
+)
+
+SPECIALISTS = (RESEARCH_AGENT, MEDICATION_SAFETY_AGENT, SYMPTOM_TRACKER_AGENT)
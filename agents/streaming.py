@@ -0,0 +1,237 @@
+"""Streaming Turns - Print agent output as it arrives and measure latency
+
+runner.run_debug() only prints once each agent message is complete, so a
+multi-hop answer shows nothing until the coordinator has heard back from
+every specialist. This module consumes the runner's event stream with SSE
+streaming enabled, prints partial coordinator text and specialist progress
+as the events arrive, and records time-to-first-token and total latency for
+each turn.
+"""
+
+import os
+import sys
+import time
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Sequence
+
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.genai import types
+
+if TYPE_CHECKING:
+    from google.adk.runners import Runner
+
+
+DEFAULT_USER_ID = "healthguard_user"
+DEFAULT_SESSION_ID = "healthguard_session"
+
+
+class TurnMetrics(NamedTuple):
+    """
+    Latency of one conversation turn.
+
+    Attributes:
+        query: The user's message
+        first_token_seconds: Time until the first answer text was printed,
+            or None if the turn produced no text (or was not streamed)
+        total_seconds: Time until the turn completed
+        tool_calls: Number of tool and specialist calls made by the coordinator
+    """
+    query: str
+    first_token_seconds: Optional[float]
+    total_seconds: float
+    tool_calls: int = 0
+
+
+def streaming_enabled() -> bool:
+    """Whether the CLI streams responses (HEALTHGUARD_STREAMING, default on)."""
+    return os.getenv("HEALTHGUARD_STREAMING", "1") == "1"
+
+
+def _text(parts: Sequence[types.Part]) -> str:
+    return "".join(part.text for part in parts if part.text and not part.thought)
+
+
+async def _ensure_session(runner: "Runner", user_id: str, session_id: str) -> None:
+    session = await runner.session_service.get_session(
+        app_name=runner.app_name, user_id=user_id, session_id=session_id
+    )
+    if session is None:
+        await runner.session_service.create_session(
+            app_name=runner.app_name, user_id=user_id, session_id=session_id
+        )
+
+
+async def stream_turn(
+    runner: "Runner",
+    query: str,
+    user_id: str = DEFAULT_USER_ID,
+    session_id: str = DEFAULT_SESSION_ID,
+    start: Optional[float] = None,
+) -> TurnMetrics:
+    """
+    Run one turn, printing text and specialist progress as events arrive.
+
+    Args:
+        runner: Runner for the coordinator agent
+        query: The user's message
+        user_id: Session user; reuse the same IDs to continue a conversation
+        session_id: Session to run the turn in
+        start: perf_counter() value the latency is measured from. Defaults to
+            now; pass the time the query was received to include local work.
+
+    Returns:
+        TurnMetrics for the turn
+    """
+    start = time.perf_counter() if start is None else start
+    first_token: Optional[float] = None
+    tool_calls = 0
+    call_started: Dict[str, float] = {}
+    streamed = False  # partial text printed since the last complete message
+
+    await _ensure_session(runner, user_id, session_id)
+    run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+    message = types.UserContent(parts=[types.Part(text=query)])
+
+    async with aclosing(
+        runner.run_async(
+            user_id=user_id, session_id=session_id, new_message=message, run_config=run_config
+        )
+    ) as events:
+        async for event in events:
+            if event.content is None or not event.content.parts:
+                continue
+
+            for call in event.get_function_calls():
+                tool_calls += 1
+                call_started[call.id or call.name] = time.perf_counter()
+                print(f"🔧 Consulting {call.name}...", flush=True)
+            for response in event.get_function_responses():
+                began = call_started.pop(response.id or response.name, None)
+                took = f" ({time.perf_counter() - began:.1f}s)" if began is not None else ""
+                print(f"✅ {response.name} answered{took}", flush=True)
+
+            text = _text(event.content.parts)
+            if not text:
+                continue
+            if first_token is None:
+                first_token = time.perf_counter() - start
+                print("🏥 HealthGuard AI:", flush=True)
+            if event.partial:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+                streamed = True
+            else:
+                # The complete message repeats any partial chunks already shown
+                print("" if streamed else text, flush=True)
+                streamed = False
+
+    return TurnMetrics(
+        query=query,
+        first_token_seconds=first_token,
+        total_seconds=time.perf_counter() - start,
+        tool_calls=tool_calls,
+    )
+
+
+class TurnResult(NamedTuple):
+    """Final answer text and latency of a non-streamed turn."""
+    text: str
+    metrics: TurnMetrics
+
+
+async def collect_turn(
+    runner: "Runner",
+    query: str,
+    user_id: str = DEFAULT_USER_ID,
+    session_id: str = DEFAULT_SESSION_ID,
+    start: Optional[float] = None,
+) -> TurnResult:
+    """
+    Run one turn without printing and return the coordinator's final answer.
+
+    Args:
+        runner: Runner for the coordinator agent
+        query: The user's message
+        user_id: Session user
+        session_id: Session to run the turn in (created if missing)
+        start: perf_counter() value the latency is measured from
+
+    Returns:
+        TurnResult with the final answer text and the turn's metrics
+    """
+    start = time.perf_counter() if start is None else start
+    first_token: Optional[float] = None
+    tool_calls = 0
+    answer: List[str] = []
+
+    await _ensure_session(runner, user_id, session_id)
+    message = types.UserContent(parts=[types.Part(text=query)])
+
+    async with aclosing(
+        runner.run_async(user_id=user_id, session_id=session_id, new_message=message)
+    ) as events:
+        async for event in events:
+            if event.content is None or not event.content.parts:
+                continue
+            tool_calls += len(event.get_function_calls())
+            text = _text(event.content.parts)
+            if text and first_token is None:
+                first_token = time.perf_counter() - start
+            if text and event.is_final_response():
+                answer.append(text)
+
+    metrics = TurnMetrics(
+        query=query,
+        first_token_seconds=first_token,
+        total_seconds=time.perf_counter() - start,
+        tool_calls=tool_calls,
+    )
+    return TurnResult("\n".join(answer), metrics)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return round(ordered[index], 3)
+
+
+def summarize_latency(turns: Sequence[TurnMetrics]) -> Dict[str, Any]:
+    """
+    Summarize latency across turns.
+
+    Args:
+        turns: Metrics of completed turns
+
+    Returns:
+        Dictionary with turn count and p50/p95 time-to-first-token and total
+        latency in seconds (None when there is no data)
+    """
+    first_tokens = [t.first_token_seconds for t in turns if t.first_token_seconds is not None]
+    totals = [t.total_seconds for t in turns]
+    return {
+        "turns": len(turns),
+        "ttft_p50": _percentile(first_tokens, 0.5) if first_tokens else None,
+        "ttft_p95": _percentile(first_tokens, 0.95) if first_tokens else None,
+        "total_p50": _percentile(totals, 0.5) if totals else None,
+        "total_p95": _percentile(totals, 0.95) if totals else None,
+    }
+
+
+def print_turn_metrics(metrics: TurnMetrics) -> None:
+    """Print the latency line shown after each answer."""
+    first = (
+        f"first token {metrics.first_token_seconds:.2f}s, "
+        if metrics.first_token_seconds is not None else ""
+    )
+    print(f"\n⏱️  {first}total {metrics.total_seconds:.2f}s, {metrics.tool_calls} tool calls")
+
+
+def print_latency_summary(turns: Sequence[TurnMetrics]) -> None:
+    """Print p50/p95 latency for a session or demo run."""
+    if not turns:
+        return
+    summary = summarize_latency(turns)
+    line = f"⏱️  {summary['turns']} turns: total p50 {summary['total_p50']}s / p95 {summary['total_p95']}s"
+    if summary["ttft_p50"] is not None:
+        line += f", first token p50 {summary['ttft_p50']}s / p95 {summary['ttft_p95']}s"
+    print(line)
@@ -1,11 +1,19 @@
 """Symptom Tracking and Assessment Agent - Fixed for Google ADK"""
 
+from typing import Optional
+
 from google.adk.agents import Agent
 from google.genai import types
+from agents.models import get_model
+from agents.specialists import SYMPTOM_TRACKER_AGENT
 from tools.symptom_assessment_tool import assess_symptom_severity, check_symptom_duration
+from tools.output_format import ToolOutputConfig, format_tools, output_instruction
 
 
-def create_symptom_tracker_agent(retry_config: types.HttpRetryOptions) -> Agent:
+def create_symptom_tracker_agent(
+    retry_config: types.HttpRetryOptions,
+    tool_output: Optional[ToolOutputConfig] = None,
+) -> Agent:
     """
     Creates a specialized agent for symptom tracking and severity assessment.
     
@@ -13,15 +21,19 @@ def create_symptom_tracker_agent(retry_config: types.HttpRetryOptions) -> Agent:
     
     Args:
         retry_config: Retry configuration for API calls
+        tool_output: Tool response format for this agent. Defaults to
+            ToolOutputConfig.from_env().
         
     Returns:
         Configured Agent instance
     """
     
+    tool_output = tool_output or ToolOutputConfig.from_env()
+    
     return Agent(
-        name="symptom_tracker_agent",
-        model="gemini-2.0-flash-lite",
-        description="Specialist in symptom assessment and determining when medical care is needed.",
+        name=SYMPTOM_TRACKER_AGENT.name,
+        model=get_model("gemini-2.0-flash-lite", retry_config),
+        description=SYMPTOM_TRACKER_AGENT.description,
         instruction="""You are a symptom assessment specialist. Your role is to:
 
 1. Evaluate reported symptoms for severity
@@ -76,6 +88,6 @@ RESPONSE FORMAT:
 3. Present findings clearly with severity level highlighted
 4. Provide actionable next steps
 5. Include warning signs to watch for
-""",
-        tools=[assess_symptom_severity, check_symptom_duration]
+""" + output_instruction(tool_output),
+        tools=format_tools([assess_symptom_severity, check_symptom_duration], tool_output)
     )
\ No newline at end of file
@@ -0,0 +1,302 @@
+"""Tool Memo - Session-scoped memo of tool results shared by every agent
+
+Within one conversation the coordinator delegates to the same specialists
+again and again, and they re-run check_drug_interactions,
+get_medication_info or assess_symptom_severity with arguments they already
+used. The memo keeps each result in session state. AgentTool copies the
+session state into every specialist's sub-session and forwards new keys
+back, so all sub-agents share one memo.
+
+Sessions are persisted, so the memo is bounded: entries live in a fixed set
+of slots, "tool_memo:0" to "tool_memo:<size - 1>". A new result takes a free
+slot or evicts the least recently used entry. Parallel branches may pick the
+same slot, in which case one entry is lost, which costs a tool call at most.
+
+ToolMemoPlugin, installed on the runner, uses it in two places:
+
+  * a repeated call is answered from the memo before the tool runs, and
+  * the memo entries for an agent's tools are shown to its model as a
+    leading message, so the model can answer from them and skip the tool
+    round trip (one extra model call) entirely.
+
+Arguments are normalized before keying: case and whitespace are ignored and
+comma-separated lists are compared as sorted sets, so "Lisinopril,
+Metformin" and "metformin, lisinopril" share an entry.
+
+Enabled by default; HEALTHGUARD_TOOL_MEMO=0 disables it,
+HEALTHGUARD_TOOL_MEMO_SIZE sets the entries kept per session (default 32) and
+HEALTHGUARD_TOOL_MEMO_CONTEXT how many are shown to a model (default 8, 0
+hides the memo from models).
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.plugins import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+from opentelemetry import trace
+
+from tools.result_cache import CACHE_HIT_ATTRIBUTE
+
+
+TOOL_MEMO_PREFIX = "tool_memo:"
+MEMO_HEADER = "[Tool results already obtained in this conversation - reuse them instead of calling the tool again]"
+
+# Deterministic tools whose results can be reused for the rest of a session
+MEMOIZED_TOOLS = frozenset({
+    "check_drug_interactions",
+    "check_regimen_interactions",
+    "get_medication_info",
+    "assess_symptom_severity",
+    "check_symptom_duration",
+})
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class ToolMemoConfig(NamedTuple):
+    """
+    Tool memo settings.
+
+    Attributes:
+        enabled: Install the memo plugin on runners
+        max_entries: Entries kept per session; the least recently used is
+            evicted beyond this
+        context_entries: Most recent memo entries shown to a model (0 hides
+            the memo from models; repeated calls are still answered from it)
+    """
+    enabled: bool = True
+    max_entries: int = 32
+    context_entries: int = 8
+
+    @classmethod
+    def from_env(cls) -> "ToolMemoConfig":
+        """Build a config from HEALTHGUARD_TOOL_MEMO* variables."""
+        return cls(
+            enabled=os.getenv("HEALTHGUARD_TOOL_MEMO", "1") == "1",
+            max_entries=max(1, int(os.getenv("HEALTHGUARD_TOOL_MEMO_SIZE", "32"))),
+            context_entries=int(os.getenv("HEALTHGUARD_TOOL_MEMO_CONTEXT", "8")),
+        )
+
+
+def _normalize_value(value: Any) -> Any:
+    if not isinstance(value, str):
+        return value
+    value = _WHITESPACE.sub(" ", value.strip().lower())
+    if "," in value:
+        return ", ".join(sorted(item.strip() for item in value.split(",") if item.strip()))
+    return value
+
+
+def memo_key(tool_name: str, args: Mapping[str, Any]) -> str:
+    """
+    Identity of a tool call in the memo.
+
+    Args:
+        tool_name: Name of the tool
+        args: Call arguments as sent by the model
+
+    Returns:
+        "tool_memo:<tool>:<normalized args as JSON>"
+    """
+    normalized = {name: _normalize_value(value) for name, value in args.items()}
+    return f"{TOOL_MEMO_PREFIX}{tool_name}:{json.dumps(normalized, sort_keys=True)}"
+
+
+def memo_slots(max_entries: int) -> List[str]:
+    """Session state keys holding the memo entries."""
+    return [f"{TOOL_MEMO_PREFIX}{slot}" for slot in range(max_entries)]
+
+
+def memo_entries(state: Mapping[str, Any], max_entries: int) -> List[Dict[str, Any]]:
+    """Memo entries in a session state, oldest first."""
+    entries = [state.get(slot) for slot in memo_slots(max_entries)]
+    return sorted((entry for entry in entries if entry), key=lambda entry: entry.get("at", 0))
+
+
+def find_entry(state: Mapping[str, Any], key: str, max_entries: int) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Look up a call in the memo.
+
+    Returns:
+        (slot, entry) for a hit, otherwise (slot to store the call in, None):
+        a free slot, or the least recently used entry's
+    """
+    free, oldest, oldest_used = "", "", float("inf")
+    for slot in memo_slots(max_entries):
+        entry = state.get(slot)
+        if not entry:
+            free = free or slot
+        elif entry.get("key") == key:
+            return slot, entry
+        elif entry.get("used", 0) < oldest_used:
+            oldest, oldest_used = slot, entry.get("used", 0)
+    return free or oldest, None
+
+
+def format_memo(entries: List[Dict[str, Any]]) -> str:
+    """The memo message shown to a model: a header plus one JSON line per entry."""
+    lines = [MEMO_HEADER]
+    for entry in entries:
+        lines.append("- " + json.dumps(
+            {"tool": entry["tool"], "args": entry["args"], "result": entry["result"]}, ensure_ascii=False
+        ))
+    return "\n".join(lines)
+
+
+def parse_memo(text: str) -> List[Dict[str, Any]]:
+    """Entries of a memo message built by format_memo() (empty if text is not one)."""
+    if not text.startswith(MEMO_HEADER):
+        return []
+    return [json.loads(line[2:]) for line in text.splitlines()[1:] if line.startswith("- ")]
+
+
+class ToolMemoPlugin(BasePlugin):
+    """
+    Runner plugin that answers repeated tool calls from the session memo
+    and shows the memo to models.
+
+    Args:
+        config: Memo settings
+
+    Attributes:
+        hits: Tool calls answered from the memo
+        misses: Memoizable tool calls that ran and were stored
+        evictions: Entries dropped to stay within max_entries
+        exposed: Model requests that were shown memo entries
+        round_trips_avoided: Of those, requests for a new user message that
+            the model answered without calling a tool, each saving the tool
+            call and the follow-up model call
+    """
+
+    def __init__(self, config: Optional[ToolMemoConfig] = None):
+        super().__init__(name="tool_memo")
+        self.config = config or ToolMemoConfig.from_env()
+        self._exposed_requests: Dict[Tuple[str, str], bool] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.exposed = 0
+        self.round_trips_avoided = 0
+
+    async def before_tool_callback(
+        self, *, tool: BaseTool, tool_args: Dict[str, Any], tool_context: ToolContext
+    ) -> Optional[Dict[str, Any]]:
+        if tool.name not in MEMOIZED_TOOLS:
+            return None
+        slot, entry = find_entry(tool_context.state, memo_key(tool.name, tool_args), self.config.max_entries)
+        trace.get_current_span().set_attribute(CACHE_HIT_ATTRIBUTE, entry is not None)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        tool_context.state[slot] = {**entry, "used": time.time()}
+        return {"result": entry["result"]}
+
+    async def after_tool_callback(
+        self, *, tool: BaseTool, tool_args: Dict[str, Any], tool_context: ToolContext, result: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        if tool.name not in MEMOIZED_TOOLS:
+            return None
+        key = memo_key(tool.name, tool_args)
+        slot, entry = find_entry(tool_context.state, key, self.config.max_entries)
+        if entry is None:
+            value = result["result"] if isinstance(result, dict) and set(result) == {"result"} else result
+            now = time.time()
+            if tool_context.state.get(slot):
+                with self._lock:
+                    self.evictions += 1
+            tool_context.state[slot] = {
+                "key": key, "tool": tool.name, "args": dict(tool_args), "result": value, "at": now, "used": now,
+            }
+        return None
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        if self.config.context_entries <= 0:
+            return None
+        tools = MEMOIZED_TOOLS.intersection(llm_request.tools_dict)
+        if not tools:
+            return None
+        # Results of calls made in this conversation window are already in the contents
+        present = {
+            memo_key(part.function_call.name, part.function_call.args or {})
+            for content in llm_request.contents for part in content.parts or [] if part.function_call
+        }
+        entries = [
+            entry for entry in memo_entries(callback_context.state.to_dict(), self.config.max_entries)
+            if entry["tool"] in tools and entry["key"] not in present
+        ]
+        if not entries:
+            return None
+
+        # Leading message, so the cached instruction prefix stays unchanged
+        llm_request.contents.insert(0, types.Content(
+            role="user", parts=[types.Part(text=format_memo(entries[-self.config.context_entries:]))]
+        ))
+        last = llm_request.contents[-1]
+        answering_message = not any(part.function_response for part in last.parts or [])
+        with self._lock:
+            self.exposed += 1
+            if answering_message:
+                self._exposed_requests[(callback_context.invocation_id, callback_context.agent_name)] = True
+        return None
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        if llm_response.partial:
+            return None
+        with self._lock:
+            exposed = self._exposed_requests.pop((callback_context.invocation_id, callback_context.agent_name), False)
+            if exposed and llm_response.content and not any(
+                part.function_call for part in llm_response.content.parts or []
+            ):
+                self.round_trips_avoided += 1
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Memo hits and misses, and model round trips avoided."""
+        with self._lock:
+            calls = self.hits + self.misses
+            return {
+                "tool_hits": self.hits,
+                "tool_misses": self.misses,
+                "hit_rate": round(self.hits / calls, 4) if calls else 0.0,
+                "evictions": self.evictions,
+                "model_requests_with_memo": self.exposed,
+                "round_trips_avoided": self.round_trips_avoided,
+            }
+
+
+_plugin: Optional[ToolMemoPlugin] = None
+_plugin_lock = threading.Lock()
+
+
+def get_tool_memo_plugin() -> Optional[ToolMemoPlugin]:
+    """The process-wide memo plugin, or None if HEALTHGUARD_TOOL_MEMO=0."""
+    global _plugin
+    config = ToolMemoConfig.from_env()
+    if not config.enabled:
+        return None
+    with _plugin_lock:
+        if _plugin is None:
+            _plugin = ToolMemoPlugin(config)
+        return _plugin
+
+
+def runner_plugins() -> List[BasePlugin]:
+    """Plugins every HealthGuard runner installs."""
+    plugin = get_tool_memo_plugin()
+    return [plugin] if plugin is not None else []
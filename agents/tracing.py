@@ -0,0 +1,337 @@
+"""Tracing - OpenTelemetry spans for turns, agent hops, model calls and tools
+
+ADK already opens a span for every agent invocation ("invoke_agent <name>"),
+model call ("call_llm", with gen_ai.usage.* token counts) and tool call
+("execute_tool <name>", including each AgentTool delegation), but they only
+go somewhere once a tracer provider is installed. setup_tracing() installs
+one with the configured exporters and, when the package is present,
+instruments the google-genai client. HealthGuard adds:
+
+  * a root "healthguard.turn" span per user turn (turn_span()), carrying the
+    turn's latency, emergency flag and, summed over all nested spans, model
+    calls, tool calls, prompt/completion tokens, prompt tokens served from
+    cached prefixes, cache hits and the most severe symptom assessment,
+  * healthguard.cache_hit on tool spans served from the tool result cache or
+    the research answer cache,
+  * healthguard.severity / healthguard.severity_level on symptom
+    assessment spans.
+
+Exporters (HEALTHGUARD_TRACING, comma-separated): "console" prints one line
+per span, "file" appends spans as JSON lines to HEALTHGUARD_TRACE_FILE and
+"otlp" sends them to OTEL_EXPORTER_OTLP_ENDPOINT (e.g. a local collector or
+Jaeger at http://localhost:4318). Tracing is off by default.
+"""
+
+import contextlib
+import json
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterator, NamedTuple, Optional
+
+from opentelemetry import trace
+from opentelemetry.context import Context
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SimpleSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+
+from agents.prompt_cache import CACHED_TOKENS_ATTRIBUTE
+from tools.result_cache import CACHE_HIT_ATTRIBUTE, SEVERITY_ATTRIBUTE, SEVERITY_LEVEL_ATTRIBUTE
+
+if TYPE_CHECKING:
+    from agents.streaming import TurnMetrics
+
+
+TRACING_EXPORTERS = ("console", "file", "otlp")
+TURN_SPAN_NAME = "healthguard.turn"
+DEFAULT_TRACE_FILE = "healthguard_traces.jsonl"
+
+# Totals added to each turn span (healthguard.<name>) and their initial values
+TURN_TOTALS = {
+    "model_calls": 0,
+    "tool_calls": 0,
+    "prompt_tokens": 0,
+    "completion_tokens": 0,
+    "cache_hits": 0,
+    "cached_prompt_tokens": 0,
+    "severity": None,
+    "severity_level": 0,
+}
+
+tracer = trace.get_tracer("healthguard")
+
+
+class TracingConfig(NamedTuple):
+    """
+    Tracing settings.
+
+    Attributes:
+        exporters: Span exporters to install ("console", "file", "otlp");
+            empty disables tracing
+        file_path: JSON-lines file written by the "file" exporter
+        otlp_endpoint: Collector endpoint for the "otlp" exporter (None uses
+            the OTEL_EXPORTER_OTLP_* defaults)
+        service_name: service.name resource attribute
+    """
+    exporters: tuple = ()
+    file_path: str = DEFAULT_TRACE_FILE
+    otlp_endpoint: Optional[str] = None
+    service_name: str = "healthguard-ai"
+
+    @classmethod
+    def from_env(cls) -> "TracingConfig":
+        """Build a config from HEALTHGUARD_TRACING / HEALTHGUARD_TRACE_FILE and OTEL_* variables."""
+        exporters = tuple(
+            name.strip() for name in os.getenv("HEALTHGUARD_TRACING", "").split(",")
+            if name.strip() and name.strip() != "none"
+        )
+        return cls(
+            exporters=exporters,
+            file_path=os.getenv("HEALTHGUARD_TRACE_FILE", DEFAULT_TRACE_FILE),
+            otlp_endpoint=os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT") or os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"),
+            service_name=os.getenv("OTEL_SERVICE_NAME", "healthguard-ai"),
+        )
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """
+    Appends each finished span to a file as one JSON object per line.
+
+    Args:
+        path: Output file (created if missing)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+        return SpanExportResult.SUCCESS
+
+
+def _console_line(span: ReadableSpan) -> str:
+    """One-line summary of a span: name, duration and HealthGuard/token attributes."""
+    duration_ms = (span.end_time - span.start_time) / 1e6 if span.end_time else 0.0
+    attributes = {
+        key: value for key, value in (span.attributes or {}).items()
+        if key.startswith(("healthguard.", "gen_ai.usage."))
+    }
+    details = f" {json.dumps(attributes, default=str)}" if attributes else ""
+    return f"🔭 {span.name} {duration_ms:.1f}ms{details}\n"
+
+
+class TurnAggregator(SpanProcessor):
+    """
+    Sums the spans of each turn so the turn span can report totals.
+
+    Only traces opened by turn_span() are tracked, and their totals are
+    handed over (and forgotten) when the turn span ends.
+    """
+
+    def __init__(self):
+        self._totals: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def start_turn(self, trace_id: int) -> None:
+        with self._lock:
+            self._totals[trace_id] = dict(TURN_TOTALS)
+
+    def finish_turn(self, trace_id: int) -> Dict[str, Any]:
+        with self._lock:
+            return self._totals.pop(trace_id, {})
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        pass
+
+    def on_end(self, span: ReadableSpan) -> None:
+        totals = self._totals.get(span.context.trace_id)
+        if totals is None:
+            return
+        attributes = span.attributes or {}
+        with self._lock:
+            if span.name == "call_llm":
+                totals["model_calls"] += 1
+                totals["prompt_tokens"] += int(attributes.get("gen_ai.usage.input_tokens", 0))
+                totals["completion_tokens"] += int(attributes.get("gen_ai.usage.output_tokens", 0))
+            elif span.name.startswith("execute_tool ") and span.name != "execute_tool (merged)":
+                totals["tool_calls"] += 1
+            totals["cached_prompt_tokens"] += int(attributes.get(CACHED_TOKENS_ATTRIBUTE, 0))
+            if attributes.get(CACHE_HIT_ATTRIBUTE):
+                totals["cache_hits"] += 1
+            level = int(attributes.get(SEVERITY_LEVEL_ATTRIBUTE, 0))
+            if level > totals["severity_level"]:
+                totals["severity_level"] = level
+                totals["severity"] = attributes.get(SEVERITY_ATTRIBUTE)
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+_aggregator: Optional[TurnAggregator] = None
+_exporting = False
+_setup_lock = threading.RLock()
+
+
+def _otlp_exporter(endpoint: Optional[str]) -> Optional[SpanExporter]:
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    except ImportError:
+        print("⚠️  OTLP tracing needs: pip install opentelemetry-exporter-otlp-proto-http")
+        return None
+    if endpoint and not endpoint.rstrip("/").endswith("/v1/traces"):
+        endpoint = endpoint.rstrip("/") + "/v1/traces"
+    return OTLPSpanExporter(endpoint=endpoint) if endpoint else OTLPSpanExporter()
+
+
+def _instrument_genai_client() -> bool:
+    """Instrument the google-genai client if its OpenTelemetry package is installed."""
+    try:
+        from opentelemetry.instrumentation.google_genai import GoogleGenAiSdkInstrumentor
+    except ImportError:
+        return False
+    GoogleGenAiSdkInstrumentor().instrument()
+    return True
+
+
+def sdk_tracer_provider(service_name: str = "healthguard-ai") -> TracerProvider:
+    """
+    The global SDK tracer provider, installed first if none is set yet.
+
+    Lets in-process consumers (e.g. evaluation/runner.py) attach their own
+    span processors with or without exporters configured.
+    """
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+        trace.set_tracer_provider(provider)
+    return provider
+
+
+def enable_turn_totals() -> None:
+    """
+    Make turn_span() add turn totals even when no exporter is configured.
+
+    Used by batch runs that report tokens and calls per query (main.py
+    --batch); setup_tracing() calls it too.
+    """
+    global _aggregator
+    with _setup_lock:
+        if _aggregator is None:
+            aggregator = TurnAggregator()
+            sdk_tracer_provider().add_span_processor(aggregator)
+            _aggregator = aggregator
+
+
+def turn_totals(span: trace.Span) -> Dict[str, Any]:
+    """Totals a finished turn span was given (empty unless turn totals are enabled)."""
+    attributes = getattr(span, "attributes", None) or {}
+    return {
+        key[len("healthguard."):]: value for key, value in attributes.items()
+        if key[len("healthguard."):] in TURN_TOTALS
+    }
+
+
+def setup_tracing(config: Optional[TracingConfig] = None) -> bool:
+    """
+    Install a tracer provider with the configured exporters (once per process).
+
+    Args:
+        config: Tracing settings. Defaults to TracingConfig.from_env().
+
+    Returns:
+        True if tracing is active
+    """
+    global _exporting
+    config = config or TracingConfig.from_env()
+    if not config.exporters:
+        return _exporting
+
+    with _setup_lock:
+        if _exporting:
+            return True
+
+        unknown = set(config.exporters) - set(TRACING_EXPORTERS)
+        if unknown:
+            raise ValueError(
+                f"Unknown tracing exporter(s): {', '.join(sorted(unknown))} "
+                f"(expected {', '.join(TRACING_EXPORTERS)})"
+            )
+
+        provider = sdk_tracer_provider(config.service_name)
+        enable_turn_totals()
+        if "console" in config.exporters:
+            provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter(formatter=_console_line)))
+        if "file" in config.exporters:
+            provider.add_span_processor(BatchSpanProcessor(JsonLinesSpanExporter(config.file_path)))
+        if "otlp" in config.exporters:
+            exporter = _otlp_exporter(config.otlp_endpoint)
+            if exporter is not None:
+                provider.add_span_processor(BatchSpanProcessor(exporter))
+
+        _instrument_genai_client()
+        _exporting = True
+        return True
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans (batch exporters) before the process exits."""
+    provider = trace.get_tracer_provider()
+    if isinstance(provider, TracerProvider):
+        provider.force_flush()
+
+
+@contextlib.contextmanager
+def turn_span(query: str, session_id: str, emergency: bool = False) -> Iterator[trace.Span]:
+    """
+    Open the root span of one user turn.
+
+    Every span ADK opens while the turn runs (agents, model calls, tools)
+    nests under it; their totals are added to it when the block exits.
+
+    Args:
+        query: The user's message (only its length is recorded)
+        session_id: Session the turn runs in
+        emergency: Whether the emergency router flagged the message
+
+    Yields:
+        The turn span (a no-op span when tracing is off)
+    """
+    with tracer.start_as_current_span(TURN_SPAN_NAME, attributes={
+        "healthguard.session_id": session_id,
+        "healthguard.query_chars": len(query),
+        "healthguard.emergency": emergency,
+    }) as span:
+        trace_id = span.get_span_context().trace_id
+        aggregator = _aggregator if span.is_recording() else None
+        if aggregator is not None:
+            aggregator.start_turn(trace_id)
+        try:
+            yield span
+        finally:
+            if aggregator is not None:
+                totals = aggregator.finish_turn(trace_id)
+                for key, value in totals.items():
+                    if value is not None:
+                        span.set_attribute(f"healthguard.{key}", value)
+
+
+def record_turn_metrics(span: trace.Span, metrics: "TurnMetrics") -> None:
+    """Add a finished turn's latency metrics to its turn span."""
+    if not span.is_recording():
+        return
+    span.set_attribute("healthguard.latency_ms", round(metrics.total_seconds * 1000, 2))
+    if metrics.first_token_seconds is not None:
+        span.set_attribute("healthguard.first_token_ms", round(metrics.first_token_seconds * 1000, 2))
+    span.set_attribute("healthguard.coordinator_tool_calls", metrics.tool_calls)
+
@@ -0,0 +1,129 @@
+"""Benchmark Compare - Diff two saved benchmark reports and flag regressions
+
+Works with the JSON reports of benchmarks.tool_benchmark and
+benchmarks.turn_benchmark. Metrics where lower is better (latency, CPU,
+per-call time) regress when they grow; throughput regresses when it drops.
+Exits with status 1 when any metric regressed by more than the threshold,
+so it can gate CI.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json --threshold 0.10
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Sequence, Tuple
+
+
+# (metric value, higher_is_better) per metric name
+Metrics = Dict[str, Tuple[float, bool]]
+
+
+def extract_metrics(report: Dict[str, Any]) -> Metrics:
+    """
+    Flatten a benchmark report into comparable metrics.
+
+    Args:
+        report: Report saved by tool_benchmark or turn_benchmark
+
+    Returns:
+        Mapping of metric name to (value, higher_is_better)
+    """
+    metrics: Metrics = {}
+    if report["benchmark"] == "tools":
+        for case_id, result in report["results"].items():
+            metrics[f"{case_id} p50 µs"] = (result["us_per_call"]["p50"], False)
+    elif report["benchmark"] == "turns":
+        for phase, result in report["results"].items():
+            metrics[f"{phase} turns/s"] = (result["turns_per_second"], True)
+            metrics[f"{phase} CPU ms/turn"] = (result["cpu_ms_per_turn"], False)
+            for stat in ("p50", "p95", "p99"):
+                if stat in result["latency_ms"]:
+                    metrics[f"{phase} latency {stat} ms"] = (result["latency_ms"][stat], False)
+    else:
+        raise ValueError(f"Unknown benchmark report: {report['benchmark']}")
+    return metrics
+
+
+def compare_reports(
+    baseline: Dict[str, Any], candidate: Dict[str, Any], threshold: float = 0.10
+) -> Dict[str, Any]:
+    """
+    Compare two reports of the same benchmark.
+
+    Args:
+        baseline: Report from the reference commit
+        candidate: Report from the commit under test
+        threshold: Relative change that counts as a regression or improvement
+
+    Returns:
+        Dictionary with per-metric changes and the regressed/improved names
+    """
+    if baseline["benchmark"] != candidate["benchmark"]:
+        raise ValueError(
+            f"Cannot compare a '{baseline['benchmark']}' report with a '{candidate['benchmark']}' report"
+        )
+
+    before, after = extract_metrics(baseline), extract_metrics(candidate)
+    changes = {}
+    regressed, improved = [], []
+    for name in before.keys() & after.keys():
+        (old, higher_is_better), (new, _) = before[name], after[name]
+        change = (new - old) / old if old else 0.0
+        worse = -change if higher_is_better else change
+        changes[name] = {"baseline": old, "candidate": new, "change": round(change, 4)}
+        if worse > threshold:
+            regressed.append(name)
+        elif worse < -threshold:
+            improved.append(name)
+
+    return {
+        "benchmark": baseline["benchmark"],
+        "baseline_commit": baseline.get("commit"),
+        "candidate_commit": candidate.get("commit"),
+        "threshold": threshold,
+        "changes": dict(sorted(changes.items())),
+        "regressed": sorted(regressed),
+        "improved": sorted(improved),
+        "only_in_baseline": sorted(before.keys() - after.keys()),
+        "only_in_candidate": sorted(after.keys() - before.keys()),
+    }
+
+
+def print_comparison(comparison: Dict[str, Any]) -> None:
+    """Print a human-readable comparison table."""
+    print("=" * 70)
+    print(f"🏥 HealthGuard AI - {comparison['benchmark']} benchmark: "
+          f"{comparison['baseline_commit']} → {comparison['candidate_commit']}")
+    print("=" * 70)
+    for name, change in comparison["changes"].items():
+        marker = "❌" if name in comparison["regressed"] else "✅" if name in comparison["improved"] else "  "
+        print(f"{marker} {name:<55} {change['baseline']:>10g} → {change['candidate']:>10g} "
+              f"({change['change']:+.1%})")
+    print(f"\n{len(comparison['regressed'])} regressed, {len(comparison['improved'])} improved "
+          f"(threshold {comparison['threshold']:.0%})")
+
+
+def main(argv: Sequence[str] = None) -> None:
+    """Command-line entry point for comparing benchmark reports."""
+    parser = argparse.ArgumentParser(description="Compare two HealthGuard AI benchmark reports")
+    parser.add_argument("baseline", help="Report from the reference commit")
+    parser.add_argument("candidate", help="Report from the commit under test")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative change counted as a regression (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, "r", encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    comparison = compare_reports(baseline, candidate, args.threshold)
+    print_comparison(comparison)
+    if comparison["regressed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark Harness - Timing, percentiles and report metadata shared by the benchmarks
+
+Every benchmark report carries the same metadata (git commit, Python
+version, CPU count, time) so that JSON results saved on different commits
+can be compared with benchmarks.compare.
+"""
+
+import datetime
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of a list of values.
+
+    Args:
+        values: Sample values (any order)
+        fraction: Percentile as a fraction (0.95 for p95)
+
+    Returns:
+        Value at that rank, or 0.0 for an empty sample
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples: Sequence[float], scale: float = 1.0, digits: int = 3) -> Dict[str, float]:
+    """
+    Summarize timing samples.
+
+    Args:
+        samples: Durations in seconds
+        scale: Multiplier applied to every statistic (1e6 for microseconds)
+        digits: Rounding of the reported statistics
+
+    Returns:
+        Dictionary with count, mean, p50, p95, p99, min and max
+    """
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "mean": round(statistics.fmean(samples) * scale, digits),
+        "p50": round(percentile(samples, 0.50) * scale, digits),
+        "p95": round(percentile(samples, 0.95) * scale, digits),
+        "p99": round(percentile(samples, 0.99) * scale, digits),
+        "min": round(min(samples) * scale, digits),
+        "max": round(max(samples) * scale, digits),
+    }
+
+
+def time_calls(func: Callable[[], Any], min_time: float = 0.2, repeats: int = 5) -> List[float]:
+    """
+    Time a zero-argument callable, timeit style.
+
+    The number of calls per repeat is calibrated so that one repeat takes at
+    least min_time seconds. Each sample is the mean per-call time of one
+    repeat, which keeps timer overhead out of sub-microsecond functions.
+
+    Args:
+        func: Function to time
+        min_time: Minimum duration of one repeat in seconds
+        repeats: Number of repeats (samples) to return
+
+    Returns:
+        Per-call durations in seconds, one per repeat
+    """
+    func()  # warm up caches and lazy imports
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    samples = [elapsed / number]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return samples
+
+
+def git_commit() -> str:
+    """Current git commit of the repository, or "unknown" outside a checkout."""
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return proc.stdout.strip()
+
+
+def report_metadata(benchmark: str) -> Dict[str, Any]:
+    """
+    Metadata stored with every benchmark report.
+
+    Args:
+        benchmark: Benchmark name (e.g. "tools", "turns")
+
+    Returns:
+        Dictionary with benchmark name, commit, Python, platform, CPU count
+        and UTC timestamp
+    """
+    return {
+        "benchmark": benchmark,
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+    }
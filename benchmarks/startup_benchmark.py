@@ -0,0 +1,144 @@
+"""Startup Benchmark - Import time and cold-start latency report
+
+Runs each measurement in a fresh interpreter (like a new serverless
+container) and reports, as the median over several runs:
+
+  * import_main       time to import main.py (what runs before the menu)
+  * build_coordinator time to import and build the coordinator agent tree
+  * first_use_<agent> time to build each specialist on first delegation
+  * the slowest imports from `python -X importtime`
+
+Results can be saved as JSON to track them across commits.
+
+Usage:
+    python -m benchmarks.startup_benchmark --runs 5 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Sequence
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executed in a fresh interpreter; prints stage timings as JSON on stdout
+_STAGES_SCRIPT = """
+import json, time
+timings = {}
+start = time.perf_counter()
+import main
+timings["import_main"] = time.perf_counter() - start
+
+start = time.perf_counter()
+from agents.health_coordinator import create_health_coordinator
+from agents.models import create_retry_config
+coordinator = create_health_coordinator(create_retry_config())
+timings["build_coordinator"] = time.perf_counter() - start
+
+for tool in coordinator.tools:
+    start = time.perf_counter()
+    tool.agent
+    timings["first_use_" + tool.name] = time.perf_counter() - start
+
+print(json.dumps(timings))
+"""
+
+
+def _run_stages() -> Dict[str, Any]:
+    """Run one cold start with -X importtime and collect stage and import timings."""
+    env = dict(os.environ)
+    # main.py refuses to import without a key; nothing here calls the API
+    env.setdefault("GOOGLE_API_KEY", "startup-benchmark")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _STAGES_SCRIPT],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    stages = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append({
+            "module": name.strip(),
+            "top_level": not name[1:].startswith(" "),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        })
+
+    return {"stages": stages, "imports": imports}
+
+
+def run_benchmark(runs: int = 5, top: int = 15) -> Dict[str, Any]:
+    """
+    Measure cold-start stages over several fresh interpreters.
+
+    Args:
+        runs: Number of cold starts to run
+        top: Number of slowest imports to report
+
+    Returns:
+        Dictionary with median stage timings (ms) and slowest imports
+    """
+    samples: List[Dict[str, Any]] = [_run_stages() for _ in range(runs)]
+
+    stage_names = samples[0]["stages"].keys()
+    stages_ms = {
+        name: round(statistics.median(s["stages"][name] for s in samples) * 1000, 2)
+        for name in stage_names
+    }
+
+    # Imports from the last run; totals per module are stable across runs
+    imports = samples[-1]["imports"]
+    slowest_self = sorted(imports, key=lambda i: i["self_us"], reverse=True)[:top]
+    slowest_top_level = sorted(
+        (i for i in imports if i["top_level"]), key=lambda i: i["cumulative_us"], reverse=True
+    )[:top]
+
+    return {
+        "python": sys.version.split()[0],
+        "runs": runs,
+        "stages_ms": stages_ms,
+        "module_count": len(imports),
+        "slowest_imports_self": slowest_self,
+        "slowest_imports_cumulative": slowest_top_level,
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a human-readable startup report."""
+    print("=" * 70)
+    print(f"🏥 HealthGuard AI - Startup Benchmark (median of {report['runs']} runs)")
+    print("=" * 70)
+    for name, ms in report["stages_ms"].items():
+        print(f"  {name:<45} {ms:>10.2f} ms")
+    print(f"\n  Modules imported: {report['module_count']}")
+    print("\n  Slowest top-level imports (cumulative):")
+    for entry in report["slowest_imports_cumulative"]:
+        print(f"    {entry['module']:<43} {entry['cumulative_us'] / 1000:>10.2f} ms")
+
+
+def main(argv: Sequence[str] = None) -> None:
+    """Command-line entry point for the startup benchmark."""
+    parser = argparse.ArgumentParser(description="HealthGuard AI startup benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts to measure (default: 5)")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list (default: 15)")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(runs=args.runs, top=args.top)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Saved report to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""Tool Benchmark - Micro-benchmarks of the tools/ functions across input sizes
+
+Times every agent tool and the helpers behind them without any model or
+network, over growing inputs:
+
+  * medication list length   check_drug_interactions, check_regimen_interactions
+  * symptom count            assess_symptom_severity, check_symptom_duration_batch
+  * text length              find_symptom_keywords, MedicationResolver.find_mentions
+  * database size            the drug tools, name resolution and session regimen
+                             updates against synthetic interaction databases of
+                             growing size
+  * batch size               batch_triage.triage_lines
+
+Agent tools are timed through their undecorated function (cache misses);
+"cached" cases time the result cache hit path. Each case reports the
+per-call time in microseconds (p50/p95/p99 over repeats).
+
+Usage:
+    python -m benchmarks.tool_benchmark --output tools.json
+    python -m benchmarks.tool_benchmark --quick
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import tempfile
+from typing import Any, Callable, Dict, Iterator, List, Sequence
+
+from benchmarks.harness import report_metadata, summarize, time_calls
+
+
+MEDICATION_COUNTS = (1, 5, 20, 100)
+SYMPTOM_COUNTS = (1, 5, 20, 100)
+TEXT_WORDS = (10, 100, 1000)
+DATABASE_PAIRS = (1_000, 10_000, 100_000)
+BATCH_SIZES = (10, 100, 1000)
+
+QUICK_SIZES = {
+    "medications": (1, 20),
+    "symptoms": (1, 20),
+    "words": (10, 100),
+    "pairs": (1_000, 10_000),
+    "batch": (10, 100),
+}
+
+_FILLER_WORDS = ("i", "have", "been", "feeling", "unwell", "since", "monday", "and", "also", "take")
+_SEVERITIES = ("mild", "moderate", "severe")
+
+
+def _cycle(items: Sequence[str], count: int) -> List[str]:
+    return [items[i % len(items)] for i in range(count)]
+
+
+def _known_medications() -> List[str]:
+    """Real medication names, mixing generic, brand and misspelled spellings."""
+    return ["lisinopril", "Advil", "metformin", "asprin", "Tylenol", "warfarin", "zoloft", "ibuprofin"]
+
+
+def _symptoms(count: int) -> List[str]:
+    """Symptom descriptions mixing keyword tiers with unmatched text."""
+    from tools.symptom_assessment_tool import SYMPTOM_KEYWORDS
+    moderate = list(SYMPTOM_KEYWORDS["moderate"])
+    pool = [f"mild {keyword} since yesterday" for keyword in moderate] + ["tired after work", "stiff neck"]
+    return _cycle(pool, count)
+
+
+def _text(words: int, seed: int = 7) -> str:
+    """Free text with symptom and medication mentions scattered in filler."""
+    rng = random.Random(seed)
+    mentions = ["headache", "fever", "lisinopril", "tylenol", "cough", "st. john's wort"]
+    return " ".join(
+        rng.choice(mentions) if rng.random() < 0.1 else rng.choice(_FILLER_WORDS)
+        for _ in range(words)
+    )
+
+
+def synthetic_interaction_index(pairs: int, seed: int = 42) -> Dict[tuple, Dict[str, str]]:
+    """
+    Build a random interaction index in the INTERACTION_INDEX layout.
+
+    Args:
+        pairs: Number of interacting drug pairs
+        seed: Random seed, so every run benchmarks the same database
+
+    Returns:
+        Mapping of canonical drug pair to interaction details, over
+        pairs // 5 drugs named drug00000, drug00001, ...
+    """
+    from tools.interaction_db import canonical_pair
+
+    rng = random.Random(seed)
+    names = [f"drug{i:05d}" for i in range(max(10, pairs // 5))]
+    index: Dict[tuple, Dict[str, str]] = {}
+    while len(index) < pairs:
+        drug_a, drug_b = rng.sample(names, 2)
+        index[canonical_pair(drug_a, drug_b)] = {
+            "severity": rng.choice(_SEVERITIES),
+            "description": f"{drug_a} may interact with {drug_b}",
+            "recommendation": "Consult your healthcare provider",
+        }
+    return index
+
+
+@contextlib.contextmanager
+def interaction_database(index: Dict[tuple, Dict[str, str]]) -> Iterator[List[str]]:
+    """
+    Temporarily point the drug tools at another interaction index.
+
+    Args:
+        index: Interaction index (see synthetic_interaction_index)
+
+    Yields:
+        Drug names in the database
+    """
+    import tools.drug_interaction_tool as drug_tool
+    from tools.medication_aliases import MedicationResolver
+
+    saved = (drug_tool.INTERACTION_INDEX, drug_tool.INTERACTION_MATRIX, drug_tool.MEDICATION_RESOLVER)
+    matrix = drug_tool.build_interaction_matrix(index)
+    drug_tool.INTERACTION_INDEX = index
+    drug_tool.INTERACTION_MATRIX = matrix
+    drug_tool.MEDICATION_RESOLVER = MedicationResolver(generic_names=matrix.drug_ids, aliases={})
+    try:
+        yield list(matrix.drug_ids)
+    finally:
+        drug_tool.INTERACTION_INDEX, drug_tool.INTERACTION_MATRIX, drug_tool.MEDICATION_RESOLVER = saved
+
+
+class ToolBenchmark:
+    """
+    Collects benchmark cases and their timings.
+
+    Args:
+        min_time: Minimum seconds per repeat
+        repeats: Timing samples per case
+        sizes: Input sizes per dimension (see QUICK_SIZES for the keys)
+    """
+
+    def __init__(self, min_time: float, repeats: int, sizes: Dict[str, Sequence[int]]):
+        self.min_time = min_time
+        self.repeats = repeats
+        self.sizes = sizes
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def case(self, name: str, func: Callable[[], Any], **params: Any) -> None:
+        """Time one case and store it under "name[param=value,...]"."""
+        case_id = name + ("[" + ",".join(f"{k}={v}" for k, v in params.items()) + "]" if params else "")
+        samples = time_calls(func, min_time=self.min_time, repeats=self.repeats)
+        self.results[case_id] = {"function": name, "params": params, "us_per_call": summarize(samples, scale=1e6)}
+        print(f"  {case_id:<60} {self.results[case_id]['us_per_call']['p50']:>12.2f} µs")
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """Run every case and return the results keyed by case ID."""
+        self._drug_tools()
+        self._symptom_tools()
+        self._text_matching()
+        self._database_size()
+        self._batch_triage()
+        self._formatting_and_caches()
+        return self.results
+
+    def _drug_tools(self) -> None:
+        from tools.drug_interaction_tool import (
+            check_drug_interactions,
+            check_regimen_interactions,
+            get_medication_info,
+        )
+
+        for count in self.sizes["medications"]:
+            medications = ", ".join(_cycle(_known_medications(), count))
+            self.case("check_drug_interactions",
+                      lambda: check_drug_interactions.__wrapped__(medications, "ibuprofen"), medications=count)
+            self.case("check_regimen_interactions",
+                      lambda: check_regimen_interactions.__wrapped__(medications), medications=count)
+
+        for spelling, name in (("exact", "metformin"), ("brand", "Tylenol"), ("misspelled", "metforman")):
+            self.case("get_medication_info", lambda: get_medication_info.__wrapped__(name), spelling=spelling)
+
+        self.case("check_drug_interactions", lambda: check_drug_interactions("lisinopril, metformin", "ibuprofen"),
+                  cached=True)
+
+    def _symptom_tools(self) -> None:
+        from tools.symptom_assessment_tool import (
+            assess_symptom_severity,
+            check_symptom_duration,
+            check_symptom_duration_batch,
+        )
+
+        for count in self.sizes["symptoms"]:
+            symptoms = _symptoms(count)
+            joined = ", ".join(symptoms)
+            days = [float(i % 10) for i in range(count)]
+            self.case("assess_symptom_severity", lambda: assess_symptom_severity.__wrapped__(joined), symptoms=count)
+            self.case("check_symptom_duration_batch", lambda: check_symptom_duration_batch(symptoms, days),
+                      symptoms=count)
+
+        self.case("check_symptom_duration", lambda: check_symptom_duration.__wrapped__("persistent cough", 12))
+        self.case("assess_symptom_severity", lambda: assess_symptom_severity("headache, fever"), cached=True)
+
+    def _text_matching(self) -> None:
+        from tools.drug_interaction_tool import MEDICATION_RESOLVER
+        from tools.symptom_assessment_tool import find_symptom_keywords
+
+        for words in self.sizes["words"]:
+            text = _text(words)
+            self.case("find_symptom_keywords", lambda: find_symptom_keywords(text), words=words)
+            self.case("MedicationResolver.find_mentions", lambda: MEDICATION_RESOLVER.find_mentions(text), words=words)
+
+    def _database_size(self) -> None:
+        from tools import drug_interaction_tool as drug_tool
+        from tools.medication_regimen import MedicationRegimen
+
+        for pairs in self.sizes["pairs"]:
+            with interaction_database(synthetic_interaction_index(pairs)) as drugs:
+                rng = random.Random(pairs)
+                current = ", ".join(rng.sample(drugs, 10))
+                regimen = ", ".join(rng.sample(drugs, 20))
+                new = rng.choice(drugs)
+                misspelled = drugs[len(drugs) // 2][:-1] + "x"
+                resolver = drug_tool.MEDICATION_RESOLVER
+                self.case("check_drug_interactions",
+                          lambda: drug_tool.check_drug_interactions.__wrapped__(current, new),
+                          pairs=pairs, medications=10)
+                self.case("check_regimen_interactions",
+                          lambda: drug_tool.check_regimen_interactions.__wrapped__(regimen),
+                          pairs=pairs, medications=20)
+                self.case("MedicationResolver.resolve", lambda: resolver.resolve(misspelled),
+                          pairs=pairs, spelling="misspelled")
+
+                saved = MedicationRegimen()
+                for name in regimen.split(", "):
+                    saved.add(name, name)
+                saved.interactions_with(new)  # neighbour index is built on first use
+                self.case("MedicationRegimen.interactions_with", lambda: saved.interactions_with(new),
+                          pairs=pairs, medications=20)
+                if new not in saved.medications:
+                    self.case("MedicationRegimen.add+remove",
+                              lambda: (saved.add(new, new), saved.remove(new)), pairs=pairs, medications=20)
+
+    def _batch_triage(self) -> None:
+        from tools.batch_triage import triage_lines
+        from tools.result_cache import clear_caches
+
+        def run(lines: List[str]) -> None:
+            clear_caches()  # every batch starts cold, like a new intake file
+            triage_lines(lines)
+
+        for size in self.sizes["batch"]:
+            lines = [
+                json.dumps({"id": f"intake-{i}", "symptoms": _symptoms(1 + i % 5),
+                            "duration_days": {"fever": i % 7}})
+                for i in range(size)
+            ]
+            self.case("triage_lines", lambda: run(lines), records=size)
+
+    def _formatting_and_caches(self) -> None:
+        from tools.drug_interaction_tool import check_regimen_interactions
+        from tools.output_format import compact_output
+        from tools.search_cache import SearchCache, normalize_query
+
+        result = check_regimen_interactions.__wrapped__(", ".join(_known_medications()))
+        self.case("compact_output", lambda: compact_output(result))
+        self.case("compact_output", lambda: compact_output(result, token_budget=60), token_budget=60)
+
+        query = "What are the early symptoms of Type 2 diabetes, and how is it treated?"
+        self.case("normalize_query", lambda: normalize_query(query))
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SearchCache(os.path.join(tmp, "search.sqlite"), ttl_seconds=3600, max_entries=1000)
+            cache.put(query, "cached research answer")
+            self.case("SearchCache.get", lambda: cache.get(query), hit=True)
+            self.case("SearchCache.get", lambda: cache.get("never asked"), hit=False)
+
+
+def run_benchmark(quick: bool = False, min_time: float = 0.2, repeats: int = 5) -> Dict[str, Any]:
+    """
+    Run the tool micro-benchmarks.
+
+    Args:
+        quick: Use fewer input sizes (for CI smoke runs)
+        min_time: Minimum seconds per timing repeat
+        repeats: Timing samples per case
+
+    Returns:
+        Report with metadata, settings and per-case results
+    """
+    sizes = QUICK_SIZES if quick else {
+        "medications": MEDICATION_COUNTS,
+        "symptoms": SYMPTOM_COUNTS,
+        "words": TEXT_WORDS,
+        "pairs": DATABASE_PAIRS,
+        "batch": BATCH_SIZES,
+    }
+    results = ToolBenchmark(min_time, repeats, sizes).run()
+    return {
+        **report_metadata("tools"),
+        "settings": {"min_time": min_time, "repeats": repeats, "sizes": sizes},
+        "results": results,
+    }
+
+
+def main(argv: Sequence[str] = None) -> None:
+    """Command-line entry point for the tool benchmark."""
+    parser = argparse.ArgumentParser(description="HealthGuard AI tool micro-benchmarks")
+    parser.add_argument("--quick", action="store_true", help="Fewer input sizes (CI smoke run)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="Minimum seconds per timing repeat (default: 0.2)")
+    parser.add_argument("--repeats", type=int, default=5, help="Timing samples per case (default: 5)")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    print("🏥 HealthGuard AI - Tool Benchmark (p50 per call)")
+    print("=" * 70)
+    report = run_benchmark(quick=args.quick, min_time=args.min_time, repeats=args.repeats)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Saved report to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Turn Benchmark - End-to-end coordinator turns through the runner on the mock model
+
+Runs complete user turns (coordinator -> specialist AgentTools -> tools ->
+answers) through the ADK Runner in-process, with the scripted MockModel
+(agents/mock_model.py) standing in for Gemini, so no API key or network is
+needed and every turn exercises real delegation and tool code. Two phases:
+
+  * latency     turns one at a time: p50/p95/p99 latency and CPU per turn
+  * throughput  many sessions at once: turns per second and latency under load
+
+With --mock-latency 0 the numbers are pure framework and tool overhead.
+
+Usage:
+    python -m benchmarks.turn_benchmark --output turns.json
+    python -m benchmarks.turn_benchmark --turns 20 --concurrency 8 --mock-latency 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, List, Sequence
+
+from benchmarks.harness import report_metadata, summarize
+
+
+QUERIES = [
+    "Can I take ibuprofen if I'm on Lisinopril?",
+    "I have a headache and mild fever for 3 days",
+    "Tell me about Metformin",
+    "I have a headache and take Lisinopril. What should I do?",
+    "What are the early signs of type 2 diabetes?",
+    "I take lisinopril, metformin and aspirin, can you check my regimen?",
+]
+
+USER_ID = "benchmark_user"
+
+
+def _configure_environment(mock_latency: float, session_dir: str) -> None:
+    """Point the agents at the scripted mock and throwaway stores."""
+    os.environ["HEALTHGUARD_MODEL_BACKEND"] = "mock"
+    os.environ["HEALTHGUARD_MOCK_MODE"] = "scripted"
+    os.environ["HEALTHGUARD_MOCK_LATENCY"] = str(mock_latency)
+    os.environ["HEALTHGUARD_SESSION_DB"] = os.path.join(session_dir, "sessions.sqlite")
+    # Research answers would otherwise be served from the cache after the first turn
+    os.environ["HEALTHGUARD_SEARCH_CACHE_SIZE"] = "0"
+    # The mock has no quota; only the framework should be measured
+    os.environ.setdefault("HEALTHGUARD_MODEL_RPS", "100000")
+    os.environ.setdefault("HEALTHGUARD_MODEL_BURST", "100000")
+    os.environ.setdefault("HEALTHGUARD_MODEL_CONCURRENCY", "100000")
+
+
+def _mock_model():
+    from agents.models import DEFAULT_MODEL, create_retry_config, get_model
+    model = get_model(DEFAULT_MODEL, create_retry_config())
+    # Unwrap the scheduler and prompt cache
+    while hasattr(model, "inner"):
+        model = model.inner
+    return model
+
+
+async def _run_turns(runner: Any, count: int, concurrency: int) -> Dict[str, Any]:
+    """Run count turns, at most concurrency at once, each in a new session."""
+    from agents.streaming import collect_turn
+
+    model = _mock_model()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    tool_calls: List[int] = []
+    errors: List[str] = []
+
+    async def turn(index: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await collect_turn(
+                    runner, QUERIES[index % len(QUERIES)], USER_ID, uuid.uuid4().hex, start=start
+                )
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+                return
+            latencies.append(time.perf_counter() - start)
+            tool_calls.append(result.metrics.tool_calls)
+
+    model_calls, function_calls = model.calls, model.function_calls
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    await asyncio.gather(*(turn(i) for i in range(count)))
+    elapsed, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    turns = len(latencies)
+
+    return {
+        "turns": turns,
+        "concurrency": concurrency,
+        "errors": len(errors),
+        "error_samples": errors[:3],
+        "elapsed_seconds": round(elapsed, 3),
+        "turns_per_second": round(turns / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": summarize(latencies, scale=1000, digits=2),
+        "cpu_ms_per_turn": round(cpu / turns * 1000, 2) if turns else 0.0,
+        "model_calls_per_turn": round((model.calls - model_calls) / turns, 2) if turns else 0.0,
+        "tool_calls_per_turn": round(sum(tool_calls) / turns, 2) if turns else 0.0,
+        "function_calls_per_turn": round((model.function_calls - function_calls) / turns, 2) if turns else 0.0,
+    }
+
+
+async def _run_phases(turns: int, concurrency: int, warmup: int) -> Dict[str, Any]:
+    from agents.health_coordinator import create_health_coordinator
+    from agents.models import create_retry_config
+    from main import create_runner
+
+    runner = create_runner(create_health_coordinator(create_retry_config()))
+    # Builds every specialist and loads tool data before timing starts
+    await _run_turns(runner, max(warmup, len(QUERIES)), 1)
+    return {
+        "latency": await _run_turns(runner, turns, 1),
+        "throughput": await _run_turns(runner, turns, concurrency),
+    }
+
+
+def run_benchmark(
+    turns: int = 60, concurrency: int = 16, mock_latency: float = 0.0, warmup: int = 6
+) -> Dict[str, Any]:
+    """
+    Benchmark end-to-end turns against the scripted mock model.
+
+    Args:
+        turns: Turns per phase (queries cycle through QUERIES)
+        concurrency: Turns in flight during the throughput phase
+        mock_latency: Simulated model latency per call in seconds
+        warmup: Untimed turns run first (at least one per query)
+
+    Returns:
+        Report with metadata, settings and the latency/throughput phases
+    """
+    with tempfile.TemporaryDirectory() as session_dir:
+        _configure_environment(mock_latency, session_dir)
+        phases = asyncio.run(_run_phases(turns, concurrency, warmup))
+
+    from agents.models import get_prompt_cache_stats
+
+    return {
+        **report_metadata("turns"),
+        "settings": {
+            "turns": turns,
+            "concurrency": concurrency,
+            "mock_latency_seconds": mock_latency,
+            "queries": QUERIES,
+        },
+        "results": phases,
+        "prompt_cache": get_prompt_cache_stats(),
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a human-readable turn report."""
+    settings = report["settings"]
+    print("=" * 70)
+    print(f"🏥 HealthGuard AI - Turn Benchmark (mock latency {settings['mock_latency_seconds']}s)")
+    print("=" * 70)
+    for phase, result in report["results"].items():
+        latency = result["latency_ms"]
+        print(f"\n  {phase} ({result['turns']} turns, concurrency {result['concurrency']}, "
+              f"{result['errors']} errors)")
+        print(f"    throughput        {result['turns_per_second']:>10.2f} turns/s")
+        if latency.get("count"):
+            print(f"    latency p50/p95/p99 {latency['p50']:.2f} / {latency['p95']:.2f} / {latency['p99']:.2f} ms")
+        print(f"    CPU per turn      {result['cpu_ms_per_turn']:>10.2f} ms")
+        print(f"    model calls/turn  {result['model_calls_per_turn']:>10.2f}")
+        print(f"    function calls/turn {result['function_calls_per_turn']:>8.2f} (all agents)")
+    for model, stats in report.get("prompt_cache", {}).items():
+        print(f"\n  prompt cache ({model}): {stats['hit_rate']:.0%} hits, "
+              f"{stats['cached_token_fraction']:.0%} of prompt tokens cached")
+
+
+def main(argv: Sequence[str] = None) -> None:
+    """Command-line entry point for the turn benchmark."""
+    parser = argparse.ArgumentParser(description="HealthGuard AI end-to-end turn benchmark (mock model)")
+    parser.add_argument("--turns", type=int, default=60, help="Turns per phase (default: 60)")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="Turns in flight in the throughput phase (default: 16)")
+    parser.add_argument("--mock-latency", type=float, default=0.0,
+                        help="Simulated model latency per call in seconds (default: 0)")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(turns=args.turns, concurrency=args.concurrency, mock_latency=args.mock_latency)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Saved report to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
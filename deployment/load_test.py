@@ -0,0 +1,253 @@
+"""Load Test - Throughput and latency of the HTTP service against the mock model
+
+Starts deployment.server under uvicorn in a child process with
+HEALTHGUARD_MODEL_BACKEND=mock, then drives it with concurrent simulated
+users over real HTTP. Each user keeps one keep-alive connection, opens its
+own session and sends a few messages in sequence. The client is a minimal
+HTTP/1.1 writer so that the load generator costs far less CPU than the
+server it measures. Model calls go through the real scheduler with its
+configured limits (HEALTHGUARD_MODEL_*). Reports turns per second, p50/p95/p99
+request latency and model calls per second, and checks them against the
+documented target (see deployment/README.md).
+
+Usage:
+    python -m deployment.load_test --users 100 --turns 5 --mock-latency 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from agents.model_scheduler import SchedulerConfig
+
+
+# Documented target for one server process on one CPU core at the default
+# settings (100 users x 5 turns, 50 ms mock latency), when the model-call
+# rate limit (HEALTHGUARD_MODEL_RPS) allows it
+TARGET_TURNS_PER_SECOND = 80.0
+TARGET_P95_SECONDS = 1.5
+# Below that rate limit: share of the limit the service must keep busy
+TARGET_RATE_UTILIZATION = 0.9
+
+QUERIES = [
+    "What are the symptoms of the flu and when should I see a doctor?",
+    "Can I take ibuprofen if I'm on blood pressure medication?",
+    "I have a headache and mild fever. What can I take?",
+    "Tell me about Metformin",
+    "Is it safe to combine warfarin and aspirin?",
+]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return round(ordered[index], 4)
+
+
+class _Connection:
+    """One keep-alive HTTP/1.1 connection sending JSON requests."""
+
+    def __init__(self, port: int):
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, path: str, body: Any = None) -> Tuple[int, Any]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n".encode()
+            + payload
+        )
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        status = int(status_line.split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        data = await self.reader.readexactly(length) if length else b""
+        return status, json.loads(data) if data else None
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def _user(port: int, user_id: str, turns: int, latencies: List[float], errors: List[str]) -> None:
+    connection = _Connection(port)
+    try:
+        _, created = await connection.request("POST", "/sessions", {"user_id": user_id})
+        session_id = created["session_id"]
+        for turn in range(turns):
+            start = time.perf_counter()
+            status, body = await connection.request(
+                "POST",
+                f"/sessions/{session_id}/messages",
+                {"user_id": user_id, "message": QUERIES[turn % len(QUERIES)]},
+            )
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(str(body))
+        await connection.request("DELETE", f"/sessions/{session_id}?user_id={user_id}")
+    finally:
+        connection.close()
+
+
+async def _wait_until_healthy(port: int, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        connection = _Connection(port)
+        try:
+            status, _ = await connection.request("GET", "/healthz")
+            if status == 200:
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+        finally:
+            connection.close()
+
+
+async def _health(port: int) -> Dict[str, Any]:
+    connection = _Connection(port)
+    try:
+        _, health = await connection.request("GET", "/healthz")
+    finally:
+        connection.close()
+    return health
+
+
+async def _model_calls(port: int) -> int:
+    return sum((await _health(port))["model_scheduler"]["granted"].values())
+
+
+async def run_load_test(users: int, turns: int, port: int) -> Dict[str, Any]:
+    """
+    Run the load test against a server listening on a local port.
+
+    Args:
+        users: Concurrent simulated users, one session and connection each
+        turns: Messages sent by each user, one after another
+        port: Port of the running deployment.server
+
+    Returns:
+        Summary with throughput, latency percentiles and error count
+    """
+    await _wait_until_healthy(port)
+    # Warm up: builds the agent tree before timing starts
+    await _user(port, "warmup", 1, [], [])
+    calls_before = await _model_calls(port)
+
+    latencies: List[float] = []
+    errors: List[str] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _user(port, f"user-{i}", turns, latencies, errors) for i in range(users)
+    ))
+    elapsed = time.perf_counter() - start
+
+    health = await _health(port)
+    model_calls = sum(health["model_scheduler"]["granted"].values()) - calls_before
+
+    return {
+        "users": users,
+        "turns_per_user": turns,
+        "mock_latency_seconds": float(os.environ["HEALTHGUARD_MOCK_LATENCY"]),
+        "mock_mode": os.environ["HEALTHGUARD_MOCK_MODE"],
+        "turns": len(latencies),
+        "errors": len(errors),
+        "elapsed_seconds": round(elapsed, 3),
+        "turns_per_second": round(len(latencies) / elapsed, 1),
+        "latency_p50": _percentile(latencies, 0.50),
+        "latency_p95": _percentile(latencies, 0.95),
+        "latency_p99": _percentile(latencies, 0.99),
+        "model_calls_per_turn": round(model_calls / max(len(latencies), 1), 2),
+        "model_calls_per_second": round(model_calls / elapsed, 1),
+        "server": health,
+    }
+
+
+def main(argv: Sequence[str] = None) -> None:
+    """Command-line entry point for the load test."""
+    parser = argparse.ArgumentParser(description="HealthGuard AI service load test (mock model)")
+    parser.add_argument("--users", type=int, default=100, help="Concurrent users (default: 100)")
+    parser.add_argument("--turns", type=int, default=5, help="Messages per user (default: 5)")
+    parser.add_argument("--mock-latency", type=float, default=0.05,
+                        help="Mock model latency per call in seconds (default: 0.05)")
+    parser.add_argument("--mock-mode", choices=["echo", "scripted"], default="echo",
+                        help="echo: one model call per turn (default); scripted: the mock "
+                             "delegates to specialists and calls their tools")
+    parser.add_argument("--output", help="Write the JSON summary to this file")
+    args = parser.parse_args(argv)
+
+    os.environ["HEALTHGUARD_MODEL_BACKEND"] = "mock"
+    os.environ["HEALTHGUARD_MOCK_LATENCY"] = str(args.mock_latency)
+    os.environ["HEALTHGUARD_MOCK_MODE"] = args.mock_mode
+    session_dir = tempfile.TemporaryDirectory()
+    os.environ["HEALTHGUARD_SESSION_DB"] = os.path.join(session_dir.name, "sessions.sqlite")
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "deployment.server:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning", "--timeout-keep-alive", "60"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    try:
+        summary = asyncio.run(run_load_test(args.users, args.turns, port))
+    finally:
+        server.terminate()
+        server.wait()
+        session_dir.cleanup()
+
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+    rate_limit = SchedulerConfig.from_env().requests_per_second
+    utilization = summary["model_calls_per_second"] / rate_limit
+    print(f"Model calls: {summary['model_calls_per_second']:g}/s of the {rate_limit:g}/s scheduler "
+          f"limit ({utilization:.0%}), {summary['model_calls_per_turn']:g} per turn")
+
+    if rate_limit < TARGET_TURNS_PER_SECOND:
+        # Throughput is capped by the model-call rate limit; the service
+        # should keep that quota busy without errors
+        meets_target = summary["errors"] == 0 and utilization >= TARGET_RATE_UTILIZATION
+        status = "✅ meets" if meets_target else "❌ misses"
+        print(f"{status} rate-limited target: >= {TARGET_RATE_UTILIZATION:.0%} of "
+              f"HEALTHGUARD_MODEL_RPS used, no errors")
+    elif (args.users, args.turns, args.mock_latency, args.mock_mode) == (100, 5, 0.05, "echo"):
+        meets_target = (
+            summary["errors"] == 0
+            and summary["turns_per_second"] >= TARGET_TURNS_PER_SECOND
+            and summary["latency_p95"] <= TARGET_P95_SECONDS
+        )
+        status = "✅ meets" if meets_target else "❌ misses"
+        print(f"{status} target: >= {TARGET_TURNS_PER_SECOND:g} turns/s, "
+              f"p95 <= {TARGET_P95_SECONDS:g}s")
+
+
+if __name__ == "__main__":
+    main()
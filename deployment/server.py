@@ -0,0 +1,293 @@
+"""HealthGuard AI HTTP Service - Many concurrent sessions in one process
+
+An ASGI app (Starlette, served by uvicorn) hosting one coordinator agent
+tree and one Runner for every user. Agents share pooled model clients
+(agents/models.py), each conversation is an ADK session addressed by its
+session ID and persisted by agents/session_store.py, and turns within one
+session are serialized while different sessions run concurrently.
+
+Endpoints:
+    GET    /healthz                         liveness and basic counters
+    POST   /sessions                        {"user_id": "..."} -> new session_id
+    POST   /sessions/{session_id}/messages  {"user_id": "...", "message": "..."}
+                                            (Accept: application/x-ndjson streams the
+                                            emergency warning before the answer)
+    DELETE /sessions/{session_id}?user_id=  end a session
+
+Usage:
+    uvicorn deployment.server:app --host 0.0.0.0 --port 8080
+    HEALTHGUARD_MODEL_BACKEND=mock uvicorn deployment.server:app   # no API key needed
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from agents.emergency_router import check_emergency, elaboration_enabled
+from agents.model_scheduler import Priority, get_scheduler, turn_priority
+from agents.models import create_retry_config, get_prompt_cache_stats, model_backend
+from agents.streaming import collect_turn
+from agents.tool_memo import get_tool_memo_plugin, runner_plugins
+from agents.tracing import record_turn_metrics, setup_tracing, shutdown_tracing, turn_span
+
+
+APP_NAME = "healthguard_ai"
+DEFAULT_USER_ID = "anonymous"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class HealthGuardService:
+    """
+    Shared runner plus per-session turn locks and service counters.
+
+    Args:
+        max_concurrent_turns: Turns allowed to run at once across all
+            sessions; further turns wait for a free slot. Defaults to the
+            model scheduler's concurrency, since more turns than model slots
+            only queue inside the scheduler while holding their sessions.
+    """
+
+    def __init__(self, max_concurrent_turns: Optional[int] = None):
+        from google.adk.apps import App
+        from google.adk.runners import Runner
+        from agents.health_coordinator import create_health_coordinator
+        from agents.session_store import PersistentSessionService
+
+        self.runner = Runner(
+            app=App(
+                name=APP_NAME,
+                root_agent=create_health_coordinator(create_retry_config()),
+                plugins=runner_plugins(),
+            ),
+            session_service=PersistentSessionService.from_env(),
+        )
+        if max_concurrent_turns is None:
+            max_concurrent_turns = get_scheduler().config.max_concurrency
+        self.max_concurrent_turns = max_concurrent_turns
+        self._turn_slots = asyncio.Semaphore(max_concurrent_turns)
+        self._session_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self.started = time.time()
+        self.active_turns = 0
+        self.turns = 0
+        self.errors = 0
+
+    @classmethod
+    def from_env(cls) -> "HealthGuardService":
+        """Build the service from HEALTHGUARD_SERVER_* environment variables."""
+        max_turns = os.getenv("HEALTHGUARD_SERVER_MAX_TURNS")
+        return cls(max_concurrent_turns=int(max_turns) if max_turns else None)
+
+    async def create_session(self, user_id: str) -> str:
+        session = await self.runner.session_service.create_session(
+            app_name=APP_NAME, user_id=user_id, session_id=uuid.uuid4().hex
+        )
+        self._session_locks[(user_id, session.id)] = asyncio.Lock()
+        return session.id
+
+    async def delete_session(self, user_id: str, session_id: str) -> None:
+        await self.runner.session_service.delete_session(
+            app_name=APP_NAME, user_id=user_id, session_id=session_id
+        )
+        self._session_locks.pop((user_id, session_id), None)
+
+    async def session_exists(self, user_id: str, session_id: str) -> bool:
+        key = (user_id, session_id)
+        if key in self._session_locks:
+            return True
+        # Sessions persist across restarts; load from disk on first use
+        session = await self.runner.session_service.get_session(
+            app_name=APP_NAME, user_id=user_id, session_id=session_id
+        )
+        if session is None:
+            return False
+        self._session_locks.setdefault(key, asyncio.Lock())
+        return True
+
+    async def answer_events(self, user_id: str, session_id: str, message: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run one turn for a session, yielding results as they become available.
+
+        An emergency warning is yielded as soon as the message is checked,
+        before the agents run, so streaming clients can show "call 911"
+        without waiting for the full multi-agent answer.
+
+        Yields:
+            {"type": "emergency", ...} first if the message matched an
+            emergency keyword, then {"type": "response", ...} with the agent
+            answer (omitted if HEALTHGUARD_EMERGENCY_ELABORATION=0)
+        """
+        start = time.perf_counter()
+        triage = check_emergency(message)
+        if triage:
+            yield {
+                "type": "emergency",
+                "session_id": session_id,
+                "emergency": triage.response,
+                "latency_seconds": round(time.perf_counter() - start, 4),
+            }
+            if not elaboration_enabled():
+                return
+
+        # Emergency turns get the front of the shared model-call queue
+        lane = Priority.EMERGENCY if triage else Priority.BACKGROUND
+        async with self._session_locks[(user_id, session_id)], self._turn_slots:
+            self.active_turns += 1
+            try:
+                with turn_priority(lane), turn_span(message, session_id, emergency=bool(triage)) as span:
+                    result = await collect_turn(self.runner, message, user_id, session_id, start=start)
+                    record_turn_metrics(span, result.metrics)
+                self.turns += 1
+            except Exception:
+                self.errors += 1
+                raise
+            finally:
+                self.active_turns -= 1
+
+        yield {
+            "type": "response",
+            "session_id": session_id,
+            "response": result.text,
+            "tool_calls": result.metrics.tool_calls,
+            "latency_seconds": round(result.metrics.total_seconds, 4),
+        }
+
+    async def answer(self, user_id: str, session_id: str, message: str) -> Dict[str, Any]:
+        """
+        Run one turn for a session and return everything in one body.
+
+        Returns:
+            Response body with the answer, any emergency warning, the time
+            until the warning was available and the total latency
+        """
+        body: Dict[str, Any] = {"session_id": session_id, "emergency": None, "response": None}
+        async for event in self.answer_events(user_id, session_id, message):
+            if event["type"] == "emergency":
+                body["emergency"] = event["emergency"]
+                body["emergency_latency_seconds"] = body["latency_seconds"] = event["latency_seconds"]
+            else:
+                body["response"] = event["response"]
+                body["tool_calls"] = event["tool_calls"]
+                body["latency_seconds"] = event["latency_seconds"]
+        return body
+
+    def health(self) -> Dict[str, Any]:
+        tool_memo = get_tool_memo_plugin()
+        return {
+            "status": "ok",
+            "model_backend": model_backend(),
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "active_turns": self.active_turns,
+            "max_concurrent_turns": self.max_concurrent_turns,
+            "turns": self.turns,
+            "errors": self.errors,
+            "open_sessions": len(self._session_locks),
+            "session_store": self.runner.session_service.get_stats(),
+            "model_scheduler": get_scheduler().get_stats(),
+            "prompt_cache": get_prompt_cache_stats(),
+            "tool_memo": tool_memo.get_stats() if tool_memo else None,
+        }
+
+
+_service: Optional[HealthGuardService] = None
+
+
+def get_service() -> HealthGuardService:
+    """The process-wide service, created on first request."""
+    global _service
+    if _service is None:
+        _service = HealthGuardService.from_env()
+    return _service
+
+
+async def _json_body(request: Request) -> Dict[str, Any]:
+    try:
+        body = await request.json()
+    except ValueError:
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
+async def healthz(request: Request) -> JSONResponse:
+    return JSONResponse(get_service().health())
+
+
+async def create_session(request: Request) -> JSONResponse:
+    body = await _json_body(request)
+    user_id = str(body.get("user_id") or DEFAULT_USER_ID)
+    session_id = await get_service().create_session(user_id)
+    return JSONResponse({"user_id": user_id, "session_id": session_id}, status_code=201)
+
+
+async def post_message(request: Request) -> JSONResponse:
+    service = get_service()
+    session_id = request.path_params["session_id"]
+    body = await _json_body(request)
+    user_id = str(body.get("user_id") or DEFAULT_USER_ID)
+    message = body.get("message")
+
+    if not isinstance(message, str) or not message.strip():
+        return JSONResponse({"error": "'message' must be a non-empty string"}, status_code=400)
+    if not await service.session_exists(user_id, session_id):
+        return JSONResponse({"error": f"Unknown session: {session_id}"}, status_code=404)
+
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _ndjson_events(service.answer_events(user_id, session_id, message.strip())),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+    try:
+        return JSONResponse(await service.answer(user_id, session_id, message.strip()))
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+
+async def _ndjson_events(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    # The status line is already sent, so failures become an error event
+    try:
+        async for event in events:
+            yield (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+    except Exception as e:
+        yield (json.dumps({"type": "error", "error": str(e)}) + "\n").encode("utf-8")
+
+
+async def delete_session(request: Request) -> JSONResponse:
+    service = get_service()
+    session_id = request.path_params["session_id"]
+    user_id = request.query_params.get("user_id", DEFAULT_USER_ID)
+    if not await service.session_exists(user_id, session_id):
+        return JSONResponse({"error": f"Unknown session: {session_id}"}, status_code=404)
+    await service.delete_session(user_id, session_id)
+    return JSONResponse({"session_id": session_id, "deleted": True})
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(app: Starlette) -> AsyncIterator[None]:
+    setup_tracing()
+    try:
+        yield
+    finally:
+        shutdown_tracing()
+
+
+def create_app() -> Starlette:
+    """Create the ASGI application."""
+    load_dotenv()
+    return Starlette(lifespan=_lifespan, routes=[
+        Route("/healthz", healthz, methods=["GET"]),
+        Route("/sessions", create_session, methods=["POST"]),
+        Route("/sessions/{session_id}/messages", post_message, methods=["POST"]),
+        Route("/sessions/{session_id}", delete_session, methods=["DELETE"]),
+    ])
+
+
+app = create_app()
@@ -2,33 +2,112 @@
 HealthGuard AI - Main Application Entry Point
 
 This is the main entry point for the HealthGuard AI health assistant.
-Run this file to start an interactive conversation with the health agent.
+Run this file to start an interactive conversation with the health agent,
+or answer a file of queries non-interactively:
+
+    python main.py --batch queries.txt --concurrency 8 -o answers.jsonl
+    cat queries.txt | python main.py --batch -
 """
 
 import os
+import sys
+import json
+import time
+import uuid
+import argparse
 import asyncio
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
 from dotenv import load_dotenv
-from google.adk.runners import InMemoryRunner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
-from agents.health_coordinator import create_health_coordinator
+
+# google.adk, google.genai and the agents are imported on first use so the
+# menu appears without waiting for them (see benchmarks/startup_benchmark.py)
+if TYPE_CHECKING:
+    from google.adk.agents import BaseAgent
+    from google.adk.runners import Runner
+    from agents.streaming import TurnMetrics
 
 # Load environment variables
 load_dotenv()
 
-# Verify API key is set
-if not os.getenv("GOOGLE_API_KEY"):
+# Verify API key is set (the local mock model needs none)
+if not os.getenv("GOOGLE_API_KEY") and os.getenv("HEALTHGUARD_MODEL_BACKEND") != "mock":
     raise ValueError(
         "GOOGLE_API_KEY not found. Please create a .env file with your API key."
     )
 
-# Configure retry options for API resilience
-retry_config = types.HttpRetryOptions(
-    attempts=5,
-    exp_base=7,
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504],
-)
+
+APP_NAME = "healthguard_ai"
+USER_ID = "healthguard_user"
+
+
+def create_runner(agent: "BaseAgent") -> "Runner":
+    """
+    Create a runner whose sessions persist to disk (see agents/session_store.py)
+    and whose agents share a per-session tool memo (see agents/tool_memo.py).
+    """
+
+    from google.adk.apps import App
+    from google.adk.artifacts import InMemoryArtifactService
+    from google.adk.memory import InMemoryMemoryService
+    from google.adk.runners import Runner
+    from agents.session_store import PersistentSessionService
+    from agents.tool_memo import runner_plugins
+
+    return Runner(
+        app=App(name=APP_NAME, root_agent=agent, plugins=runner_plugins()),
+        session_service=PersistentSessionService.from_env(),
+        artifact_service=InMemoryArtifactService(),
+        memory_service=InMemoryMemoryService(),
+    )
+
+
+# -------------------------------------------------------------
+# QUERY HANDLING
+# -------------------------------------------------------------
+async def handle_query(runner: "Runner", query: str, session_id: str) -> "TurnMetrics":
+    """
+    Answer one user query, showing emergency warnings before any model call.
+
+    Responses are streamed as they arrive unless HEALTHGUARD_STREAMING=0.
+    Returns the turn's latency metrics, measured from when the query was received.
+    """
+
+    from agents.emergency_router import check_emergency, elaboration_enabled
+    from agents.model_scheduler import Priority, turn_priority
+    from agents.streaming import (
+        TurnMetrics,
+        print_turn_metrics,
+        stream_turn,
+        streaming_enabled,
+    )
+    from agents.tracing import record_turn_metrics, turn_span
+
+    start = time.perf_counter()
+    triage = check_emergency(query)
+
+    if triage:
+        # Deterministic fast path: warn first, elaborate with the agents after
+        print(f"\n🏥 HealthGuard AI:\n{triage.response}\n")
+        if not elaboration_enabled():
+            return TurnMetrics(query, triage.detection_seconds, time.perf_counter() - start)
+        print("🤔 HealthGuard AI is preparing more details...\n")
+    else:
+        print("\n🤔 HealthGuard AI is thinking...\n")
+
+    # Emergency turns get the front of the shared model-call queue
+    lane = Priority.EMERGENCY if triage else Priority.BACKGROUND
+    with turn_priority(lane), turn_span(query, session_id, emergency=bool(triage)) as span:
+        if streaming_enabled():
+            metrics = await stream_turn(runner, query, USER_ID, session_id, start=start)
+        else:
+            await runner.run_debug(query, user_id=USER_ID, session_id=session_id)
+            metrics = TurnMetrics(query, None, time.perf_counter() - start)
+
+        if triage:
+            metrics = metrics._replace(first_token_seconds=triage.detection_seconds)
+        record_turn_metrics(span, metrics)
+    print_turn_metrics(metrics)
+    return metrics
 
 
 # -------------------------------------------------------------
@@ -44,16 +123,19 @@ async def run_interactive_session():
     print("=" * 70)
     print("\nInitializing HealthGuard AI...")
 
-    # Create the health coordinator agent
-    health_coordinator = create_health_coordinator(retry_config)
+    from agents.health_coordinator import create_health_coordinator
+    from agents.models import create_retry_config
+    from agents.streaming import print_latency_summary
 
-    # Set up session management
-    session_service = InMemorySessionService()
+    # Preload the emergency fast path so the first warning is not delayed
+    import agents.emergency_router  # noqa: F401
 
-    # Create runner
-    runner = InMemoryRunner(
-        agent=health_coordinator
-    )
+    # Create the health coordinator agent
+    health_coordinator = create_health_coordinator(create_retry_config())
+
+    # Create runner; each run of the CLI starts a new conversation
+    runner = create_runner(health_coordinator)
+    session_id = uuid.uuid4().hex
 
     print("✅ HealthGuard AI is ready!\n")
     print("I can help you with:")
@@ -65,6 +147,8 @@ async def run_interactive_session():
     print("=" * 70)
     print("\nType 'quit' or 'exit' to end the conversation.\n")
 
+    turns = []
+
     # Interactive conversation loop
     while True:
         try:
@@ -72,21 +156,22 @@ async def run_interactive_session():
 
             # Exit commands
             if user_input.lower() in ["quit", "exit", "bye", "goodbye"]:
+                print_latency_summary(turns)
                 print("\n👋 Thank you for using HealthGuard AI. Stay healthy!")
                 break
 
             if not user_input:
                 continue
 
-            print("\n🤔 HealthGuard AI is thinking...\n")
-
             # Run the agent
-            await runner.run_debug(user_input)
+            turns.append(await handle_query(runner, user_input, session_id))
 
             print("\n" + "-" * 70)
 
         except KeyboardInterrupt:
-            print("\n\n👋 Thank you for using HealthGuard AI. Stay healthy!")
+            print()
+            print_latency_summary(turns)
+            print("\n👋 Thank you for using HealthGuard AI. Stay healthy!")
             break
 
         except Exception as e:
@@ -107,12 +192,17 @@ async def run_demo_queries():
     print("=" * 70)
     print("\nInitializing HealthGuard AI...\n")
 
-    health_coordinator = create_health_coordinator(retry_config)
-    session_service = InMemorySessionService()
+    from agents.health_coordinator import create_health_coordinator
+    from agents.models import create_retry_config
+    from agents.streaming import print_latency_summary
 
-    runner = InMemoryRunner(
-        agent=health_coordinator
-    )
+    # Preload the emergency fast path so the first warning is not delayed
+    import agents.emergency_router  # noqa: F401
+
+    health_coordinator = create_health_coordinator(create_retry_config())
+
+    runner = create_runner(health_coordinator)
+    session_id = uuid.uuid4().hex
 
     print("✅ HealthGuard AI is ready!\n")
     print("=" * 70)
@@ -124,35 +214,238 @@ async def run_demo_queries():
         "Can I take ibuprofen if I'm on blood pressure medication?",
     ]
 
+    turns = []
+
     for i, query in enumerate(demo_queries, 1):
         print(f"\n{'=' * 70}")
         print(f"Demo Query {i}/{len(demo_queries)}")
         print(f"{'=' * 70}")
-        print(f"\n🧑 User: {query}\n")
-        print("🤔 HealthGuard AI is thinking...\n")
+        print(f"\n🧑 User: {query}")
 
         try:
-            await runner.run_debug(query)
+            turns.append(await handle_query(runner, query, session_id))
             print("\n" + "-" * 70)
         except Exception as e:
             print(f"❌ Error: {str(e)}\n")
 
-        if i < len(demo_queries):
-            await asyncio.sleep(2)
-
     print("\n" + "=" * 70)
     print("✅ Demo completed!")
+    print_latency_summary(turns)
     print("=" * 70)
 
 
+# -------------------------------------------------------------
+# BATCH MODE
+# -------------------------------------------------------------
+def read_queries(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Parse batch input into (id, query) pairs.
+
+    Each non-blank line is either plain query text (its id is the line
+    number) or a JSON object {"id": ..., "query": ...}. Lines starting with
+    "#" are comments.
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("{"):
+            record = json.loads(line)
+            yield str(record.get("id", number)), record["query"]
+        else:
+            yield str(number), line
+
+
+async def answer_query(runner: "Runner", query_id: str, query: str) -> Dict[str, Any]:
+    """
+    Answer one batch query in its own session, without printing.
+
+    The session is deleted afterwards so batch runs leave no history behind.
+
+    Returns:
+        Result record with the answer, latency, calls and token usage
+    """
+
+    from agents.emergency_router import check_emergency, elaboration_enabled
+    from agents.model_scheduler import Priority, turn_priority
+    from agents.streaming import TurnMetrics, collect_turn
+    from agents.tracing import record_turn_metrics, turn_span, turn_totals
+
+    start = time.perf_counter()
+    session_id = f"batch-{uuid.uuid4().hex}"
+    triage = check_emergency(query)
+    answer = [triage.response] if triage else []
+    metrics = TurnMetrics(query, triage.detection_seconds if triage else None, 0.0)
+    error = None
+
+    lane = Priority.EMERGENCY if triage else Priority.BACKGROUND
+    with turn_priority(lane), turn_span(query, session_id, emergency=bool(triage)) as span:
+        try:
+            if not triage or elaboration_enabled():
+                result = await collect_turn(runner, query, USER_ID, session_id, start=start)
+                answer.append(result.text)
+                metrics = result.metrics
+                if triage:
+                    metrics = metrics._replace(first_token_seconds=triage.detection_seconds)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        metrics = metrics._replace(total_seconds=time.perf_counter() - start)
+        record_turn_metrics(span, metrics)
+
+    await runner.session_service.delete_session(app_name=runner.app_name, user_id=USER_ID, session_id=session_id)
+    totals = turn_totals(span)
+    return {
+        "id": query_id,
+        "query": query,
+        "answer": "\n\n".join(part for part in answer if part),
+        "emergency": triage is not None,
+        "error": error,
+        "latency_ms": round(metrics.total_seconds * 1000, 1),
+        "first_token_ms": (
+            round(metrics.first_token_seconds * 1000, 1) if metrics.first_token_seconds is not None else None
+        ),
+        "coordinator_tool_calls": metrics.tool_calls,
+        "tool_calls": totals.get("tool_calls", 0),
+        "model_calls": totals.get("model_calls", 0),
+        "prompt_tokens": totals.get("prompt_tokens", 0),
+        "completion_tokens": totals.get("completion_tokens", 0),
+        "cached_prompt_tokens": totals.get("cached_prompt_tokens", 0),
+    }
+
+
+async def run_batch_queries(
+    queries: Iterable[Tuple[str, str]], sink: TextIO, concurrency: int = 8
+) -> Dict[str, Any]:
+    """
+    Answer queries concurrently, each in an isolated session.
+
+    At most concurrency queries run at once; input is read only as slots
+    free up, so memory stays bounded for long files or piped input. Results
+    are written to sink as JSON lines in completion order (use "id" to
+    match them up).
+
+    Args:
+        queries: (id, query) pairs, e.g. from read_queries()
+        sink: Writable text stream for JSONL results
+        concurrency: Maximum queries in flight
+
+    Returns:
+        Throughput summary: query/error counts, queries per second, latency
+        percentiles and total calls and tokens
+    """
+
+    from agents.health_coordinator import create_health_coordinator
+    from agents.models import create_retry_config
+    from agents.streaming import TurnMetrics, summarize_latency
+    from agents.tracing import enable_turn_totals
+
+    import agents.emergency_router  # noqa: F401
+
+    enable_turn_totals()
+    runner = create_runner(create_health_coordinator(create_retry_config()))
+    slots = asyncio.Semaphore(concurrency)
+    results: List[Dict[str, Any]] = []
+    pending = set()
+
+    async def run(query_id: str, query: str) -> None:
+        try:
+            result = await answer_query(runner, query_id, query)
+        finally:
+            slots.release()
+        results.append(result)
+        sink.write(json.dumps(result, ensure_ascii=False) + "\n")
+        sink.flush()
+
+    start = time.perf_counter()
+    iterator = iter(queries)
+    while True:
+        await slots.acquire()
+        # Piped input may block; keep answering queries while waiting for it
+        item = await asyncio.to_thread(next, iterator, None)
+        if item is None:
+            break
+        task = asyncio.create_task(run(*item))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    await asyncio.gather(*pending)
+    elapsed = time.perf_counter() - start
+
+    latency = summarize_latency([
+        TurnMetrics(r["query"], None if r["first_token_ms"] is None else r["first_token_ms"] / 1000,
+                    r["latency_ms"] / 1000)
+        for r in results if r["error"] is None
+    ])
+    return {
+        "queries": len(results),
+        "errors": sum(1 for r in results if r["error"]),
+        "emergencies": sum(1 for r in results if r["emergency"]),
+        "concurrency": concurrency,
+        "elapsed_seconds": round(elapsed, 3),
+        "queries_per_second": round(len(results) / elapsed, 2) if elapsed else 0.0,
+        **{key: value for key, value in latency.items() if key != "turns"},
+        "model_calls": sum(r["model_calls"] for r in results),
+        "tool_calls": sum(r["tool_calls"] for r in results),
+        "prompt_tokens": sum(r["prompt_tokens"] for r in results),
+        "completion_tokens": sum(r["completion_tokens"] for r in results),
+        "cached_prompt_tokens": sum(r["cached_prompt_tokens"] for r in results),
+    }
+
+
+def run_batch_cli(input_path: str, output_path: str, concurrency: int) -> Dict[str, Any]:
+    """Run batch mode between files ("-" for stdin/stdout) and print the summary to stderr."""
+
+    from agents.tracing import setup_tracing, shutdown_tracing
+
+    source = sys.stdin if input_path == "-" else open(input_path, "r", encoding="utf-8")
+    sink = sys.stdout if output_path == "-" else open(output_path, "w", encoding="utf-8")
+    setup_tracing()
+    try:
+        summary = asyncio.run(run_batch_queries(read_queries(source), sink, concurrency))
+    finally:
+        shutdown_tracing()
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    print(
+        f"✅ Answered {summary['queries']} queries in {summary['elapsed_seconds']}s "
+        f"({summary['queries_per_second']} queries/sec at concurrency {concurrency}), "
+        f"{summary['errors']} errors",
+        file=sys.stderr,
+    )
+    print(
+        f"⏱️  total p50 {summary['total_p50']}s / p95 {summary['total_p95']}s, "
+        f"{summary['model_calls']} model calls, {summary['tool_calls']} tool calls, "
+        f"{summary['prompt_tokens']} prompt ({summary['cached_prompt_tokens']} cached) + "
+        f"{summary['completion_tokens']} completion tokens",
+        file=sys.stderr,
+    )
+    return summary
+
+
 # -------------------------------------------------------------
 # MAIN MENU
 # -------------------------------------------------------------
-def main():
+def main(argv: Optional[Sequence[str]] = None):
     """
-    Main entry point with menu selection.
+    Main entry point: batch mode with --batch, otherwise menu selection.
     """
 
+    parser = argparse.ArgumentParser(description="HealthGuard AI health assistant")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Answer the queries in FILE (one per line, or JSONL; '-' for stdin) and exit")
+    parser.add_argument("-c", "--concurrency", type=int, default=8,
+                        help="Batch queries answered at once (default: 8)")
+    parser.add_argument("-o", "--output", default="-", help="Batch JSONL result file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        summary = run_batch_cli(args.batch, args.output, args.concurrency)
+        if summary["errors"]:
+            sys.exit(1)
+        return
+
     print("\n" + "=" * 70)
     print("🏥 HealthGuard AI")
     print("=" * 70)
@@ -164,11 +457,13 @@ def main():
     while True:
         choice = input("\nEnter your choice (1-3): ").strip()
 
-        if choice == "1":
-            asyncio.run(run_interactive_session())
-            break
-        elif choice == "2":
-            asyncio.run(run_demo_queries())
+        if choice in ("1", "2"):
+            from agents.tracing import setup_tracing, shutdown_tracing
+            setup_tracing()
+            try:
+                asyncio.run(run_interactive_session() if choice == "1" else run_demo_queries())
+            finally:
+                shutdown_tracing()
             break
         elif choice == "3":
             print("\n👋 Goodbye!")
@@ -0,0 +1,43 @@
+"""Tests for the emergency fast path (agents/emergency_router.py)
+
+Run with: python -m pytest -q tests
+"""
+
+import pytest
+
+from agents.emergency_router import check_emergency
+
+
+@pytest.mark.parametrize("query", [
+    "I have chest pain",
+    "no fever but chest pain",
+    "not eating, seizure",
+    "I never had chest pain before, now I do",
+    "No headache. Difficulty breathing since this morning",
+    "I don't have a cough; chest pain though",
+    "without fever and chest pain",
+])
+def test_emergency_is_flagged(query):
+    triage = check_emergency(query)
+    assert triage is not None
+    assert triage.response.startswith("⚠️ EMERGENCY - CALL 911 IMMEDIATELY")
+
+
+@pytest.mark.parametrize("query", [
+    "no chest pain",
+    "I have a headache but no chest pain",
+    "without difficulty breathing",
+    "patient denies chest pain",
+    "What are the early symptoms of type 2 diabetes?",
+])
+def test_negated_or_absent_emergency_is_not_flagged(query):
+    assert check_emergency(query) is None
+
+
+def test_negation_applies_per_occurrence():
+    assert check_emergency("no chest pain yesterday, chest pain today") is not None
+
+
+def test_matches_list_each_keyword():
+    triage = check_emergency("Chest pain and difficulty breathing")
+    assert {match["keyword"] for match in triage.matches} >= {"chest pain", "difficulty breathing"}
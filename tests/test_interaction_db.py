@@ -0,0 +1,91 @@
+"""Tests for the compiled interaction database (tools/interaction_db.py)
+
+Run with: python -m pytest -q tests
+"""
+
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from tools.drug_interaction_tool import (
+    DEFAULT_INTERACTION_DB_PATH,
+    build_interaction_matrix,
+    load_interaction_index,
+)
+from tools.interaction_db import (
+    CSV_FIELDS,
+    InteractionDatabase,
+    compile_interaction_database,
+    is_compiled_database,
+)
+
+
+@pytest.fixture(scope="module")
+def compiled(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("db") / "interactions.hgidb")
+    compile_interaction_database(DEFAULT_INTERACTION_DB_PATH, path)
+    return path
+
+
+def test_compiled_database_matches_json_index(compiled):
+    index = load_interaction_index(DEFAULT_INTERACTION_DB_PATH)
+    database = load_interaction_index(compiled)
+
+    assert is_compiled_database(compiled)
+    assert not is_compiled_database(DEFAULT_INTERACTION_DB_PATH)
+    assert isinstance(database, InteractionDatabase)
+    assert len(database) == len(index)
+    assert set(database) == set(index)
+    for pair, details in index.items():
+        assert dict(database[pair]) == dict(details)
+
+
+def test_compiled_matrix_matches_built_matrix(compiled):
+    expected = build_interaction_matrix(load_interaction_index(DEFAULT_INTERACTION_DB_PATH))
+    actual = build_interaction_matrix(load_interaction_index(compiled))
+
+    assert dict(actual.drug_ids) == dict(expected.drug_ids)
+    assert np.array_equal(actual.pair_codes, expected.pair_codes)
+    assert np.array_equal(actual.severities, expected.severities)
+    assert [dict(d) for d in actual.details] == [dict(d) for d in expected.details]
+
+
+def test_missing_pairs(compiled):
+    database = InteractionDatabase(compiled)
+    assert ("unknowndrug", "warfarin") not in database
+    assert ("warfarin",) not in database
+    with pytest.raises(KeyError):
+        database[("unknowndrug", "warfarin")]
+
+
+def test_csv_dump_compiles_like_json(tmp_path):
+    with open(DEFAULT_INTERACTION_DB_PATH, encoding="utf-8") as f:
+        entries = json.load(f)["interactions"]
+    source = tmp_path / "interactions.csv"
+    with open(source, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for entry in entries:
+            # Reversed pair order and spelling must not matter
+            writer.writerow({
+                "drug_a": entry["drugs"][1].upper(),
+                "drug_b": entry["drugs"][0],
+                **{field: entry[field] for field in CSV_FIELDS[2:]},
+            })
+    compiled = str(tmp_path / "from_csv.hgidb")
+    compile_interaction_database(str(source), compiled)
+
+    index = load_interaction_index(DEFAULT_INTERACTION_DB_PATH)
+    assert {pair: dict(d) for pair, d in InteractionDatabase(compiled).items()} == \
+        {pair: dict(d) for pair, d in index.items()}
+
+
+def test_unknown_severity_is_rejected(tmp_path):
+    source = tmp_path / "bad.csv"
+    source.write_text(
+        ",".join(CSV_FIELDS) + "\nwarfarin,aspirin,catastrophic,Bleeding,Avoid\n", encoding="utf-8"
+    )
+    with pytest.raises(ValueError, match="catastrophic"):
+        compile_interaction_database(str(source), str(tmp_path / "bad.hgidb"))
@@ -0,0 +1,93 @@
+"""Tests for single-pass keyword matching (tools/keyword_matcher.py)
+
+Run with: python -m pytest -q tests
+"""
+
+import random
+
+import pytest
+
+from tools.keyword_matcher import KeywordMatcher
+from tools.symptom_assessment_tool import (
+    DURATION_THRESHOLDS,
+    SEVERITY_TIERS,
+    SYMPTOM_KEYWORDS,
+    classify_symptoms,
+    duration_threshold_id,
+    find_symptom_keywords,
+)
+
+
+def _substring_scan(keywords, text):
+    return frozenset(i for i, keyword in enumerate(keywords) if keyword in text)
+
+
+def _tier_scan(symptom_list):
+    """The per-tier substring scan that classify_symptoms replaced."""
+    for tier, severity_level, field in SEVERITY_TIERS:
+        matches = [
+            {"symptom": symptom, field: description}
+            for symptom in symptom_list
+            for keyword, description in SYMPTOM_KEYWORDS[tier].items()
+            if keyword in symptom.lower()
+        ]
+        if matches:
+            return severity_level, matches
+    return "low", []
+
+
+SYMPTOM_TEXTS = [
+    "Chest pain and shortness of breath",
+    "severe headache with stiff neck",
+    "mild fever, runny nose and a sore throat",
+    "I feel fine",
+    "",
+    "HEADACHE",
+    "Sudden confusion, slurred speech and difficulty breathing",
+    "vomiting blood since this morning",
+]
+
+
+@pytest.mark.parametrize("keywords", [
+    ["he", "she", "his", "hers"],
+    ["a", "aa", "aaa"],
+    ["headache", "severe headache", "ache", "he"],
+    ["abcd", "bc", "c", "bcde"],
+])
+def test_matches_substring_scan_on_random_text(keywords):
+    matcher = KeywordMatcher(keywords)
+    rng = random.Random(3)
+    alphabet = "".join(sorted(set("".join(keywords)))) + " x"
+    for _ in range(500):
+        text = "".join(rng.choices(alphabet, k=rng.randint(0, 20)))
+        assert matcher.find_all(text) == _substring_scan(keywords, text), text
+
+
+def test_duplicate_keywords_report_every_id():
+    assert KeywordMatcher(["cough", "cough"]).find_all("dry cough") == {0, 1}
+
+
+@pytest.mark.parametrize("text", SYMPTOM_TEXTS)
+def test_symptom_keywords_match_substring_scan(text):
+    expected = [
+        (tier, keyword, description)
+        for tier, _, _ in SEVERITY_TIERS
+        for keyword, description in SYMPTOM_KEYWORDS[tier].items()
+        if keyword in text.lower()
+    ]
+    assert find_symptom_keywords(text) == expected
+
+
+@pytest.mark.parametrize("symptom_list", [
+    [text] for text in SYMPTOM_TEXTS
+] + [SYMPTOM_TEXTS, SYMPTOM_TEXTS[1:3], ["cough", "fever", "headache"]])
+def test_classify_symptoms_matches_tier_scan(symptom_list):
+    assert classify_symptoms(symptom_list) == _tier_scan(symptom_list)
+
+
+@pytest.mark.parametrize("symptom", list(DURATION_THRESHOLDS) + ["persistent dry cough", "none", ""])
+def test_duration_threshold_is_first_contained_keyword(symptom):
+    expected = next(
+        (i for i, keyword in enumerate(DURATION_THRESHOLDS) if keyword in symptom.lower().strip()), -1
+    )
+    assert duration_threshold_id(symptom) == expected
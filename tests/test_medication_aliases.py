@@ -0,0 +1,89 @@
+"""Tests for medication name resolution (tools/medication_aliases.py)
+
+Run with: python -m pytest -q tests
+"""
+
+import itertools
+import random
+
+import pytest
+
+from tools.drug_interaction_tool import MEDICATION_RESOLVER
+from tools.medication_aliases import MedicationResolver, edit_distance, max_fuzzy_edits
+
+
+def _reference_distance(a: str, b: str) -> int:
+    """Full-matrix optimal string alignment distance."""
+    d = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i, j in itertools.product(range(1, len(a) + 1), range(1, len(b) + 1)):
+        cost = 0 if a[i - 1] == b[j - 1] else 1
+        d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + cost)
+        if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+            d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Tylenol", ("acetaminophen", "alias")),
+    ("Advil", ("ibuprofen", "alias")),
+    ("warfarin sodium", ("warfarin", "alias")),
+    ("aspirin 81 mg", ("aspirin", "exact")),
+    ("acetaminophen 500mg", ("acetaminophen", "exact")),
+    ("metformn", ("metformin", "fuzzy")),
+    ("lisinoprl", ("lisinopril", "fuzzy")),
+    ("wrafarin", ("warfarin", "fuzzy")),
+    ("warfarine", ("warfarin", "fuzzy")),
+])
+def test_known_spellings_resolve(query, expected):
+    assert tuple(MEDICATION_RESOLVER.resolve(query)) == expected
+
+
+@pytest.mark.parametrize("query", [
+    "ampicillin",  # a different drug, two edits from amoxicillin
+    "advil pm",    # a different product, not plain Advil
+    "met",         # too short to match fuzzily
+    "xyz",
+    "",
+])
+def test_unrelated_names_stay_unknown(query):
+    assert MEDICATION_RESOLVER.resolve(query).method == "unknown"
+
+
+def test_fuzzy_limits_follow_name_length():
+    resolver = MedicationResolver(["abcd", "abcdefghijkl"], aliases={})
+
+    assert max_fuzzy_edits("abc") == 0
+    assert max_fuzzy_edits("abcd") == 1
+    assert max_fuzzy_edits("abcdefghij") == 1
+    assert max_fuzzy_edits("abcdefghijk") == 2
+    assert resolver.resolve("abce").name == "abcd"
+    assert resolver.resolve("abxy").method == "unknown"
+    assert resolver.resolve("abcdefghixyl").name == "abcdefghijkl"
+    assert resolver.resolve("abcxyzghijkl").method == "unknown"
+
+
+def test_equally_close_drugs_are_ambiguous():
+    resolver = MedicationResolver(["cardolol", "carvolol"], aliases={"cardol": "cardolol"})
+    assert resolver.resolve("carbolol").method == "unknown"
+    assert resolver.resolve("cardolo").name == "cardolol"
+
+
+def test_words_must_match_word_count():
+    resolver = MedicationResolver(["warfarin"], aliases={"coumadin": "warfarin"})
+    assert resolver.resolve("warfarin x").method == "unknown"
+    assert resolver.resolve("coumadn").name == "warfarin"
+
+
+def test_banded_edit_distance_matches_full_matrix():
+    rng = random.Random(7)
+    for _ in range(2000):
+        a = "".join(rng.choices("abcd", k=rng.randint(0, 8)))
+        b = "".join(rng.choices("abcd", k=rng.randint(0, 8)))
+        limit = rng.randint(0, 3)
+        expected = _reference_distance(a, b)
+        assert edit_distance(a, b, limit) == (expected if expected <= limit else limit + 1), (a, b, limit)
+
+
+def test_find_mentions_skips_fuzzy_matches():
+    mentions = MEDICATION_RESOLVER.find_mentions("I take wrafarin, Advil and lisinopril daily")
+    assert mentions == ["ibuprofen", "lisinopril"]
@@ -0,0 +1,116 @@
+"""Tests for the per-session medication regimen (tools/medication_regimen.py)
+
+Run with: python -m pytest -q tests
+"""
+
+import json
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.tool_benchmark import interaction_database, synthetic_interaction_index
+from tools.drug_interaction_tool import check_regimen_interactions
+from tools.medication_regimen import (
+    REGIMEN_STATE_KEY,
+    MedicationRegimen,
+    check_new_medication,
+    update_medication_regimen,
+)
+from tools.result_cache import clear_caches
+
+
+def _pairs_from_regimen(regimen: MedicationRegimen):
+    return sorted(
+        (tuple(sorted((a, b))), details["severity"]) for a, b, details in regimen.interactions()
+    )
+
+
+def _pairs_from_full_check(medications):
+    result = json.loads(check_regimen_interactions(", ".join(medications)))
+    return sorted(
+        (tuple(sorted((i["medication_a"], i["medication_b"]))), i["severity"]) for i in result["interactions"]
+    )
+
+
+@pytest.fixture
+def synthetic_drugs():
+    clear_caches()
+    with interaction_database(synthetic_interaction_index(400, seed=11)) as names:
+        yield names
+    clear_caches()
+
+
+def test_closure_after_adds_and_removes_matches_full_check(synthetic_drugs):
+    rng = random.Random(5)
+    # A small pool so that the regimen members interact with each other
+    pool = synthetic_drugs[:30]
+    regimen = MedicationRegimen()
+
+    for _ in range(200):
+        drug = rng.choice(pool)
+        if drug in regimen.medications and rng.random() < 0.5:
+            assert regimen.remove(drug)
+        else:
+            regimen.add(drug, drug)
+
+        assert _pairs_from_regimen(regimen) == _pairs_from_full_check(regimen.medications)
+        # The closure holds exactly the members each drug interacts with
+        for candidate in pool:
+            found = {member for member, _ in regimen.interactions_with(candidate)}
+            expected = {
+                member for member in regimen.medications
+                if member != candidate and _pairs_from_full_check([member, candidate])
+            }
+            assert found == expected, candidate
+
+
+def test_removing_everything_empties_closure(synthetic_drugs):
+    regimen = MedicationRegimen()
+    for drug in synthetic_drugs[:20]:
+        regimen.add(drug, drug)
+    for drug in synthetic_drugs[:20]:
+        assert regimen.remove(drug)
+
+    assert regimen.medications == {}
+    assert regimen.closure == {}
+    assert not regimen.remove(synthetic_drugs[0])
+
+
+def test_interactions_are_most_severe_first():
+    regimen = MedicationRegimen()
+    for drug in ("lisinopril", "aspirin", "ibuprofen", "warfarin", "metformin"):
+        regimen.add(drug, drug)
+    ranks = {"mild": 1, "moderate": 2, "severe": 3}
+    severities = [ranks[details["severity"]] for _, _, details in regimen.interactions()]
+
+    assert severities == sorted(severities, reverse=True)
+    assert _pairs_from_regimen(regimen) == _pairs_from_full_check(regimen.medications)
+
+
+def test_regimen_tools_share_session_state():
+    context = SimpleNamespace(state={})
+
+    update = json.loads(update_medication_regimen("Lisinopril, Metformin, Coumadin", "", context))
+    assert update["added"] == ["Lisinopril", "Metformin", "Coumadin"]
+    assert update["resolved_medications"] == {"Coumadin": "warfarin"}
+    stored = context.state[REGIMEN_STATE_KEY]
+    assert set(stored["medications"]) == {"lisinopril", "metformin", "warfarin"}
+
+    check = json.loads(check_new_medication("Aspirin", context))
+    expected = json.loads(check_regimen_interactions("Lisinopril, Metformin, Coumadin, Aspirin"))
+    assert check["interaction_count"] == sum(
+        "Aspirin" in (i["medication_a"], i["medication_b"]) for i in expected["interactions"]
+    )
+    assert check["interaction_count"] >= 1
+    assert {i["current_medication"] for i in check["interactions"]} <= {"Lisinopril", "Metformin", "Coumadin"}
+
+    update = json.loads(update_medication_regimen("", "warfarin, Tylenol", context))
+    assert update["removed"] == ["warfarin"]
+    assert update["not_in_regimen"] == ["Tylenol"]
+    assert set(context.state[REGIMEN_STATE_KEY]["medications"]) == {"lisinopril", "metformin"}
+
+
+def test_check_without_regimen():
+    result = json.loads(check_new_medication("Aspirin", SimpleNamespace(state={})))
+    assert result["status"] == "no_regimen"
@@ -0,0 +1,144 @@
+"""Tests for the model call scheduler (agents/model_scheduler.py)
+
+Run with: python -m pytest -q tests
+"""
+
+import asyncio
+
+import pytest
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+
+from agents import model_scheduler
+from agents.model_scheduler import ModelScheduler, Priority, ScheduledModel, SchedulerConfig
+
+
+class Throttled(Exception):
+    code = 429
+
+
+class FakeModel(BaseLlm):
+    """Answers with one response, after raising the queued errors."""
+
+    errors: list = []
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request, stream=False):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text="ok")]))
+
+
+def _scheduler(**config) -> ModelScheduler:
+    defaults = {"requests_per_second": 1000.0, "burst": 1000, "base_backoff_seconds": 0.01}
+    return ModelScheduler(SchedulerConfig(**{**defaults, **config}))
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    def install(**config):
+        instance = _scheduler(**config)
+        monkeypatch.setattr(model_scheduler, "_scheduler", instance)
+        return instance
+    return install
+
+
+async def _collect(model: BaseLlm):
+    return [response async for response in model.generate_content_async(LlmRequest(), stream=False)]
+
+
+def test_lanes_are_served_in_priority_order():
+    async def run():
+        scheduler = _scheduler(max_concurrency=1)
+        await scheduler.acquire(Priority.INTERACTIVE)
+        order = []
+
+        async def wait(lane):
+            await scheduler.acquire(lane)
+            order.append(lane)
+            scheduler.release(throttled=False)
+
+        waiters = [asyncio.ensure_future(wait(lane))
+                   for lane in (Priority.BACKGROUND, Priority.INTERACTIVE, Priority.EMERGENCY)]
+        await asyncio.sleep(0)
+        scheduler.release(throttled=False)
+        await asyncio.gather(*waiters)
+        return order
+
+    assert asyncio.run(run()) == [Priority.EMERGENCY, Priority.INTERACTIVE, Priority.BACKGROUND]
+
+
+def test_throttle_halves_limit_and_success_grows_it():
+    async def run():
+        scheduler = _scheduler(max_concurrency=8)
+        await scheduler.acquire(Priority.INTERACTIVE)
+        scheduler.release(throttled=True)
+        after_throttle = scheduler.concurrency_limit
+        for _ in range(8):
+            await scheduler.acquire(Priority.INTERACTIVE)
+            scheduler.release(throttled=False, succeeded=False)
+        after_failures = scheduler.concurrency_limit
+        await scheduler.acquire(Priority.INTERACTIVE)
+        scheduler.release(throttled=False)
+        return after_throttle, after_failures, scheduler.concurrency_limit, scheduler.get_stats()
+
+    after_throttle, after_failures, after_success, stats = asyncio.run(run())
+    assert after_throttle == 4.0
+    assert after_failures == 4.0
+    assert after_success == pytest.approx(4.25)
+    assert stats["active"] == 0 and stats["throttled"] == 1
+
+
+def test_throttled_call_is_retried_and_slot_released(scheduler):
+    instance = scheduler(max_concurrency=2)
+    inner = FakeModel(model="fake", errors=[Throttled()])
+    responses = asyncio.run(_collect(ScheduledModel(model="fake", inner=inner)))
+
+    assert [r.content.parts[0].text for r in responses] == ["ok"]
+    assert inner.calls == 2
+    stats = instance.get_stats()
+    assert stats["retries"] == 1 and stats["active"] == 0
+
+
+def test_slot_is_free_while_caller_handles_response(scheduler):
+    """A paused caller (running tools, e.g. a sub-agent) must not hold a slot."""
+    instance = scheduler(max_concurrency=1)
+    model = ScheduledModel(model="fake", inner=FakeModel(model="fake"))
+
+    async def run():
+        async for _ in model.generate_content_async(LlmRequest()):
+            # The nested call needs the only slot while the outer one is paused here
+            nested = await asyncio.wait_for(_collect(model), timeout=5)
+            assert len(nested) == 1
+        return instance.get_stats()["active"]
+
+    assert asyncio.run(run()) == 0
+
+
+def test_nested_delegation_completes_at_concurrency_one(scheduler, monkeypatch):
+    """Coordinator -> specialist -> tool turn with a single model slot."""
+    monkeypatch.setenv("HEALTHGUARD_MODEL_BACKEND", "mock")
+    monkeypatch.setenv("HEALTHGUARD_MOCK_LATENCY", "0")
+    monkeypatch.delenv("HEALTHGUARD_MODEL_CASSETTE", raising=False)
+    scheduler(max_concurrency=1)
+
+    from google.adk.apps import App
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+    from agents.health_coordinator import create_health_coordinator
+    from agents.models import create_retry_config
+    from agents.streaming import collect_turn
+
+    async def run():
+        runner = Runner(
+            app=App(name="test", root_agent=create_health_coordinator(create_retry_config())),
+            session_service=InMemorySessionService(),
+        )
+        return await asyncio.wait_for(
+            collect_turn(runner, "Can I take ibuprofen with warfarin?", "user", "session"), timeout=30
+        )
+
+    result = asyncio.run(run())
+    assert result.text
+    assert result.metrics.tool_calls >= 1
@@ -0,0 +1,67 @@
+"""Tests for token-budgeted tool output (tools/output_format.py)
+
+Run with: python -m pytest -q tests
+"""
+
+import json
+
+import pytest
+
+from tools.drug_interaction_tool import check_drug_interactions
+from tools.output_format import compact_output
+
+
+def _interaction(drug: str, severity: str) -> dict:
+    return {
+        "medication_a": "warfarin",
+        "medication_b": drug,
+        "severity": severity,
+        "description": "Increased bleeding risk " * 5,
+        "recommendation": "Avoid combination unless directed by a physician",
+    }
+
+
+@pytest.mark.parametrize("field", ["emergency_symptoms", "high_priority_symptoms", "interactions"])
+def test_protected_fields_are_never_trimmed(field):
+    items = [f"finding {i} " * 10 for i in range(20)]
+    text = json.dumps({"severity": "HIGH PRIORITY", field: items, "notes": ["x" * 50] * 5})
+
+    result = json.loads(compact_output(text, token_budget=10))
+
+    assert result[field] == items
+    assert result["notes"] == []
+
+
+def test_severe_interaction_listed_last_survives_budget():
+    interactions = [_interaction(f"drug{i}", "mild") for i in range(8)] + [_interaction("aspirin", "severe")]
+    text = json.dumps({"status": "warning", "interaction_count": 9, "interactions": interactions})
+
+    result = json.loads(compact_output(text, token_budget=50))
+
+    assert len(result["interactions"]) == 9
+    assert result["interactions"][-1]["severity"] == "severe"
+    assert "_truncated" not in result
+
+
+def test_drug_interaction_tool_keeps_all_interactions():
+    text = check_drug_interactions("Lisinopril, Metformin, Aspirin", "Warfarin")
+    expected = json.loads(text)["interactions"]
+    assert expected
+
+    result = json.loads(compact_output(text, token_budget=20))
+
+    assert result["interactions"] == expected
+
+
+def test_advisory_lists_are_trimmed_first():
+    text = json.dumps({
+        "severity": "MILD",
+        "self_care_tips": ["Rest and stay hydrated"] * 10,
+        "other": ["y" * 20] * 3,
+    })
+
+    result = json.loads(compact_output(text, token_budget=40))
+
+    assert result["other"] == ["y" * 20] * 3
+    assert len(result["self_care_tips"]) < 10
+    assert result["_truncated"] == 10 - len(result["self_care_tips"])
@@ -0,0 +1,47 @@
+"""Tests for tool result caching (tools/result_cache.py)
+
+Run with: python -m pytest -q tests
+"""
+
+import json
+
+from tools.result_cache import ResultCache, cached_tool
+from tools.symptom_assessment_tool import check_symptom_duration
+
+
+def test_equal_values_of_different_types_are_cached_apart():
+    check_symptom_duration.cache.clear()
+
+    as_int = json.loads(check_symptom_duration("cough", 3))
+    as_float = json.loads(check_symptom_duration("cough", 3.0))
+
+    assert isinstance(as_int["duration_days"], int)
+    assert isinstance(as_float["duration_days"], float)
+    assert check_symptom_duration.cache.stats()["misses"] == 2
+
+
+def test_repeated_call_is_a_hit():
+    calls = []
+
+    @cached_tool()
+    def echo(value, flag=False):
+        calls.append(value)
+        return repr((value, flag))
+
+    assert echo(1, flag=True) == echo(1, flag=True) == "(1, True)"
+    assert echo(True, flag=True) == "(True, True)"
+    assert echo(1, flag=1) == "(1, 1)"
+    assert calls == [1, True, 1]
+    assert echo.cache.stats()["hits"] == 1
+
+
+def test_lru_eviction():
+    cache = ResultCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
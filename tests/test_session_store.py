@@ -0,0 +1,108 @@
+"""Tests for the persistent session store (agents/session_store.py)
+
+Run with: python -m pytest -q tests
+"""
+
+import asyncio
+
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from agents.session_store import (
+    COMPACTION_AUTHOR,
+    PATIENT_CONTEXT_KEY,
+    PersistentSessionService,
+    SessionStoreConfig,
+)
+
+
+APP = "test_app"
+USER = "user"
+
+
+def _event(invocation: int, author: str, text: str, **kwargs) -> Event:
+    return Event(
+        invocation_id=f"turn-{invocation}",
+        author=author,
+        content=types.Content(role="user" if author == "user" else "model", parts=[types.Part(text=text)]),
+        **kwargs,
+    )
+
+
+async def _converse(service: PersistentSessionService, turns: list) -> str:
+    session = await service.create_session(app_name=APP, user_id=USER, state={"name": "Sam"})
+    for invocation, (question, answer) in enumerate(turns):
+        await service.append_event(session, _event(invocation, "user", question))
+        await service.append_event(session, _event(invocation, "coordinator", answer))
+    return session.id
+
+
+async def _reload(path, session_id: str):
+    service = PersistentSessionService(SessionStoreConfig(path=path))
+    return await service.get_session(app_name=APP, user_id=USER, session_id=session_id)
+
+
+def test_session_survives_restart(tmp_path):
+    path = str(tmp_path / "sessions.sqlite")
+
+    async def run():
+        service = PersistentSessionService(SessionStoreConfig(path=path))
+        session_id = await _converse(service, [("Hello", "Hi"), ("I take metformin", "Noted")])
+        session = await service.get_session(app_name=APP, user_id=USER, session_id=session_id)
+        await service.append_event(session, _event(2, "coordinator", "Anything else?",
+                                                   actions=EventActions(state_delta={"topic": "diabetes"})))
+        return session_id, await _reload(path, session_id)
+
+    session_id, restored = asyncio.run(run())
+    assert restored.id == session_id
+    assert [e.content.parts[0].text for e in restored.events] == [
+        "Hello", "Hi", "I take metformin", "Noted", "Anything else?"
+    ]
+    assert restored.state == {"name": "Sam", "topic": "diabetes"}
+
+
+def test_get_session_returns_copy(tmp_path):
+    async def run():
+        service = PersistentSessionService(SessionStoreConfig(path=str(tmp_path / "s.sqlite")))
+        session_id = await _converse(service, [("Hello", "Hi")])
+        copy = await service.get_session(app_name=APP, user_id=USER, session_id=session_id)
+        copy.state["scratch"] = True
+        copy.events.clear()
+        return await service.get_session(app_name=APP, user_id=USER, session_id=session_id)
+
+    session = asyncio.run(run())
+    assert "scratch" not in session.state
+    assert len(session.events) == 2
+
+
+def test_old_turns_are_compacted_and_persisted(tmp_path):
+    path = str(tmp_path / "sessions.sqlite")
+    config = SessionStoreConfig(path=path, compact_token_threshold=60, keep_recent_turns=1)
+    turns = [
+        ("I take warfarin and lisinopril every day", "Thanks, I have noted both medications. " * 3),
+        ("I have had a headache since yesterday", "Headaches are often caused by tension. " * 3),
+        ("Can I take ibuprofen?", "Ibuprofen can increase bleeding risk with warfarin. " * 3),
+        ("What about acetaminophen?", "Acetaminophen is usually preferred."),
+    ]
+
+    async def run():
+        service = PersistentSessionService(config)
+        session_id = await _converse(service, turns)
+        session = await service.get_session(app_name=APP, user_id=USER, session_id=session_id)
+        return service, session, await _reload(path, session_id)
+
+    service, session, restored = asyncio.run(run())
+
+    summary = session.events[0]
+    assert summary.author == COMPACTION_AUTHOR
+    assert summary.content.role == "model"
+    context = session.state[PATIENT_CONTEXT_KEY]
+    assert {"warfarin", "lisinopril"} <= set(context["medications"])
+    assert "headache" in {s["symptom"] for s in context["symptoms"]}
+    # The turn in progress and the most recent complete turn stay verbatim
+    assert [e.content.parts[0].text for e in session.events[-4:-2]] == [turns[2][0], turns[2][1]]
+    assert session.events[-2].content.parts[0].text == turns[3][0]
+    assert service.get_stats()["compactions"] >= 1
+
+    assert [e.id for e in restored.events] == [e.id for e in session.events]
+    assert restored.state[PATIENT_CONTEXT_KEY] == context
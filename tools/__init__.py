@@ -1,17 +1,25 @@
-"""Health Tools Module - Fixed for Google ADK"""
+"""Health Tools Module - Fixed for Google ADK
 
-from .drug_interaction_tool import (
-    check_drug_interactions,
-    get_medication_info
-)
-from .symptom_assessment_tool import (
-    assess_symptom_severity,
-    check_symptom_duration
-)
+Exports are imported lazily on first access, so importing one tool module
+does not load every tool's databases.
+"""
 
-__all__ = [
-    'check_drug_interactions',
-    'get_medication_info',
-    'assess_symptom_severity',
-    'check_symptom_duration'
-]
\ No newline at end of file
+import importlib
+
+_EXPORTS = {
+    'check_drug_interactions': 'tools.drug_interaction_tool',
+    'check_regimen_interactions': 'tools.drug_interaction_tool',
+    'get_medication_info': 'tools.drug_interaction_tool',
+    'assess_symptom_severity': 'tools.symptom_assessment_tool',
+    'check_symptom_duration': 'tools.symptom_assessment_tool',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
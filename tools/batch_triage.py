@@ -0,0 +1,207 @@
+"""Batch Triage - Stream intake records through the symptom tools without an LLM
+
+Reads JSONL intake records, scores each one with assess_symptom_severity()
+and check_symptom_duration(), and writes one JSONL result per record. Records
+are processed as a generator pipeline in fixed-size chunks with a bounded
+number of chunks in flight, so memory stays constant regardless of input size.
+
+Input record format (one JSON object per line):
+    {"id": "intake-001", "symptoms": "headache, fever", "duration_days": {"fever": 4}}
+
+"symptoms" may also be a list of strings. "duration_days" is optional.
+
+Usage:
+    python -m tools.batch_triage intake.jsonl -o triage.jsonl --workers 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO
+
+from tools.symptom_assessment_tool import assess_symptom_severity, check_symptom_duration
+
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def triage_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Score a single intake record.
+
+    Args:
+        record: Intake record with "symptoms" and optional "id"/"duration_days"
+
+    Returns:
+        Result record with severity, duration checks and a seek_care flag
+    """
+    symptoms = record.get("symptoms", "")
+    if isinstance(symptoms, list):
+        symptoms = ", ".join(symptoms)
+
+    assessment = json.loads(assess_symptom_severity(symptoms))
+    durations = []
+    for symptom, days in (record.get("duration_days") or {}).items():
+        check = json.loads(check_symptom_duration(symptom, days))
+        durations.append({
+            "symptom": symptom,
+            "duration_days": days,
+            "status": check["status"],
+            "threshold_days": check.get("threshold_days"),
+        })
+
+    return {
+        "id": record.get("id"),
+        "severity": assessment["severity"],
+        "severity_level": assessment["severity_level"],
+        "action_required": assessment["action_required"],
+        "duration_checks": durations,
+        "seek_care": assessment["severity_level"] >= 4
+        or any(d["status"] == "seek_care" for d in durations),
+    }
+
+
+def triage_lines(lines: List[str]) -> List[Dict[str, Any]]:
+    """
+    Parse and score a chunk of raw JSONL lines.
+
+    Runs inside worker processes, so parsing is parallelized too. Bad records
+    produce an error result instead of failing the whole chunk.
+    """
+    results = []
+    for line in lines:
+        record: Any = None
+        try:
+            record = json.loads(line)
+            results.append(triage_record(record))
+        except Exception as e:
+            record_id = record.get("id") if isinstance(record, dict) else None
+            results.append({"id": record_id, "error": str(e)})
+    return results
+
+
+def _chunks(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Group non-blank lines into lists of at most size items."""
+    iterator = (line for line in lines if line.strip())
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def triage_stream(
+    lines: Iterable[str],
+    executor: Optional[Executor] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_in_flight: int = 8,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Score a stream of JSONL lines, yielding results in input order.
+
+    Args:
+        lines: Iterable of raw JSONL lines (e.g. an open file)
+        executor: Pool to fan chunks out to. None processes inline.
+        chunk_size: Records per chunk sent to a worker
+        max_in_flight: Maximum chunks submitted but not yet yielded, which
+            bounds memory use
+
+    Yields:
+        One result dictionary per input record
+    """
+    chunks = _chunks(lines, chunk_size)
+
+    if executor is None:
+        for chunk in chunks:
+            yield from triage_lines(chunk)
+        return
+
+    pending: deque = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(triage_lines, chunk))
+        if len(pending) >= max_in_flight:
+            yield from pending.popleft().result()
+
+    while pending:
+        yield from pending.popleft().result()
+
+
+def run_batch(
+    source: TextIO,
+    sink: TextIO,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """
+    Triage every record from source and write JSONL results to sink.
+
+    Args:
+        source: Readable text stream of JSONL intake records
+        sink: Writable text stream for JSONL results
+        workers: Number of worker processes (1 runs in-process)
+        chunk_size: Records per chunk sent to a worker
+
+    Returns:
+        Summary with record, error and seek_care counts plus records/sec
+    """
+    summary = {"records": 0, "errors": 0, "seek_care": 0}
+    start = time.perf_counter()
+
+    def consume(results: Iterator[Dict[str, Any]]) -> None:
+        for result in results:
+            summary["records"] += 1
+            if "error" in result:
+                summary["errors"] += 1
+            elif result["seek_care"]:
+                summary["seek_care"] += 1
+            sink.write(json.dumps(result, separators=(",", ":")) + "\n")
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            consume(triage_stream(source, executor, chunk_size, max_in_flight=workers * 2))
+    else:
+        consume(triage_stream(source, None, chunk_size))
+
+    elapsed = time.perf_counter() - start
+    summary["elapsed_seconds"] = round(elapsed, 3)
+    summary["records_per_second"] = round(summary["records"] / elapsed, 1) if elapsed else 0.0
+    return summary
+
+
+def main(argv: Sequence[str] = None) -> None:
+    """Command-line entry point for batch triage."""
+    parser = argparse.ArgumentParser(description="HealthGuard AI batch symptom triage")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL intake file (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL result file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Records per worker chunk (default: {DEFAULT_CHUNK_SIZE})")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    try:
+        summary = run_batch(source, sink, workers=args.workers, chunk_size=args.chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    print(
+        f"✅ Triaged {summary['records']} records in {summary['elapsed_seconds']}s "
+        f"({summary['records_per_second']} records/sec), "
+        f"{summary['seek_care']} need care, {summary['errors']} errors",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
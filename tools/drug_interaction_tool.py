@@ -1,8 +1,193 @@
 """Drug Interaction Checker Tool - Fixed for Google ADK 1.19.0"""
 
-from typing import Dict, List
+import json
+import os
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Sequence
 
+import numpy as np
 
+from tools.interaction_db import (
+    SEVERITY_RANK,
+    InteractionDatabase,
+    PairKey,
+    canonical_pair,
+    is_compiled_database,
+    normalize_medication_name,
+    read_interaction_records,
+)
+from tools.medication_aliases import MedicationResolver, load_aliases
+from tools.result_cache import cached_tool, split_list_key
+
+
+# Default location of the interaction database. Override with the
+# HEALTHGUARD_INTERACTION_DB environment variable to load a larger dump,
+# either as JSON/CSV or compiled with `python -m tools.interaction_db compile`.
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_INTERACTION_DB_PATH = os.path.join(DATA_DIR, "drug_interactions.json")
+DEFAULT_MEDICATION_DB_PATH = os.path.join(DATA_DIR, "medications.json")
+DEFAULT_ALIASES_PATH = os.path.join(DATA_DIR, "medication_aliases.json")
+
+
+def load_interaction_index(path: str) -> Mapping[PairKey, Mapping[str, str]]:
+    """
+    Load an interaction database file into an immutable pair index.
+
+    Compiled databases are memory-mapped rather than parsed, so large
+    interaction sets are shared between worker processes.
+
+    Args:
+        path: Path to a compiled database, a CSV dump, or a JSON file with an
+            "interactions" list. Each JSON entry holds a two-element "drugs"
+            list plus severity, description and recommendation fields.
+
+    Returns:
+        Read-only mapping of canonical drug pair to interaction details
+    """
+    if is_compiled_database(path):
+        return InteractionDatabase(path)
+
+    index: Dict[PairKey, Mapping[str, str]] = {}
+    for pair, details in read_interaction_records(path):
+        index[pair] = MappingProxyType(details)
+
+    return MappingProxyType(index)
+
+
+# Built once at import time and shared by every tool call
+INTERACTION_INDEX = load_interaction_index(
+    os.getenv("HEALTHGUARD_INTERACTION_DB", DEFAULT_INTERACTION_DB_PATH)
+)
+
+
+class InteractionMatrix(NamedTuple):
+    """
+    Sparse severity adjacency matrix over integer drug IDs.
+
+    Drug IDs follow the sorted order of drug names, so canonical pairs map
+    to (low_id, high_id). Each known pair is stored as the code
+    low_id * drug_count + high_id in the sorted pair_codes array, with its
+    severity rank and details at the same position.
+    """
+    drug_ids: Mapping[str, int]
+    pair_codes: np.ndarray
+    severities: np.ndarray
+    details: Sequence[Mapping[str, str]]
+
+
+def build_interaction_matrix(
+    index: Mapping[PairKey, Mapping[str, str]]
+) -> InteractionMatrix:
+    """
+    Build a sparse severity matrix from a canonical pair index.
+
+    Args:
+        index: Mapping of canonical drug pair to interaction details
+
+    Returns:
+        InteractionMatrix ready for vectorized all-pairs lookups
+    """
+    if isinstance(index, InteractionDatabase):
+        # Compiled databases already store this layout, reuse the mapped arrays
+        return InteractionMatrix(
+            drug_ids=index.drug_ids,
+            pair_codes=index.pair_codes,
+            severities=index.severities,
+            details=index.details,
+        )
+
+    names = sorted({drug for pair in index for drug in pair})
+    drug_ids = {name: i for i, name in enumerate(names)}
+    drug_count = len(names)
+
+    entries = sorted(
+        (drug_ids[a] * drug_count + drug_ids[b], details)
+        for (a, b), details in index.items()
+    )
+
+    return InteractionMatrix(
+        drug_ids=MappingProxyType(drug_ids),
+        pair_codes=np.fromiter((code for code, _ in entries), dtype=np.int64, count=len(entries)),
+        severities=np.fromiter(
+            (SEVERITY_RANK.get(details["severity"], 0) for _, details in entries),
+            dtype=np.uint8,
+            count=len(entries),
+        ),
+        details=tuple(details for _, details in entries),
+    )
+
+
+INTERACTION_MATRIX = build_interaction_matrix(INTERACTION_INDEX)
+
+
+def load_medication_db(path: str) -> Mapping[str, Mapping]:
+    """
+    Load the medication information database.
+
+    Args:
+        path: JSON file with a "medications" object keyed by generic name
+
+    Returns:
+        Read-only mapping of normalized generic name to medication details
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    return MappingProxyType({
+        normalize_medication_name(name): MappingProxyType(info)
+        for name, info in data["medications"].items()
+    })
+
+
+MEDICATION_DB = load_medication_db(DEFAULT_MEDICATION_DB_PATH)
+
+# Medication entries serialized once. Each is a JSON object with its closing
+# brace removed, so per-call fields can be appended without re-encoding it.
+_MEDICATION_JSON = MappingProxyType({
+    name: json.dumps(dict(info), indent=2)[:-2]
+    for name, info in MEDICATION_DB.items()
+})
+
+
+def build_medication_resolver() -> MedicationResolver:
+    """
+    Build the name resolver shared by all drug tools.
+
+    Known generic names come from both databases. Aliases come from the
+    alias file plus every brand name listed in the medication database.
+    """
+    aliases = {
+        normalize_medication_name(brand): name
+        for name, info in MEDICATION_DB.items()
+        for brand in info.get("brand_names", [])
+    }
+    aliases.update(load_aliases(DEFAULT_ALIASES_PATH))
+
+    return MedicationResolver(
+        generic_names=[*INTERACTION_MATRIX.drug_ids, *MEDICATION_DB],
+        aliases=aliases,
+    )
+
+
+MEDICATION_RESOLVER = build_medication_resolver()
+
+
+def get_medication_resolution_stats() -> Dict[str, int]:
+    """
+    Get name resolution counters for the drug tools.
+
+    Returns:
+        Dictionary with exact/alias/fuzzy/unknown counts and "avoided_retries",
+        the lookups that resolved on the first call only thanks to an alias
+        or fuzzy match. Results served from the tool cache are not resolved
+        again, so only cache misses are counted.
+    """
+    return MEDICATION_RESOLVER.get_stats()
+
+
+@cached_tool(key=lambda current_medications, new_medication: (
+    split_list_key(current_medications), new_medication
+))
 def check_drug_interactions(
     current_medications: str, new_medication: str
 ) -> str:
@@ -11,6 +196,7 @@ def check_drug_interactions(
     
     This is a simplified mock implementation. In production, this would connect to
     a real drug interaction database API like FDA or DrugBank.
+    Brand names and common misspellings are resolved to generic names.
     
     Args:
         current_medications: Comma-separated string of medication names currently being taken
@@ -19,170 +205,155 @@ def check_drug_interactions(
     Returns:
         JSON string containing interaction warnings and severity levels
     """
-    import json
-    
     # Parse medications
     med_list = [m.strip() for m in current_medications.split(',') if m.strip()]
     
-    # Mock drug interaction database
-    # Format: {drug_pair: {severity, description}}
-    interaction_db = {
-        # NSAIDs + Blood Pressure Medications
-        ("ibuprofen", "lisinopril"): {
-            "severity": "moderate",
-            "description": "NSAIDs may reduce the effectiveness of blood pressure medications",
-            "recommendation": "Use acetaminophen instead for pain relief"
-        },
-        ("ibuprofen", "losartan"): {
-            "severity": "moderate",
-            "description": "NSAIDs may reduce the effectiveness of blood pressure medications",
-            "recommendation": "Use acetaminophen instead for pain relief"
-        },
-        
-        # Aspirin + Blood Thinners
-        ("aspirin", "warfarin"): {
-            "severity": "severe",
-            "description": "Increased risk of bleeding when combined",
-            "recommendation": "Avoid combination unless specifically prescribed by doctor"
-        },
-        
-        # Antibiotics + Birth Control
-        ("amoxicillin", "birth control"): {
-            "severity": "moderate",
-            "description": "May reduce effectiveness of birth control pills",
-            "recommendation": "Use backup contraception method"
-        },
-        
-        # Diabetes medications
-        ("metformin", "alcohol"): {
-            "severity": "moderate",
-            "description": "Increased risk of lactic acidosis",
-            "recommendation": "Limit alcohol consumption"
-        },
+    interactions_found = []
+    resolved_names = {}
+    
+    def resolve(medication: str) -> str:
+        resolution = MEDICATION_RESOLVER.resolve(medication)
+        if resolution.method in ("alias", "fuzzy"):
+            resolved_names[medication] = resolution.name
+        return resolution.name
+    
+    new_med_lower = resolve(new_medication)
+    
+    for current_med in med_list:
+        interaction = INTERACTION_INDEX.get(
+            canonical_pair(resolve(current_med), new_med_lower)
+        )
         
-        # Common supplements
-        ("st johns wort", "birth control"): {
-            "severity": "severe",
-            "description": "Significantly reduces birth control effectiveness",
-            "recommendation": "Use alternative depression treatment"
-        },
+        if interaction is not None:
+            interactions_found.append({
+                **interaction,
+                "current_medication": current_med,
+                "new_medication": new_medication,
+            })
+    
+    if interactions_found:
+        result = {
+            "status": "warning",
+            "has_interactions": True,
+            "interaction_count": len(interactions_found),
+            "interactions": interactions_found,
+            "message": f"Found {len(interactions_found)} potential drug interaction(s)"
+        }
+    else:
+        result = {
+            "status": "success",
+            "has_interactions": False,
+            "interaction_count": 0,
+            "interactions": [],
+            "message": f"No known interactions found between {new_medication} and current medications"
+        }
+    
+    if resolved_names:
+        result["resolved_medications"] = resolved_names
+    
+    return json.dumps(result, indent=2)
+
+
+@cached_tool(key=lambda medications: split_list_key(medications))
+def check_regimen_interactions(medications: str) -> str:
+    """
+    Check every pair of medications in a regimen for interactions in one call.
+    
+    Use this instead of repeated check_drug_interactions() calls when a patient
+    takes several medications and all combinations need to be reviewed.
+    Brand names and common misspellings are resolved to generic names.
+    
+    Args:
+        medications: Comma-separated string of all medication names in the regimen
         
-        # Antidepressants
-        ("sertraline", "ibuprofen"): {
-            "severity": "moderate",
-            "description": "Increased risk of bleeding",
-            "recommendation": "Monitor for unusual bleeding or bruising"
-        },
-    }
+    Returns:
+        JSON string containing all interactions found, most severe first
+    """
+    # Parse, resolve and de-duplicate medications, keeping the first spelling given
+    regimen: Dict[str, str] = {}
+    resolved_names = {}
+    for med in medications.split(','):
+        if med.strip():
+            resolution = MEDICATION_RESOLVER.resolve(med)
+            if resolution.method in ("alias", "fuzzy"):
+                resolved_names[med.strip()] = resolution.name
+            regimen.setdefault(resolution.name, med.strip())
     
+    matrix = INTERACTION_MATRIX
+    known = [name for name in regimen if name in matrix.drug_ids]
     interactions_found = []
-    new_med_lower = new_medication.lower().strip()
     
-    for current_med in med_list:
-        current_med_lower = current_med.lower().strip()
+    if len(known) > 1 and len(matrix.pair_codes):
+        ids = np.fromiter((matrix.drug_ids[name] for name in known), dtype=np.int64, count=len(known))
+        first, second = np.triu_indices(len(ids), k=1)
+        low = np.minimum(ids[first], ids[second])
+        high = np.maximum(ids[first], ids[second])
+        codes = low * len(matrix.drug_ids) + high
+        
+        # Binary search every pair code against the sorted matrix at once
+        positions = np.searchsorted(matrix.pair_codes, codes)
+        positions = np.minimum(positions, len(matrix.pair_codes) - 1)
+        hits = np.flatnonzero(matrix.pair_codes[positions] == codes)
         
-        # Check both directions of drug pairs
-        pair1 = (current_med_lower, new_med_lower)
-        pair2 = (new_med_lower, current_med_lower)
+        # Rank by severity (most severe first), then by regimen order
+        hits = hits[np.argsort(-matrix.severities[positions[hits]].astype(np.int16), kind="stable")]
         
-        if pair1 in interaction_db:
-            interaction = interaction_db[pair1].copy()
-            interaction["current_medication"] = current_med
-            interaction["new_medication"] = new_medication
-            interactions_found.append(interaction)
-        elif pair2 in interaction_db:
-            interaction = interaction_db[pair2].copy()
-            interaction["current_medication"] = current_med
-            interaction["new_medication"] = new_medication
-            interactions_found.append(interaction)
+        for hit in hits:
+            interactions_found.append({
+                **matrix.details[positions[hit]],
+                "medication_a": regimen[known[first[hit]]],
+                "medication_b": regimen[known[second[hit]]],
+            })
     
     if interactions_found:
         result = {
             "status": "warning",
             "has_interactions": True,
+            "medication_count": len(regimen),
             "interaction_count": len(interactions_found),
             "interactions": interactions_found,
-            "message": f"Found {len(interactions_found)} potential drug interaction(s)"
+            "message": f"Found {len(interactions_found)} potential drug interaction(s) in regimen"
         }
     else:
         result = {
             "status": "success",
             "has_interactions": False,
+            "medication_count": len(regimen),
             "interaction_count": 0,
             "interactions": [],
-            "message": f"No known interactions found between {new_medication} and current medications"
+            "message": "No known interactions found between the medications in this regimen"
         }
     
+    if resolved_names:
+        result["resolved_medications"] = resolved_names
+    
     return json.dumps(result, indent=2)
 
 
+@cached_tool()
 def get_medication_info(medication_name: str) -> str:
     """
     Get basic information about a medication.
     
     Args:
-        medication_name: Name of the medication
+        medication_name: Name of the medication (generic or brand name)
         
     Returns:
         JSON string containing medication information
     """
-    import json
-    
-    # Mock medication database
-    medication_db = {
-        "ibuprofen": {
-            "generic_name": "Ibuprofen",
-            "brand_names": ["Advil", "Motrin"],
-            "drug_class": "NSAID (Non-steroidal anti-inflammatory drug)",
-            "common_uses": ["Pain relief", "Fever reduction", "Inflammation"],
-            "common_side_effects": ["Stomach upset", "Heartburn", "Dizziness"],
-            "warnings": ["Take with food", "May increase bleeding risk"]
-        },
-        "acetaminophen": {
-            "generic_name": "Acetaminophen",
-            "brand_names": ["Tylenol"],
-            "drug_class": "Analgesic/Antipyretic",
-            "common_uses": ["Pain relief", "Fever reduction"],
-            "common_side_effects": ["Rare at normal doses"],
-            "warnings": ["Do not exceed 4000mg per day", "Avoid with liver disease"]
-        },
-        "lisinopril": {
-            "generic_name": "Lisinopril",
-            "brand_names": ["Prinivil", "Zestril"],
-            "drug_class": "ACE Inhibitor",
-            "common_uses": ["High blood pressure", "Heart failure"],
-            "common_side_effects": ["Dry cough", "Dizziness", "Headache"],
-            "warnings": ["May cause dizziness when standing", "Not for use during pregnancy"]
-        },
-        "metformin": {
-            "generic_name": "Metformin",
-            "brand_names": ["Glucophage"],
-            "drug_class": "Biguanide (Diabetes medication)",
-            "common_uses": ["Type 2 diabetes"],
-            "common_side_effects": ["Diarrhea", "Nausea", "Stomach upset"],
-            "warnings": ["Take with meals", "May need to stop before surgery"]
-        },
-        "aspirin": {
-            "generic_name": "Aspirin",
-            "brand_names": ["Bayer", "Bufferin"],
-            "drug_class": "NSAID/Antiplatelet",
-            "common_uses": ["Pain relief", "Heart attack prevention", "Stroke prevention"],
-            "common_side_effects": ["Stomach irritation", "Increased bleeding"],
-            "warnings": ["Take with food", "Not for children with viral illness"]
-        }
-    }
-    
-    med_lower = medication_name.lower().strip()
+    resolution = MEDICATION_RESOLVER.resolve(medication_name)
     
-    if med_lower in medication_db:
-        info = medication_db[med_lower].copy()
-        info["status"] = "success"
-        info["medication"] = medication_name
-        return json.dumps(info, indent=2)
+    if resolution.name in MEDICATION_DB:
+        # Same output as json.dumps(info, indent=2) with the extra fields added
+        extra = {"status": "success", "medication": medication_name}
+        if resolution.method in ("alias", "fuzzy"):
+            extra["resolved_name"] = resolution.name
+        fields = "".join(f",\n  {json.dumps(k)}: {json.dumps(v)}" for k, v in extra.items())
+        return _MEDICATION_JSON[resolution.name] + fields + "\n}"
     else:
         result = {
             "status": "not_found",
             "medication": medication_name,
             "message": f"Information for '{medication_name}' not found in database"
         }
-        return json.dumps(result, indent=2)
\ No newline at end of file
+        return json.dumps(result, indent=2)
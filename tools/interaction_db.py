@@ -0,0 +1,363 @@
+"""Compiled Interaction Database - Memory-mapped binary format for large interaction dumps
+
+A real interaction source (e.g. a DrugBank export) holds millions of drug
+pairs. Loading that into Python dicts costs gigabytes per worker process, so
+this module compiles a CSV/JSON dump offline into a compact binary file that
+every worker maps read-only and shares through the OS page cache.
+
+File layout (little-endian, each section aligned to 8 bytes):
+
+    header               magic, drug_count, pair_count, string_count,
+                         name_blob_size, string_blob_size
+    name_offsets         uint32[drug_count + 1]
+    name_blob            UTF-8 drug names, sorted (index = drug ID)
+    pair_codes           int64[pair_count], sorted, low_id * drug_count + high_id
+    severities           uint8[pair_count], see SEVERITY_RANK
+    description_ids      uint32[pair_count], index into the string table
+    recommendation_ids   uint32[pair_count], index into the string table
+    string_offsets       uint32[string_count + 1]
+    string_blob          UTF-8 interned description/recommendation strings
+
+Usage:
+    python -m tools.interaction_db compile interactions.csv interactions.hgidb
+"""
+
+import argparse
+import csv
+import json
+import mmap
+import struct
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+
+MAGIC = b"HGIDB\x00\x01\x00"
+HEADER = struct.Struct("<8sIIIII")
+ALIGNMENT = 8
+
+PairKey = Tuple[str, str]
+
+# Numeric severity used to rank interactions (higher is more serious)
+SEVERITY_RANK = {"mild": 1, "moderate": 2, "severe": 3}
+SEVERITY_NAMES = {rank: name for name, rank in SEVERITY_RANK.items()}
+
+# Column names expected in CSV dumps
+CSV_FIELDS = ("drug_a", "drug_b", "severity", "description", "recommendation")
+
+
+def normalize_medication_name(name: str) -> str:
+    """Normalize a medication name for database lookups."""
+    return name.lower().strip()
+
+
+def canonical_pair(drug_a: str, drug_b: str) -> PairKey:
+    """
+    Build an order-independent key for a drug pair.
+
+    Both names must already be normalized. The pair is sorted so that
+    (a, b) and (b, a) map to the same key and a single probe covers
+    both directions.
+    """
+    return (drug_a, drug_b) if drug_a <= drug_b else (drug_b, drug_a)
+
+
+def _interaction_entries(path: str) -> Iterator[Tuple[Tuple[str, str], Mapping[str, str]]]:
+    """(drug_a, drug_b) and the raw entry for each record of a dump, in file order."""
+    if path.lower().endswith(".csv"):
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                yield (row["drug_a"], row["drug_b"]), row
+    else:
+        # The json module has no incremental parser; the document is loaded whole
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)["interactions"]
+        for entry in entries:
+            yield tuple(entry["drugs"]), entry
+
+
+def read_interaction_records(path: str) -> Iterator[Tuple[PairKey, Dict[str, str]]]:
+    """
+    Read interaction records from a JSON or CSV dump.
+
+    CSV dumps are streamed one row at a time, so memory use does not grow
+    with the file. JSON dumps are parsed into memory whole before the first
+    record is yielded; convert very large dumps to CSV.
+
+    Args:
+        path: JSON file with an "interactions" list (each entry holding a
+            two-element "drugs" list), or a CSV file with CSV_FIELDS columns
+
+    Yields:
+        (canonical drug pair, {severity, description, recommendation})
+    """
+    for (drug_a, drug_b), entry in _interaction_entries(path):
+        pair = canonical_pair(normalize_medication_name(drug_a), normalize_medication_name(drug_b))
+        yield pair, {
+            "severity": entry["severity"].lower().strip(),
+            "description": entry["description"],
+            "recommendation": entry["recommendation"],
+        }
+
+
+def is_compiled_database(path: str) -> bool:
+    """Return True if the file at path starts with the compiled database magic."""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _pad(size: int) -> int:
+    """Number of padding bytes needed to align size to ALIGNMENT."""
+    return -size % ALIGNMENT
+
+
+def _string_table(strings: Sequence[str]) -> Tuple[np.ndarray, bytes]:
+    """Encode strings as a uint32 offsets array plus a concatenated UTF-8 blob."""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    offsets[1:] = np.cumsum([len(e) for e in encoded], dtype=np.int64)
+    return offsets, b"".join(encoded)
+
+
+def compile_interaction_database(source_path: str, output_path: str) -> Dict[str, int]:
+    """
+    Compile a JSON/CSV interaction dump into the binary database format.
+
+    Later records for the same drug pair replace earlier ones.
+
+    Args:
+        source_path: JSON or CSV interaction dump (see read_interaction_records)
+        output_path: Destination for the compiled database
+
+    Returns:
+        Dictionary with drug, pair and interned string counts
+    """
+    records: Dict[PairKey, Dict[str, str]] = {}
+    for pair, details in read_interaction_records(source_path):
+        if details["severity"] not in SEVERITY_RANK:
+            raise ValueError(
+                f"Unknown severity '{details['severity']}' for {pair[0]} + {pair[1]}"
+            )
+        records[pair] = details
+
+    names = sorted({drug for pair in records for drug in pair})
+    drug_ids = {name: i for i, name in enumerate(names)}
+    drug_count = len(names)
+
+    # Intern description/recommendation text, many pairs share the same advice
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def intern(text: str) -> int:
+        if text not in string_ids:
+            string_ids[text] = len(strings)
+            strings.append(text)
+        return string_ids[text]
+
+    entries = sorted(
+        (drug_ids[a] * drug_count + drug_ids[b], details)
+        for (a, b), details in records.items()
+    )
+    pair_codes = np.array([code for code, _ in entries], dtype="<i8")
+    severities = np.array([SEVERITY_RANK[d["severity"]] for _, d in entries], dtype=np.uint8)
+    description_ids = np.array([intern(d["description"]) for _, d in entries], dtype="<u4")
+    recommendation_ids = np.array([intern(d["recommendation"]) for _, d in entries], dtype="<u4")
+
+    name_offsets, name_blob = _string_table(names)
+    string_offsets, string_blob = _string_table(strings)
+
+    sections = [
+        name_offsets.tobytes(),
+        name_blob,
+        pair_codes.tobytes(),
+        severities.tobytes(),
+        description_ids.tobytes(),
+        recommendation_ids.tobytes(),
+        string_offsets.tobytes(),
+        string_blob,
+    ]
+
+    with open(output_path, "wb") as f:
+        header = HEADER.pack(
+            MAGIC, drug_count, len(entries), len(strings), len(name_blob), len(string_blob)
+        )
+        f.write(header + b"\0" * _pad(len(header)))
+        for section in sections:
+            f.write(section + b"\0" * _pad(len(section)))
+
+    return {
+        "drug_count": drug_count,
+        "pair_count": len(entries),
+        "string_count": len(strings),
+    }
+
+
+class _StringTable(Sequence):
+    """Lazily decoded view over an offsets array and UTF-8 blob in the mapped file."""
+
+    def __init__(self, buffer: mmap.mmap, offsets: np.ndarray, blob_start: int):
+        self._buffer = buffer
+        self._offsets = offsets
+        self._blob_start = blob_start
+
+    def raw(self, index: int) -> bytes:
+        start = self._blob_start + int(self._offsets[index])
+        end = self._blob_start + int(self._offsets[index + 1])
+        return self._buffer[start:end]
+
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.raw(index).decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+
+class _DrugIdIndex(Mapping):
+    """Drug name to ID mapping backed by binary search over the sorted name table."""
+
+    def __init__(self, names: _StringTable):
+        self._names = names
+
+    def __getitem__(self, name: str) -> int:
+        target = name.encode("utf-8")
+        names = self._names
+        # UTF-8 byte order matches code point order, so the table stays sorted as bytes
+        lo, hi = 0, len(names)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if names.raw(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(names) and names.raw(lo) == target:
+            return lo
+        raise KeyError(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+class _PairDetails(Sequence):
+    """Interaction details for each position in pair_codes, decoded on access."""
+
+    def __init__(self, database: "InteractionDatabase"):
+        self._db = database
+
+    def __getitem__(self, position: int) -> Mapping[str, str]:
+        db = self._db
+        return MappingProxyType({
+            "severity": SEVERITY_NAMES[int(db.severities[position])],
+            "description": db.strings[int(db.description_ids[position])],
+            "recommendation": db.strings[int(db.recommendation_ids[position])],
+        })
+
+    def __len__(self) -> int:
+        return len(self._db.pair_codes)
+
+
+class InteractionDatabase(Mapping):
+    """
+    Read-only, memory-mapped compiled interaction database.
+
+    Behaves like the in-memory pair index: keys are canonical drug pairs and
+    values are read-only interaction details. Array sections are exposed as
+    zero-copy NumPy views, so lookups binary-search the mapped pages directly.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, drug_count, pair_count, string_count, name_blob_size, string_blob_size = (
+            HEADER.unpack_from(self._buffer, 0)
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled interaction database")
+
+        offset = HEADER.size + _pad(HEADER.size)
+
+        def section(dtype: str, count: int) -> np.ndarray:
+            nonlocal offset
+            array = np.frombuffer(self._buffer, dtype=dtype, count=count, offset=offset)
+            offset += array.nbytes + _pad(array.nbytes)
+            return array
+
+        def blob(size: int) -> int:
+            nonlocal offset
+            start = offset
+            offset += size + _pad(size)
+            return start
+
+        name_offsets = section("<u4", drug_count + 1)
+        self.names = _StringTable(self._buffer, name_offsets, blob(name_blob_size))
+        self.pair_codes = section("<i8", pair_count)
+        self.severities = section("u1", pair_count)
+        self.description_ids = section("<u4", pair_count)
+        self.recommendation_ids = section("<u4", pair_count)
+        string_offsets = section("<u4", string_count + 1)
+        self.strings = _StringTable(self._buffer, string_offsets, blob(string_blob_size))
+
+        self.drug_ids = _DrugIdIndex(self.names)
+        self.details = _PairDetails(self)
+
+    def find(self, pair: PairKey) -> int:
+        """Return the position of a drug pair in pair_codes, or -1 if absent."""
+        try:
+            id_a = self.drug_ids[pair[0]]
+            id_b = self.drug_ids[pair[1]]
+        except KeyError:
+            return -1
+        code = min(id_a, id_b) * len(self.names) + max(id_a, id_b)
+        position = int(np.searchsorted(self.pair_codes, code))
+        if position < len(self.pair_codes) and self.pair_codes[position] == code:
+            return position
+        return -1
+
+    def __getitem__(self, pair: PairKey) -> Mapping[str, str]:
+        position = self.find(pair)
+        if position < 0:
+            raise KeyError(pair)
+        return self.details[position]
+
+    def __contains__(self, pair: object) -> bool:
+        return isinstance(pair, tuple) and len(pair) == 2 and self.find(pair) >= 0
+
+    def __iter__(self) -> Iterator[PairKey]:
+        drug_count = len(self.names)
+        for code in self.pair_codes:
+            low, high = divmod(int(code), drug_count)
+            yield self.names[low], self.names[high]
+
+    def __len__(self) -> int:
+        return len(self.pair_codes)
+
+
+def main(argv: Sequence[str] = None) -> None:
+    """Command-line entry point for compiling interaction dumps."""
+    parser = argparse.ArgumentParser(description="HealthGuard AI interaction database tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compile_parser = subparsers.add_parser("compile", help="Compile a JSON/CSV dump to binary")
+    compile_parser.add_argument("source", help="JSON or CSV interaction dump")
+    compile_parser.add_argument("output", help="Path of the compiled database file")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compile":
+        stats = compile_interaction_database(args.source, args.output)
+        print(
+            f"✅ Compiled {stats['pair_count']} interactions across "
+            f"{stats['drug_count']} drugs ({stats['string_count']} unique strings) "
+            f"to {args.output}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Keyword Matcher - Aho-Corasick automaton for single-pass multi-keyword search"""
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+
+class KeywordMatcher:
+    """
+    Find every keyword occurring in a text with one left-to-right scan.
+
+    The automaton is built once from the keyword list. Matching costs
+    O(len(text) + matches) regardless of how many keywords there are, and
+    overlapping keywords (e.g. "headache" inside "severe headache") are all
+    reported, matching the semantics of a `keyword in text` test per keyword.
+
+    Args:
+        keywords: Keywords to search for. A keyword's ID is its position in
+            this sequence.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: Tuple[str, ...] = tuple(keywords)
+
+        # Trie transitions, failure links and keyword IDs ending at each state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+
+        for keyword_id, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            self._output[state] += (keyword_id,)
+
+        # Breadth-first pass to link each state to its longest proper suffix
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = link if link != next_state else 0
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def find_all(self, text: str) -> FrozenSet[int]:
+        """
+        Find the IDs of all keywords that occur in text.
+
+        Args:
+            text: Text to scan (compared as-is, normalize case beforehand)
+
+        Returns:
+            Set of matching keyword IDs
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+
+        return frozenset(found)
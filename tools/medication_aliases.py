@@ -0,0 +1,241 @@
+"""Medication Name Resolution - Brand name, alias and fuzzy lookup index"""
+
+import json
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, NamedTuple
+
+from tools.interaction_db import normalize_medication_name
+
+
+# Fuzzy matching only corrects typos: names up to this length may differ from a
+# known spelling by one edit, longer names by two. Resolving to the wrong drug
+# ("ampicillin" to amoxicillin) is worse than a miss, so anything further away,
+# ambiguous, or with extra words ("acetaminophen codeine") stays unknown.
+# Brand and combination spellings belong in the alias table instead.
+FUZZY_SHORT_NAME_LENGTH = 10
+FUZZY_MIN_NAME_LENGTH = 4
+
+_MENTION_TOKEN = re.compile(r"[a-z0-9'.-]+")
+
+# Strength suffixes such as "200mg" or "5 ml", dropped before matching
+_STRENGTH = re.compile(r"\s*\b\d+(?:\.\d+)?\s*(?:mg|mcg|g|ml|iu|units?|%)(?=\s|$)")
+
+
+class Resolution(NamedTuple):
+    """Result of resolving a user-supplied medication name."""
+    name: str
+    method: str  # "exact", "alias", "fuzzy" or "unknown"
+
+
+def load_aliases(path: str) -> Dict[str, str]:
+    """
+    Load an alias file mapping alternate names to generic names.
+
+    Args:
+        path: JSON file with an "aliases" object
+
+    Returns:
+        Dictionary of normalized alias to normalized generic name
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    return {
+        normalize_medication_name(alias): normalize_medication_name(generic)
+        for alias, generic in data["aliases"].items()
+    }
+
+
+def max_fuzzy_edits(name: str) -> int:
+    """Edits a fuzzy match of name may differ by (0: too short to match fuzzily)."""
+    if len(name) < FUZZY_MIN_NAME_LENGTH:
+        return 0
+    return 1 if len(name) <= FUZZY_SHORT_NAME_LENGTH else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Edit distance counting insertions, deletions, substitutions and adjacent
+    transpositions, or limit + 1 as soon as it must exceed limit.
+
+    Only the diagonal band of width limit is computed, so a check costs
+    O(len(a) * limit) rather than O(len(a) * len(b)).
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    previous2: List[int] = []
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        current = [over] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        for j in range(low, high + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+        if min(current[low - 1:high + 1]) > limit:
+            return over
+        previous2, previous = previous, current
+    return min(previous[-1], over)
+
+
+def _trigrams(term: str) -> List[str]:
+    """Character trigrams of a term, padded so short names still match."""
+    padded = f"${term}$"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+class MedicationResolver:
+    """
+    Resolve brand names, aliases and misspellings to generic medication names.
+
+    Exact and alias lookups are a single dict probe. Names that miss both fall
+    back to a character trigram index, so fuzzy matching only measures the edit
+    distance to terms that share enough trigrams with the query instead of
+    scanning every name (see max_fuzzy_edits for what counts as a match).
+    Counters record how often each method was used; every alias or fuzzy hit is
+    a lookup that would otherwise have returned "not found" and prompted the
+    model to retry.
+    """
+
+    def __init__(
+        self,
+        generic_names: Iterable[str],
+        aliases: Mapping[str, str],
+    ):
+        self._generics = frozenset(normalize_medication_name(n) for n in generic_names)
+        self._aliases = {
+            normalize_medication_name(alias): normalize_medication_name(generic)
+            for alias, generic in aliases.items()
+        }
+
+        # Fuzzy index over every known spelling (generic names and aliases)
+        self._terms: List[str] = sorted(self._generics | set(self._aliases))
+        self._trigram_index: Dict[str, List[int]] = {}
+        for term_id, term in enumerate(self._terms):
+            for gram in set(_trigrams(term)):
+                self._trigram_index.setdefault(gram, []).append(term_id)
+
+        self._max_words = max((term.count(" ") + 1 for term in self._terms), default=1)
+
+        self._stats: Counter = Counter()
+        self._stats_lock = threading.Lock()
+
+    def _target(self, term: str) -> str:
+        """Generic name that a known spelling refers to."""
+        return self._aliases.get(term, term)
+
+    def _fuzzy_match(self, name: str) -> str:
+        """
+        Closest known spelling within max_fuzzy_edits(name), or an empty string
+        if there is none, it has a different number of words, or two different
+        drugs are equally close.
+        """
+        limit = max_fuzzy_edits(name)
+        if not limit:
+            return ""
+        grams = set(_trigrams(name))
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._trigram_index.get(gram, ()))
+
+        # An edit changes at most three trigrams of the query, four for a
+        # transposition, so a term within d edits shares len(grams) - 4d of them.
+        # Candidates are checked most similar first and the scan stops once no
+        # remaining term can match or tie, or two drugs already tie at one edit.
+        words = name.count(" ")
+        best_targets, best_distance = set(), limit + 1
+        best_term = ""
+        for term_id, count in shared.most_common():
+            if count < len(grams) - 4 * min(best_distance, limit):
+                break
+            term = self._terms[term_id]
+            if term.count(" ") != words:
+                continue
+            distance = edit_distance(name, term, limit)
+            if distance < best_distance:
+                best_term, best_distance, best_targets = term, distance, {self._target(term)}
+            elif distance == best_distance and distance <= limit:
+                best_targets.add(self._target(term))
+                if distance == 1 and len(best_targets) > 1:
+                    break
+
+        return best_term if best_distance <= limit and len(best_targets) == 1 else ""
+
+    def resolve(self, medication_name: str) -> Resolution:
+        """
+        Resolve a medication name to the generic name used by the databases.
+
+        Args:
+            medication_name: Name as supplied by the user or model
+
+        Returns:
+            Resolution with the generic name and how it was found. Unknown
+            names are returned normalized with method "unknown".
+        """
+        name = normalize_medication_name(medication_name)
+        if name not in self._generics and name not in self._aliases:
+            name = _STRENGTH.sub("", name).strip() or name
+
+        if name in self._generics:
+            resolution = Resolution(name, "exact")
+        elif name in self._aliases:
+            resolution = Resolution(self._aliases[name], "alias")
+        else:
+            match = self._fuzzy_match(name) if name else ""
+            if match:
+                resolution = Resolution(self._target(match), "fuzzy")
+            else:
+                resolution = Resolution(name, "unknown")
+
+        with self._stats_lock:
+            self._stats[resolution.method] += 1
+        return resolution
+
+    def find_mentions(self, text: str) -> List[str]:
+        """
+        Find known medications mentioned in free text.
+
+        Only exact generic names and aliases count (longest phrase first);
+        fuzzy matching is skipped because ordinary words would match it.
+
+        Args:
+            text: Free text such as a user message
+
+        Returns:
+            Generic names in order of first mention, without duplicates
+        """
+        tokens = _MENTION_TOKEN.findall(text.lower())
+        found: Dict[str, None] = {}
+        i = 0
+        while i < len(tokens):
+            for width in range(min(self._max_words, len(tokens) - i), 0, -1):
+                phrase = " ".join(tokens[i:i + width])
+                term = phrase if phrase in self._generics or phrase in self._aliases \
+                    else phrase.rstrip(".,'-")
+                if term in self._generics or term in self._aliases:
+                    found.setdefault(self._target(term))
+                    i += width
+                    break
+            else:
+                i += 1
+        return list(found)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get resolution counters.
+
+        Returns:
+            Dictionary with counts per method plus "avoided_retries", the number
+            of lookups that only succeeded thanks to alias or fuzzy resolution
+        """
+        with self._stats_lock:
+            stats = {method: self._stats[method] for method in ("exact", "alias", "fuzzy", "unknown")}
+        stats["avoided_retries"] = stats["alias"] + stats["fuzzy"]
+        return stats
@@ -0,0 +1,316 @@
+"""Medication Regimen - Per-session regimen with an incrementally maintained interaction closure
+
+When a patient says "I take Lisinopril and Metformin" and then asks about
+one new drug after another, check_drug_interactions re-parses and
+re-resolves the whole list and probes every pair on each question. The
+regimen tools instead keep the patient's medications in session state
+(session.state["medication_regimen"]) together with their interaction
+closure: for every drug that interacts with anything in the regimen, the
+regimen members it interacts with.
+
+Adding or removing a medication only visits that drug's own neighbours in
+the interaction database (O(k) for k known interactions), and "can I take
+X?" becomes one lookup of X in the closure. Drug neighbours come from
+InteractionNeighbors, adjacency lists built once per interaction matrix.
+
+Session state is copied into every specialist's sub-session and state
+changes are forwarded back, so the regimen set in one turn is available to
+the medication agent in every later turn of the same session.
+"""
+
+import json
+import threading
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from google.adk.tools.tool_context import ToolContext
+
+from tools import drug_interaction_tool as drug_tool
+from tools.interaction_db import SEVERITY_RANK, canonical_pair
+
+
+REGIMEN_STATE_KEY = "medication_regimen"
+
+
+class InteractionNeighbors(NamedTuple):
+    """
+    Per-drug adjacency lists of an InteractionMatrix.
+
+    Drug i's neighbours are neighbor_ids[offsets[i]:offsets[i + 1]]; names
+    maps IDs back to generic names.
+    """
+    names: Sequence[str]
+    offsets: np.ndarray
+    neighbor_ids: np.ndarray
+
+
+def build_interaction_neighbors(matrix: "drug_tool.InteractionMatrix") -> InteractionNeighbors:
+    """
+    Build adjacency lists from a sparse interaction matrix.
+
+    Args:
+        matrix: Matrix built by build_interaction_matrix()
+
+    Returns:
+        InteractionNeighbors listing every pair under both of its drugs
+    """
+    drug_count = len(matrix.drug_ids)
+    codes = np.asarray(matrix.pair_codes, dtype=np.int64)
+    low, high = np.divmod(codes, max(drug_count, 1))
+
+    sources = np.concatenate([low, high])
+    order = np.argsort(sources, kind="stable")
+    return InteractionNeighbors(
+        names=tuple(matrix.drug_ids),
+        offsets=np.searchsorted(sources[order], np.arange(drug_count + 1)),
+        neighbor_ids=np.concatenate([high, low])[order],
+    )
+
+
+# Built on first use for the current INTERACTION_MATRIX
+_neighbors: Optional[Tuple["drug_tool.InteractionMatrix", InteractionNeighbors]] = None
+_neighbors_lock = threading.Lock()
+
+
+def get_interaction_neighbors() -> InteractionNeighbors:
+    """Adjacency lists of the current interaction matrix, rebuilt if the matrix was replaced."""
+    global _neighbors
+    matrix = drug_tool.INTERACTION_MATRIX
+    with _neighbors_lock:
+        if _neighbors is None or _neighbors[0] is not matrix:
+            _neighbors = (matrix, build_interaction_neighbors(matrix))
+        return _neighbors[1]
+
+
+def interaction_neighbors(generic_name: str) -> List[str]:
+    """
+    Drugs with a known interaction with a medication.
+
+    Args:
+        generic_name: Resolved generic name
+
+    Returns:
+        Neighbouring generic names (empty if the drug is not in the database)
+    """
+    drug_id = drug_tool.INTERACTION_MATRIX.drug_ids.get(generic_name)
+    if drug_id is None:
+        return []
+    neighbors = get_interaction_neighbors()
+    start, end = neighbors.offsets[drug_id], neighbors.offsets[drug_id + 1]
+    return [neighbors.names[i] for i in neighbors.neighbor_ids[start:end].tolist()]
+
+
+class MedicationRegimen:
+    """
+    A patient's medications and their interaction closure.
+
+    Both attributes are plain dicts so the regimen can be stored in session
+    state as is (see to_state / from_state).
+
+    Args:
+        medications: Generic name to the spelling the patient used
+        closure: Drug to the regimen members it interacts with, for every
+            drug that interacts with at least one member
+    """
+
+    def __init__(
+        self,
+        medications: Optional[Dict[str, str]] = None,
+        closure: Optional[Dict[str, List[str]]] = None,
+    ):
+        self.medications = medications if medications is not None else {}
+        self.closure = closure if closure is not None else {}
+
+    @classmethod
+    def from_state(cls, value: Optional[Mapping]) -> "MedicationRegimen":
+        """Regimen stored in session state (empty if none). Shares the stored dicts."""
+        value = value or {}
+        return cls(value.get("medications"), value.get("closure"))
+
+    def to_state(self) -> Dict[str, Dict]:
+        """Session state value of the regimen."""
+        return {"medications": self.medications, "closure": self.closure}
+
+    def copy(self) -> "MedicationRegimen":
+        """Independent copy, to modify a regimen read from session state."""
+        return MedicationRegimen(
+            dict(self.medications), {drug: list(members) for drug, members in self.closure.items()}
+        )
+
+    def add(self, generic_name: str, spelling: str) -> bool:
+        """
+        Add a medication and extend the closure with its neighbours.
+
+        Returns:
+            False if the medication was already in the regimen
+        """
+        if generic_name in self.medications:
+            return False
+        self.medications[generic_name] = spelling
+        for neighbor in interaction_neighbors(generic_name):
+            self.closure.setdefault(neighbor, []).append(generic_name)
+        return True
+
+    def remove(self, generic_name: str) -> bool:
+        """
+        Remove a medication and drop it from its neighbours' closure entries.
+
+        Returns:
+            False if the medication was not in the regimen
+        """
+        if self.medications.pop(generic_name, None) is None:
+            return False
+        for neighbor in interaction_neighbors(generic_name):
+            members = [member for member in self.closure.get(neighbor, ()) if member != generic_name]
+            if members:
+                self.closure[neighbor] = members
+            else:
+                self.closure.pop(neighbor, None)
+        return True
+
+    def interactions_with(self, generic_name: str) -> List[Tuple[str, Mapping[str, str]]]:
+        """Regimen members a medication interacts with and the interaction details, most severe first."""
+        found = [
+            (member, drug_tool.INTERACTION_INDEX[canonical_pair(member, generic_name)])
+            for member in self.closure.get(generic_name, ())
+            if member != generic_name
+        ]
+        return sorted(found, key=lambda item: -SEVERITY_RANK.get(item[1]["severity"], 0))
+
+    def interactions(self) -> List[Tuple[str, str, Mapping[str, str]]]:
+        """Interactions between regimen members, most severe first."""
+        found = [
+            (member, other, drug_tool.INTERACTION_INDEX[canonical_pair(member, other)])
+            for member in self.medications
+            for other in self.closure.get(member, ())
+            if member < other
+        ]
+        return sorted(found, key=lambda item: -SEVERITY_RANK.get(item[2]["severity"], 0))
+
+
+def _split(medications: str) -> List[str]:
+    return [med.strip() for med in medications.split(",") if med.strip()]
+
+
+def update_medication_regimen(add: str, remove: str, tool_context: ToolContext) -> str:
+    """
+    Record the medications a patient currently takes, for later checks in this conversation.
+
+    Call this when the user states what they take ("I take Lisinopril and
+    Metformin"), starts or stops a medication. The regimen is remembered for
+    the rest of the conversation, so later questions can use
+    check_new_medication() without repeating the list.
+    Brand names and common misspellings are resolved to generic names.
+
+    Args:
+        add: Comma-separated medication names to add to the regimen ("" for none)
+        remove: Comma-separated medication names to remove from the regimen ("" for none)
+
+    Returns:
+        JSON string with the updated regimen and the interactions within it
+    """
+    regimen = MedicationRegimen.from_state(tool_context.state.get(REGIMEN_STATE_KEY)).copy()
+    resolver = drug_tool.MEDICATION_RESOLVER
+    added, removed, not_in_regimen = [], [], []
+    resolved_names = {}
+
+    def resolve(medication: str) -> str:
+        resolution = resolver.resolve(medication)
+        if resolution.method in ("alias", "fuzzy"):
+            resolved_names[medication] = resolution.name
+        return resolution.name
+
+    for med in _split(remove):
+        (removed if regimen.remove(resolve(med)) else not_in_regimen).append(med)
+    for med in _split(add):
+        if regimen.add(resolve(med), med):
+            added.append(med)
+
+    tool_context.state[REGIMEN_STATE_KEY] = regimen.to_state()
+
+    interactions = [
+        {
+            **details,
+            "medication_a": regimen.medications[a],
+            "medication_b": regimen.medications[b],
+        }
+        for a, b, details in regimen.interactions()
+    ]
+    result = {
+        "status": "warning" if interactions else "success",
+        "medications": list(regimen.medications.values()),
+        "added": added,
+        "removed": removed,
+        "has_interactions": bool(interactions),
+        "interaction_count": len(interactions),
+        "interactions": interactions,
+        "message": (
+            f"Regimen updated: {len(regimen.medications)} medication(s), "
+            f"{len(interactions)} potential interaction(s) between them"
+        ),
+    }
+    if not_in_regimen:
+        result["not_in_regimen"] = not_in_regimen
+    if resolved_names:
+        result["resolved_medications"] = resolved_names
+
+    return json.dumps(result, indent=2)
+
+
+def check_new_medication(medication: str, tool_context: ToolContext) -> str:
+    """
+    Check whether a medication interacts with the patient's recorded regimen ("Can I take X?").
+
+    Uses the regimen saved with update_medication_regimen() earlier in this
+    conversation, so only the new medication needs to be passed.
+    Brand names and common misspellings are resolved to generic names.
+
+    Args:
+        medication: Name of the medication being considered
+
+    Returns:
+        JSON string containing interaction warnings and severity levels, or
+        status "no_regimen" if no regimen was recorded yet
+    """
+    regimen = MedicationRegimen.from_state(tool_context.state.get(REGIMEN_STATE_KEY))
+    if not regimen.medications:
+        return json.dumps({
+            "status": "no_regimen",
+            "medication": medication,
+            "message": "No regimen recorded in this conversation; use update_medication_regimen() "
+                       "or check_drug_interactions() with the current medications",
+        }, indent=2)
+
+    resolution = drug_tool.MEDICATION_RESOLVER.resolve(medication)
+    interactions = [
+        {
+            **details,
+            "current_medication": regimen.medications[member],
+            "new_medication": medication,
+        }
+        for member, details in regimen.interactions_with(resolution.name)
+    ]
+
+    if interactions:
+        result = {
+            "status": "warning",
+            "has_interactions": True,
+            "interaction_count": len(interactions),
+            "interactions": interactions,
+            "message": f"Found {len(interactions)} potential drug interaction(s)"
+        }
+    else:
+        result = {
+            "status": "success",
+            "has_interactions": False,
+            "interaction_count": 0,
+            "interactions": [],
+            "message": f"No known interactions found between {medication} and current medications"
+        }
+    result["current_medications"] = list(regimen.medications.values())
+    if resolution.name in regimen.medications:
+        result["already_in_regimen"] = True
+    if resolution.method in ("alias", "fuzzy"):
+        result["resolved_medications"] = {medication: resolution.name}
+
+    return json.dumps(result, indent=2)
@@ -0,0 +1,272 @@
+"""Tool Output Formatting - Compact, token-budgeted tool responses for agents
+
+Tool functions return pretty-printed JSON, which is re-sent to the model as
+prompt tokens on every hop. This module wraps tools per agent to emit
+minified JSON, replace fixed advice text with short codes explained once in
+the agent instruction, and trim list fields to fit a per-tool token budget.
+"""
+
+import functools
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from tools.result_cache import ResultCache
+
+
+# Fixed advice text emitted by the tools, referenced as "@CODE" in compact mode.
+# Values that do not match exactly are passed through unchanged.
+STATIC_ADVICE = {
+    "ER911": "Call 911 or go to the emergency room immediately",
+    "NOWAIT": "Do not wait. Seek immediate medical care.",
+    "SAMEDAY": "Contact your doctor today or visit urgent care",
+    "EVALTODAY": "These symptoms require medical evaluation today",
+    "HOMECARE": "Manage symptoms at home. See doctor if symptoms worsen or persist beyond 3-5 days",
+    "SELFCARE": [
+        "Rest and stay hydrated",
+        "Use over-the-counter medications as directed",
+        "Monitor temperature if fever present",
+        "Seek care if symptoms worsen"
+    ],
+    "ROUTINE": "Symptoms appear minor. Continue routine health maintenance.",
+    "CHECKUP": "Schedule regular check-up if you have ongoing concerns",
+    "APPT": "Schedule an appointment with your healthcare provider",
+    "WATCH": "Continue monitoring. Seek care if symptoms worsen",
+    "ASKDOC": "Consult healthcare provider if concerned",
+}
+
+_ADVICE_CODES = {json.dumps(text): f"@{code}" for code, text in STATIC_ADVICE.items()}
+
+# Fields a token budget never trims: dropping them could hide an emergency
+# symptom or a (possibly severe) drug interaction
+PROTECTED_FIELDS = frozenset({
+    "emergency_symptoms", "high_priority_symptoms", "severity", "interactions",
+})
+
+# Advisory lists, trimmed before any other list (in this order)
+ADVISORY_FIELDS = ("self_care_tips", "brand_names", "common_uses", "common_side_effects")
+
+# Rough characters-per-token ratio for Gemini-style tokenizers. Used for
+# budgets and savings estimates, not billing.
+CHARS_PER_TOKEN = 4
+
+
+class ToolOutputConfig(NamedTuple):
+    """
+    How an agent's tools format their responses.
+
+    Attributes:
+        mode: "pretty" (indented JSON, the default) or "compact"
+        token_budget: Maximum estimated tokens per tool response in compact
+            mode. Advisory lists are trimmed first, then the longest other
+            lists; emergency findings and drug interactions are never
+            trimmed. None means unlimited.
+        measure: Record estimated tokens saved per call (see get_output_stats)
+    """
+    mode: str = "pretty"
+    token_budget: Optional[int] = None
+    measure: bool = False
+
+    @classmethod
+    def from_env(cls) -> "ToolOutputConfig":
+        """Build a config from HEALTHGUARD_TOOL_OUTPUT* environment variables."""
+        budget = os.getenv("HEALTHGUARD_TOOL_TOKEN_BUDGET")
+        return cls(
+            mode=os.getenv("HEALTHGUARD_TOOL_OUTPUT", "pretty"),
+            token_budget=int(budget) if budget else None,
+            measure=os.getenv("HEALTHGUARD_TOOL_OUTPUT_STATS", "0") == "1",
+        )
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of prompt tokens in text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _encode_advice(value: Any) -> Any:
+    """Recursively replace static advice values with their codes."""
+    if isinstance(value, (str, list)):
+        code = _ADVICE_CODES.get(json.dumps(value))
+        if code:
+            return code
+    if isinstance(value, dict):
+        return {k: _encode_advice(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_encode_advice(v) for v in value]
+    return value
+
+
+def _dumps(result: Any) -> str:
+    return json.dumps(result, separators=(",", ":"), ensure_ascii=False)
+
+
+def _trim_candidate(result: Dict[str, Any]) -> Optional[str]:
+    """The list field to drop an item from next, or None if only protected fields are left."""
+    for field in ADVISORY_FIELDS:
+        if isinstance(result.get(field), list) and result[field]:
+            return field
+    lists = [
+        k for k, v in result.items()
+        if isinstance(v, list) and v and k not in PROTECTED_FIELDS
+    ]
+    return max(lists, key=lambda k: len(_dumps(result[k]))) if lists else None
+
+
+def _fit_budget(result: Dict[str, Any], token_budget: int) -> str:
+    """
+    Trim top-level lists until the response fits the budget.
+
+    Advisory lists go first, then the longest remaining lists. Scalar fields
+    (severity, counts, messages) and PROTECTED_FIELDS are never removed, so a
+    response that still does not fit is returned over budget. The number of
+    dropped list items is reported in "_truncated".
+    """
+    text = _dumps(result)
+    truncated = 0
+
+    while estimate_tokens(text) > token_budget:
+        field = _trim_candidate(result)
+        if field is None:
+            break
+        result[field] = result[field][:-1]
+        truncated += 1
+        result["_truncated"] = truncated
+        text = _dumps(result)
+
+    return text
+
+
+def compact_output(text: str, token_budget: Optional[int] = None) -> str:
+    """
+    Convert a pretty-printed tool response to compact form.
+
+    Args:
+        text: JSON response returned by a tool
+        token_budget: Optional maximum estimated tokens for the response
+
+    Returns:
+        Minified JSON with static advice replaced by codes
+    """
+    result = _encode_advice(json.loads(text))
+    if token_budget is not None and isinstance(result, dict):
+        return _fit_budget(result, token_budget)
+    return _dumps(result)
+
+
+def output_instruction(config: ToolOutputConfig, advice_codes: bool = True) -> str:
+    """
+    Instruction text describing compact tool output to the model.
+
+    Args:
+        config: Output configuration of the agent
+        advice_codes: Include the legend of @CODE advice references. Only
+            needed for agents whose tools emit static advice.
+
+    Returns:
+        Text to append to the agent instruction (empty in pretty mode)
+    """
+    if config.mode != "compact":
+        return ""
+
+    lines = ["", "TOOL OUTPUT FORMAT:", "Tool results are compact JSON."]
+    if advice_codes:
+        lines.append("Values written as @CODE stand for standard advice:")
+        for code, text in STATIC_ADVICE.items():
+            if isinstance(text, list):
+                text = "; ".join(text)
+            lines.append(f"- @{code}: {text}")
+    if config.token_budget is not None:
+        lines.append('"_truncated" means that many list items were omitted to save space.')
+    return "\n".join(lines) + "\n"
+
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = defaultdict(
+    lambda: {"calls": 0, "original_tokens": 0, "output_tokens": 0}
+)
+
+
+def _record(tool_name: str, original: str, output: str) -> None:
+    with _stats_lock:
+        stats = _stats[tool_name]
+        stats["calls"] += 1
+        stats["original_tokens"] += estimate_tokens(original)
+        stats["output_tokens"] += estimate_tokens(output)
+
+
+def get_output_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get estimated token savings for tools wrapped with measure=True.
+
+    Returns:
+        Dictionary of tool name to call count, original and output token
+        totals, total tokens saved and tokens saved per call
+    """
+    with _stats_lock:
+        report = {}
+        for name, stats in _stats.items():
+            saved = stats["original_tokens"] - stats["output_tokens"]
+            report[name] = {
+                **stats,
+                "tokens_saved": saved,
+                "tokens_saved_per_call": round(saved / stats["calls"], 1) if stats["calls"] else 0.0,
+            }
+        return report
+
+
+def format_tool(func: Callable[..., str], config: ToolOutputConfig) -> Callable[..., str]:
+    """
+    Wrap a tool so its responses follow an output config.
+
+    The wrapper keeps the tool's name, signature and docstring, so ADK
+    builds the same function declaration for the model.
+
+    Args:
+        func: Tool function returning a JSON string
+        config: Output configuration for the agent using the tool
+
+    Returns:
+        The tool itself in pretty mode without measurement, else a wrapper
+    """
+    if config.mode == "pretty" and not config.measure:
+        return func
+    if config.mode not in ("pretty", "compact"):
+        raise ValueError(f"Unknown tool output mode: {config.mode}")
+
+    # Tool results are cached, so the same response string recurs often
+    conversions = ResultCache()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        original = func(*args, **kwargs)
+        if config.mode == "compact":
+            output = conversions.get(original)
+            if output is None:
+                output = compact_output(original, config.token_budget)
+                conversions.put(original, output)
+        else:
+            output = original
+        if config.measure:
+            _record(func.__name__, original, output)
+        return output
+
+    return wrapper
+
+
+def format_tools(
+    tools: Sequence[Callable[..., str]], config: Optional[ToolOutputConfig] = None
+) -> List[Callable[..., str]]:
+    """
+    Apply an output config to a list of tools.
+
+    Args:
+        tools: Tool functions for one agent
+        config: Output configuration. Defaults to ToolOutputConfig.from_env().
+
+    Returns:
+        List of tools ready to pass to an Agent
+    """
+    config = config or ToolOutputConfig.from_env()
+    return [format_tool(tool, config) for tool in tools]
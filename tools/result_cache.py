@@ -0,0 +1,169 @@
+"""Tool Result Cache - Bounded LRU caching for deterministic tool functions"""
+
+import functools
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional
+
+from opentelemetry import trace
+
+
+# Default number of results kept per tool. Set HEALTHGUARD_TOOL_CACHE_SIZE=0
+# to disable caching entirely.
+DEFAULT_CACHE_SIZE = int(os.getenv("HEALTHGUARD_TOOL_CACHE_SIZE", "1024"))
+
+_MISSING = object()
+
+# Span attributes set on the enclosing tool span (see agents/tracing.py)
+CACHE_HIT_ATTRIBUTE = "healthguard.cache_hit"
+SEVERITY_ATTRIBUTE = "healthguard.severity"
+SEVERITY_LEVEL_ATTRIBUTE = "healthguard.severity_level"
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with hit/miss/eviction counters.
+
+    Args:
+        maxsize: Maximum number of entries kept. 0 disables caching.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# Cache per tool name, so stats can be reported across all tools
+_CACHES: Dict[str, ResultCache] = {}
+
+
+def split_list_key(value: str) -> tuple:
+    """
+    Normalize a comma-separated tool argument for use in a cache key.
+
+    Items are stripped and empty items dropped, which is exactly how the
+    tools parse these arguments, so equal keys always produce equal output.
+    """
+    return tuple(item.strip() for item in value.split(',') if item.strip())
+
+
+def _typed_key(*args, **kwargs) -> Hashable:
+    """
+    Default cache key: the arguments together with their types.
+
+    Like functools.lru_cache(typed=True), so 3, 3.0 and True, which are
+    equal and hash alike, do not share a response that echoes the value back.
+    """
+    return (
+        tuple((type(value), value) for value in args),
+        tuple(sorted((name, type(value), value) for name, value in kwargs.items())),
+    )
+
+
+def cached_tool(
+    key: Optional[Callable[..., Hashable]] = None,
+    maxsize: int = DEFAULT_CACHE_SIZE,
+    span_attributes: Optional[Callable[[Any], Mapping[str, Any]]] = None,
+) -> Callable:
+    """
+    Decorator that caches a deterministic tool function's results.
+
+    The wrapper keeps the wrapped function's name, signature and docstring so
+    ADK still builds the same function declaration for the model.
+
+    Args:
+        key: Builds the cache key from the call arguments. Must only fold
+            together arguments that produce identical output, since tool
+            responses echo the caller's spelling back. Defaults to the raw
+            positional and keyword arguments and their types.
+        maxsize: Maximum number of cached results for this tool
+        span_attributes: Builds attributes for the current trace span from a
+            result (cached or not). Only called while tracing is active.
+
+    Returns:
+        Decorator for the tool function
+    """
+
+    def decorator(func: Callable) -> Callable:
+        cache = ResultCache(maxsize)
+        _CACHES[func.__name__] = cache
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = (key or _typed_key)(*args, **kwargs)
+
+            result = cache.get(cache_key, _MISSING)
+            hit = result is not _MISSING
+            if not hit:
+                result = func(*args, **kwargs)
+                cache.put(cache_key, result)
+
+            span = trace.get_current_span()
+            if span.is_recording():
+                span.set_attribute(CACHE_HIT_ATTRIBUTE, hit)
+                if span_attributes is not None:
+                    span.set_attributes(span_attributes(result))
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get cache statistics for every cached tool.
+
+    Returns:
+        Dictionary of tool name to size, hits, misses, evictions and hit rate
+    """
+    return {name: cache.stats() for name, cache in _CACHES.items()}
+
+
+def clear_caches() -> None:
+    """Clear all cached tool results and reset their counters."""
+    for cache in _CACHES.values():
+        cache.clear()
@@ -0,0 +1,244 @@
+"""Search Cache - Persistent TTL cache for health research answers
+
+google_search is a model-side grounding tool, so the search itself cannot be
+intercepted from Python. The research agent's answer for a request is what
+the search produces, so that answer is cached instead, keyed on the
+normalized request text. Entries live in a local SQLite file shared by every
+process on the machine, expire after a TTL and are evicted least recently
+used once the cache is full. Hit and miss counts are stored in the same file
+so the hit rate covers all processes.
+
+Usage:
+    python -m tools.search_cache stats
+    python -m tools.search_cache clear
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence
+
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "healthguard", "search_cache.sqlite")
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 1000
+
+_NON_WORD = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize a research request for use as a cache key.
+
+    Lowercases, drops punctuation and collapses whitespace, so
+    "Flu symptoms, CDC?" and "flu symptoms CDC" share an entry.
+    """
+    return _SPACES.sub(" ", _NON_WORD.sub(" ", text.lower())).strip()
+
+
+class SearchCache:
+    """
+    Process-shared SQLite cache of research answers with TTL and LRU eviction.
+
+    Each call opens its own short-lived connection, so one instance can be
+    used from any thread and many processes can share the same file. Calls
+    block on disk I/O and on other processes' write locks, so async callers
+    run them with asyncio.to_thread().
+
+    Args:
+        path: SQLite database file (parent directories are created)
+        ttl_seconds: Age after which an entry is no longer served
+        max_entries: Maximum entries kept; least recently used are evicted
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_PATH,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    @classmethod
+    def from_env(cls) -> Optional["SearchCache"]:
+        """
+        Build a cache from HEALTHGUARD_SEARCH_CACHE* environment variables.
+
+        Returns:
+            SearchCache, or None if HEALTHGUARD_SEARCH_CACHE_SIZE is 0
+        """
+        max_entries = int(os.getenv("HEALTHGUARD_SEARCH_CACHE_SIZE", str(DEFAULT_MAX_ENTRIES)))
+        if max_entries <= 0:
+            return None
+        return cls(
+            path=os.path.expanduser(os.getenv("HEALTHGUARD_SEARCH_CACHE", DEFAULT_PATH)),
+            ttl_seconds=float(os.getenv("HEALTHGUARD_SEARCH_CACHE_TTL", str(DEFAULT_TTL_SECONDS))),
+            max_entries=max_entries,
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+
+    def _count(self, conn: sqlite3.Connection, name: str) -> None:
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get(self, query: str) -> Optional[str]:
+        """
+        Look up the cached answer for a request.
+
+        Args:
+            query: Research request text, as sent to the agent
+
+        Returns:
+            Cached answer, or None on a miss or an expired entry
+        """
+        key = normalize_query(query)
+        now = time.time()
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT value FROM entries WHERE key = ? AND created > ?",
+                (key, now - self.ttl_seconds),
+            ).fetchone()
+            if row is None:
+                self._count(conn, "misses")
+                return None
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            self._count(conn, "hits")
+            return row[0]
+        finally:
+            conn.close()
+
+    def put(self, query: str, value: str) -> None:
+        """
+        Store an answer, then drop expired and least recently used entries.
+
+        Args:
+            query: Research request text
+            value: Agent answer for the request
+        """
+        key = normalize_query(query)
+        if not key or not value:
+            return
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            conn.execute("DELETE FROM entries WHERE created <= ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                "SELECT key FROM entries ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def clear(self) -> None:
+        """Remove every entry and reset the hit/miss counters."""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM counters")
+        finally:
+            conn.close()
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache size and hit rate.
+
+        Returns:
+            Dictionary with entry count, limits, this process's hits/misses
+            and hit rate, and the hit rate across all processes
+        """
+        conn = self._connect()
+        try:
+            size = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            shared = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        finally:
+            conn.close()
+
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        shared_hits, shared_misses = shared.get("hits", 0), shared.get("misses", 0)
+        return {
+            "path": self.path,
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "shared_hits": shared_hits,
+            "shared_misses": shared_misses,
+            "shared_hit_rate": round(shared_hits / (shared_hits + shared_misses), 4)
+            if shared_hits + shared_misses else 0.0,
+        }
+
+
+def main(argv: Sequence[str] = None) -> None:
+    """Command-line entry point for inspecting the search cache."""
+    parser = argparse.ArgumentParser(description="HealthGuard AI research search cache")
+    parser.add_argument("command", choices=["stats", "clear"])
+    args = parser.parse_args(argv)
+
+    cache = SearchCache.from_env()
+    if cache is None:
+        print("⚠️  Search cache is disabled (HEALTHGUARD_SEARCH_CACHE_SIZE=0)")
+        return
+
+    if args.command == "stats":
+        print(json.dumps(cache.stats(), indent=2))
+    elif args.command == "clear":
+        cache.clear()
+        print(f"✅ Cleared search cache at {cache.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,221 @@
 """Symptom Assessment Tool - Fixed for Google ADK 1.19.0"""
 
-from typing import Dict
+import functools
+import json
+import os
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Sequence, Tuple
 
+import numpy as np
 
+from tools.keyword_matcher import KeywordMatcher
+from tools.result_cache import (
+    SEVERITY_ATTRIBUTE,
+    SEVERITY_LEVEL_ATTRIBUTE,
+    cached_tool,
+    split_list_key,
+)
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_SYMPTOM_KEYWORDS_PATH = os.path.join(DATA_DIR, "symptom_keywords.json")
+DEFAULT_DURATION_THRESHOLDS_PATH = os.path.join(DATA_DIR, "duration_thresholds.json")
+
+# Keyword tiers from most to least urgent, with the severity level each sets
+# and the field name used for the keyword's description in results
+SEVERITY_TIERS = (
+    ("emergency", "emergency", "reason"),
+    ("high_priority", "high", "reason"),
+    ("moderate", "moderate", "advice"),
+)
+
+
+def load_symptom_keywords(path: str) -> Mapping[str, Mapping[str, str]]:
+    """
+    Load symptom keyword tiers.
+
+    Args:
+        path: JSON file with an object per tier in SEVERITY_TIERS, mapping
+            lowercase keyword to its reason or advice text
+
+    Returns:
+        Read-only mapping of tier name to keyword descriptions
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    return MappingProxyType({
+        tier: MappingProxyType({k.lower(): v for k, v in data[tier].items()})
+        for tier, _, _ in SEVERITY_TIERS
+    })
+
+
+SYMPTOM_KEYWORDS = load_symptom_keywords(DEFAULT_SYMPTOM_KEYWORDS_PATH)
+
+# One automaton over every tier. Keyword IDs follow tier order, then file
+# order, so sorting matched IDs reproduces the tier-priority scan order.
+_KEYWORD_DETAILS: Tuple[Tuple[int, str], ...] = tuple(
+    (tier_index, description)
+    for tier_index, (tier, _, _) in enumerate(SEVERITY_TIERS)
+    for description in SYMPTOM_KEYWORDS[tier].values()
+)
+SYMPTOM_MATCHER = KeywordMatcher(
+    keyword
+    for tier, _, _ in SEVERITY_TIERS
+    for keyword in SYMPTOM_KEYWORDS[tier]
+)
+
+
+def find_symptom_keywords(text: str) -> List[Tuple[str, str, str]]:
+    """
+    Find every symptom keyword mentioned in a piece of text.
+
+    Args:
+        text: Text to scan (case-insensitive)
+
+    Returns:
+        List of (tier, keyword, description) in tier-priority order
+    """
+    return [
+        (SEVERITY_TIERS[_KEYWORD_DETAILS[keyword_id][0]][0],
+         SYMPTOM_MATCHER.keywords[keyword_id],
+         _KEYWORD_DETAILS[keyword_id][1])
+        for keyword_id in sorted(SYMPTOM_MATCHER.find_all(text.lower()))
+    ]
+
+
+def classify_symptoms(symptom_list: List[str]) -> Tuple[str, List[Dict[str, str]]]:
+    """
+    Find the most urgent keyword tier matched by a list of symptoms.
+
+    Each symptom is scanned once against every tier's keywords.
+
+    Args:
+        symptom_list: Individual symptom descriptions
+
+    Returns:
+        Tuple of severity level ("emergency", "high", "moderate" or "low")
+        and the matches for that tier, in symptom then keyword order
+    """
+    matches: List[List[Dict[str, str]]] = [[] for _ in SEVERITY_TIERS]
+
+    for symptom in symptom_list:
+        for keyword_id in sorted(SYMPTOM_MATCHER.find_all(symptom.lower())):
+            tier_index, description = _KEYWORD_DETAILS[keyword_id]
+            field = SEVERITY_TIERS[tier_index][2]
+            matches[tier_index].append({"symptom": symptom, field: description})
+
+    for tier_index, (_, severity_level, _) in enumerate(SEVERITY_TIERS):
+        if matches[tier_index]:
+            return severity_level, matches[tier_index]
+
+    return "low", []
+
+
+def load_duration_thresholds(path: str) -> Mapping[str, int]:
+    """
+    Load maximum symptom durations.
+
+    Args:
+        path: JSON file with a "thresholds" object of keyword to days
+
+    Returns:
+        Read-only mapping of lowercase keyword to maximum days, in file order
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    return MappingProxyType({k.lower(): int(v) for k, v in data["thresholds"].items()})
+
+
+DURATION_THRESHOLDS = load_duration_thresholds(DEFAULT_DURATION_THRESHOLDS_PATH)
+
+# Threshold IDs index both the matcher keywords and this array of day limits
+DURATION_MATCHER = KeywordMatcher(DURATION_THRESHOLDS)
+_DURATION_DAYS: Tuple[int, ...] = tuple(DURATION_THRESHOLDS.values())
+_DURATION_LIMITS = np.array(_DURATION_DAYS, dtype=np.float64)
+
+# Status codes used by check_symptom_duration_batch
+DURATION_STATUS_MONITOR = 0
+DURATION_STATUS_SEEK_CARE = 1
+DURATION_STATUS_NAMES = ("monitor", "seek_care")
+
+
+@functools.lru_cache(maxsize=4096)
+def duration_threshold_id(symptom: str) -> int:
+    """
+    Resolve a symptom to the ID of its duration threshold.
+
+    The first keyword in DURATION_THRESHOLDS contained in the symptom wins.
+    Results are cached, so repeated symptoms are resolved only once.
+
+    Args:
+        symptom: The symptom being experienced
+
+    Returns:
+        Threshold ID, or -1 if no threshold applies
+    """
+    matches = DURATION_MATCHER.find_all(symptom.lower().strip())
+    return min(matches) if matches else -1
+
+
+class DurationBatchResult(NamedTuple):
+    """Columnar duration assessment, one array element per input row."""
+    status: np.ndarray          # uint8, DURATION_STATUS_MONITOR or DURATION_STATUS_SEEK_CARE
+    threshold_ids: np.ndarray   # int32, -1 where no threshold applies
+    threshold_days: np.ndarray  # float64, NaN where no threshold applies
+
+
+def check_symptom_duration_batch(
+    symptoms: Sequence[str], duration_days: Sequence[float]
+) -> DurationBatchResult:
+    """
+    Check many (symptom, duration) pairs against their thresholds at once.
+
+    Same rules as check_symptom_duration(), but each distinct symptom is
+    resolved to a threshold ID once and all durations are compared in a
+    single vectorized operation.
+
+    Args:
+        symptoms: Symptom names, one per row
+        duration_days: How many days each symptom has persisted
+
+    Returns:
+        DurationBatchResult with status codes and thresholds per row
+    """
+    durations = np.asarray(duration_days, dtype=np.float64)
+    if durations.shape != (len(symptoms),):
+        raise ValueError("symptoms and duration_days must have the same length")
+
+    threshold_ids = np.fromiter(
+        (duration_threshold_id(s) for s in symptoms), dtype=np.int32, count=len(symptoms)
+    )
+    known = threshold_ids >= 0
+    threshold_days = np.full(len(symptoms), np.nan)
+    threshold_days[known] = _DURATION_LIMITS[threshold_ids[known]]
+
+    # NaN thresholds compare False, so rows without a threshold stay "monitor"
+    with np.errstate(invalid="ignore"):
+        status = (durations > threshold_days).astype(np.uint8)
+
+    return DurationBatchResult(
+        status=status, threshold_ids=threshold_ids, threshold_days=threshold_days
+    )
+
+
+def _severity_span_attributes(result: str) -> Dict[str, object]:
+    """Trace attributes of an assess_symptom_severity() result."""
+    assessment = json.loads(result)
+    return {
+        SEVERITY_ATTRIBUTE: assessment["severity"],
+        SEVERITY_LEVEL_ATTRIBUTE: assessment["severity_level"],
+    }
+
+
+@cached_tool(
+    key=lambda symptoms: split_list_key(symptoms),
+    span_attributes=_severity_span_attributes,
+)
 def assess_symptom_severity(symptoms: str) -> str:
     """
     Assess the severity of symptoms and determine if medical attention is needed.
@@ -13,80 +226,10 @@ def assess_symptom_severity(symptoms: str) -> str:
     Returns:
         JSON string with severity assessment and recommendations
     """
-    import json
-    
     # Parse symptoms
     symptom_list = [s.strip() for s in symptoms.split(',') if s.strip()]
     
-    # Emergency symptoms that require immediate medical attention
-    emergency_symptoms = {
-        "chest pain": "Heart attack or cardiac emergency",
-        "difficulty breathing": "Respiratory emergency",
-        "severe headache": "Possible stroke or hemorrhage",
-        "sudden confusion": "Possible stroke",
-        "loss of consciousness": "Medical emergency",
-        "severe bleeding": "Trauma requiring immediate care",
-        "severe abdominal pain": "Possible appendicitis or internal issue",
-        "seizure": "Neurological emergency",
-        "coughing blood": "Serious respiratory issue",
-        "suicidal thoughts": "Mental health emergency"
-    }
-    
-    # High-priority symptoms requiring same-day medical attention
-    high_priority_symptoms = {
-        "high fever": "Fever above 103°F (39.4°C)",
-        "persistent vomiting": "Risk of dehydration",
-        "severe pain": "Significant discomfort requiring evaluation",
-        "signs of infection": "May need antibiotics",
-        "difficulty swallowing": "Possible serious throat infection",
-        "severe diarrhea": "Risk of dehydration"
-    }
-    
-    # Moderate symptoms that should be monitored
-    moderate_symptoms = {
-        "fever": "Monitor temperature, manage with OTC medication",
-        "headache": "Usually manageable with OTC pain relievers",
-        "cough": "Monitor for worsening, stay hydrated",
-        "sore throat": "Usually viral, rest and fluids",
-        "mild pain": "Manageable with OTC pain relief",
-        "fatigue": "Ensure adequate rest",
-        "congestion": "Usually viral, will improve with time"
-    }
-    
-    severity_level = "low"
-    emergency_found = []
-    high_priority_found = []
-    moderate_found = []
-    
-    # Check for emergency symptoms
-    for symptom in symptom_list:
-        symptom_lower = symptom.lower().strip()
-        
-        for emergency_key, description in emergency_symptoms.items():
-            if emergency_key in symptom_lower:
-                emergency_found.append({
-                    "symptom": symptom,
-                    "reason": description
-                })
-                severity_level = "emergency"
-        
-        for high_key, description in high_priority_symptoms.items():
-            if high_key in symptom_lower and severity_level != "emergency":
-                high_priority_found.append({
-                    "symptom": symptom,
-                    "reason": description
-                })
-                if severity_level != "emergency":
-                    severity_level = "high"
-        
-        for mod_key, description in moderate_symptoms.items():
-            if mod_key in symptom_lower and severity_level not in ["emergency", "high"]:
-                moderate_found.append({
-                    "symptom": symptom,
-                    "advice": description
-                })
-                if severity_level not in ["emergency", "high"]:
-                    severity_level = "moderate"
+    severity_level, matched = classify_symptoms(symptom_list)
     
     # Build response based on severity
     if severity_level == "emergency":
@@ -95,7 +238,7 @@ def assess_symptom_severity(symptoms: str) -> str:
             "severity_level": 5,
             "action_required": "IMMEDIATE MEDICAL ATTENTION",
             "recommendation": "Call 911 or go to the emergency room immediately",
-            "emergency_symptoms": emergency_found,
+            "emergency_symptoms": matched,
             "warning": "Do not wait. Seek immediate medical care."
         }
     elif severity_level == "high":
@@ -104,7 +247,7 @@ def assess_symptom_severity(symptoms: str) -> str:
             "severity_level": 4,
             "action_required": "SAME-DAY MEDICAL CARE",
             "recommendation": "Contact your doctor today or visit urgent care",
-            "high_priority_symptoms": high_priority_found,
+            "high_priority_symptoms": matched,
             "warning": "These symptoms require medical evaluation today"
         }
     elif severity_level == "moderate":
@@ -113,7 +256,7 @@ def assess_symptom_severity(symptoms: str) -> str:
             "severity_level": 3,
             "action_required": "MONITOR AND MANAGE",
             "recommendation": "Manage symptoms at home. See doctor if symptoms worsen or persist beyond 3-5 days",
-            "moderate_symptoms": moderate_found,
+            "moderate_symptoms": matched,
             "self_care_tips": [
                 "Rest and stay hydrated",
                 "Use over-the-counter medications as directed",
@@ -134,6 +277,7 @@ def assess_symptom_severity(symptoms: str) -> str:
     return json.dumps(result, indent=2)
 
 
+@cached_tool()
 def check_symptom_duration(symptom: str, duration_days: int) -> str:
     """
     Check if symptom duration requires medical attention.
@@ -145,43 +289,29 @@ def check_symptom_duration(symptom: str, duration_days: int) -> str:
     Returns:
         JSON string with duration assessment
     """
-    import json
-    
-    # Symptoms with their maximum acceptable duration before seeing a doctor
-    duration_thresholds = {
-        "fever": 3,
-        "cough": 10,
-        "headache": 7,
-        "sore throat": 5,
-        "diarrhea": 2,
-        "vomiting": 2,
-        "pain": 7,
-        "fatigue": 14
-    }
-    
-    symptom_lower = symptom.lower().strip()
+    threshold_id = duration_threshold_id(symptom)
     
-    for key, max_days in duration_thresholds.items():
-        if key in symptom_lower:
-            if duration_days > max_days:
-                result = {
-                    "status": "seek_care",
-                    "symptom": symptom,
-                    "duration_days": duration_days,
-                    "threshold_days": max_days,
-                    "message": f"{symptom} lasting more than {max_days} days should be evaluated by a doctor",
-                    "recommendation": "Schedule an appointment with your healthcare provider"
-                }
-            else:
-                result = {
-                    "status": "monitor",
-                    "symptom": symptom,
-                    "duration_days": duration_days,
-                    "threshold_days": max_days,
-                    "message": f"{symptom} duration is within normal range",
-                    "recommendation": "Continue monitoring. Seek care if symptoms worsen"
-                }
-            return json.dumps(result, indent=2)
+    if threshold_id >= 0:
+        max_days = _DURATION_DAYS[threshold_id]
+        if duration_days > max_days:
+            result = {
+                "status": "seek_care",
+                "symptom": symptom,
+                "duration_days": duration_days,
+                "threshold_days": max_days,
+                "message": f"{symptom} lasting more than {max_days} days should be evaluated by a doctor",
+                "recommendation": "Schedule an appointment with your healthcare provider"
+            }
+        else:
+            result = {
+                "status": "monitor",
+                "symptom": symptom,
+                "duration_days": duration_days,
+                "threshold_days": max_days,
+                "message": f"{symptom} duration is within normal range",
+                "recommendation": "Continue monitoring. Seek care if symptoms worsen"
+            }
+        return json.dumps(result, indent=2)
     
     result = {
         "status": "monitor",